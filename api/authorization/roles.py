@@ -1,6 +1,18 @@
-from api.constants import READ_DATA_PERMISSION, VIEW_DATA_INVALIDATION_REASONS_PERMISSION
+from api.constants import (
+    READ_DATA_PERMISSION,
+    VIEW_DATA_INVALIDATION_REASONS_PERMISSION,
+    VIEW_INGESTION_STATUS_PERMISSION,
+    VIEW_INDEX_STATS_PERMISSION,
+    VIEW_CACHE_STATS_PERMISSION,
+)
 
 ROLES = {
-    "admin": [READ_DATA_PERMISSION, VIEW_DATA_INVALIDATION_REASONS_PERMISSION],
+    "admin": [
+        READ_DATA_PERMISSION,
+        VIEW_DATA_INVALIDATION_REASONS_PERMISSION,
+        VIEW_INGESTION_STATUS_PERMISSION,
+        VIEW_INDEX_STATS_PERMISSION,
+        VIEW_CACHE_STATS_PERMISSION,
+    ],
     "user": [READ_DATA_PERMISSION]
 }
\ No newline at end of file
@@ -1,4 +1,25 @@
 VIEW_DATA_INVALIDATION_REASONS_PERMISSION = "view_data_invalidation_reasons"
 READ_DATA_PERMISSION = "read_data"
+VIEW_INGESTION_STATUS_PERMISSION = "view_ingestion_status"
+VIEW_INDEX_STATS_PERMISSION = "view_index_stats"
+VIEW_CACHE_STATS_PERMISSION = "view_cache_stats"
 DATA_ENDPOINT = "data"
-DATA_INVALIDATION_REASONS_ENDPOINT = "data_invalidation_reasons"
\ No newline at end of file
+DATA_INVALIDATION_REASONS_ENDPOINT = "data_invalidation_reasons"
+DATA_AGGREGATE_ENDPOINT = "data/aggregate"
+INGESTION_STATUS_ENDPOINT = "ingestion_status"
+INDEX_STATS_ENDPOINT = "index_stats"
+CACHE_STATS_ENDPOINT = "cache_stats"
+METRICS_ENDPOINT = "metrics"
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+JSON_MEDIA_TYPE = "application/json"
+CSV_MEDIA_TYPE = "text/csv"
+PACKED_FRAME_MEDIA_TYPE = "application/octet-stream"
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+STREAMED_MEDIA_TYPES = (NDJSON_MEDIA_TYPE, CSV_MEDIA_TYPE, PACKED_FRAME_MEDIA_TYPE, ARROW_STREAM_MEDIA_TYPE)
+# Negotiated against the Accept header, in this order when it ranks several of them the same
+DATA_MEDIA_TYPES = (JSON_MEDIA_TYPE, *STREAMED_MEDIA_TYPES)
+CSV_ROWS_PER_CHUNK = 1000
+DEFAULT_PAGE_LIMIT = 1000
+MAX_PAGE_LIMIT = 10000
+BUCKET_PATTERN = r"^[1-9][0-9]*[smhd]$"
@@ -0,0 +1,30 @@
+from typing import Optional
+
+
+def negotiate_media_type(accept: Optional[str], media_types: tuple[str, ...]) -> Optional[str]:
+    # Each media type takes the quality of the most specific range that matches it (text/csv, then text/*, then */*),
+    # the highest quality wins and ties go to the first of media_types. None when none of them is acceptable
+    if not accept:
+        return media_types[0]
+    qualities = {}
+    for media_range in accept.split(","):
+        media_range, *parameters = [p.strip() for p in media_range.split(";")]
+        quality = 1.0
+        for parameter in parameters:
+            name, _, value = parameter.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        media_range = media_range.lower()
+        qualities[media_range] = max(quality, qualities.get(media_range, 0.0))
+
+    best_media_type, best_quality = None, 0.0
+    for media_type in media_types:
+        for media_range in (media_type, f"{media_type.split('/')[0]}/*", "*/*"):
+            if media_range in qualities:
+                if qualities[media_range] > best_quality:
+                    best_media_type, best_quality = media_type, qualities[media_range]
+                break
+    return best_media_type
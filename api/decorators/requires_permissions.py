@@ -1,5 +1,6 @@
+import inspect
+from functools import wraps
 from fastapi import HTTPException, Header
-from datetime import datetime
 
 from api.authorization.authorize_user import authorize_user
 from api.authorization.roles import ROLES
@@ -7,10 +8,20 @@ from api.authorization.roles import ROLES
 
 def requires_permissions(required_permissions: list):
     def decorator(func):
-        async def wrapper(api_key: str = Header(...), start_time: datetime = None, end_time: datetime = None):
+        @wraps(func)
+        async def wrapper(*args, api_key: str = Header(...), **kwargs):
             user_role = await authorize_user(api_key)
             if not set(required_permissions).issubset(ROLES.get(user_role, [])):
                 raise HTTPException(status_code=403, detail="Insufficient permissions")
-            return await func(start_time=start_time, end_time=end_time)
+            return await func(*args, **kwargs)
+
+        # Expose the endpoint parameters plus the api_key header so FastAPI keeps resolving them
+        signature = inspect.signature(func)
+        api_key_parameter = inspect.Parameter(
+            "api_key", inspect.Parameter.KEYWORD_ONLY, default=Header(...), annotation=str
+        )
+        wrapper.__signature__ = signature.replace(
+            parameters=[*signature.parameters.values(), api_key_parameter]
+        )
         return wrapper
-    return decorator
\ No newline at end of file
+    return decorator
@@ -0,0 +1,70 @@
+import csv
+import io
+import struct
+import sys
+from array import array
+from typing import Any, AsyncIterator
+
+from api.constants import CSV_ROWS_PER_CHUNK
+from models.projected_data import ProjectedData
+
+
+async def encode_ndjson(data: AsyncIterator[ProjectedData]) -> AsyncIterator[str]:
+    async for d in data:
+        yield d.model_dump_json(exclude_none=True) + "\n"
+
+
+async def encode_csv(data: AsyncIterator[ProjectedData], fields: list[str]) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    rows = 0
+    async for d in data:
+        row = {"time": d.time, "value": d.value, "tags": ",".join(d.tags) if d.tags is not None else None}
+        writer.writerow([row[f] for f in fields])
+        rows += 1
+        if rows % CSV_ROWS_PER_CHUNK == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def encode_packed_frame(times: array, values: array) -> bytes:
+    # Little-endian uint64 count, followed by that many int64 unix timestamps and then that many float32 values
+    if sys.byteorder == "big":
+        times, values = array(times.typecode, times), array(values.typecode, values)
+        times.byteswap()
+        values.byteswap()
+    return struct.pack("<Q", len(times)) + times.tobytes() + values.tobytes()
+
+
+async def encode_packed_frames(columns: AsyncIterator[tuple[array, array]]) -> AsyncIterator[bytes]:
+    # One frame per chunk, the count isn't known up front, and an empty frame once there are no more
+    async for times, values in columns:
+        yield encode_packed_frame(times, values)
+    yield encode_packed_frame(array('q'), array('f'))
+
+
+def encode_arrow_ipc(columns: AsyncIterator[tuple[array, array]]) -> AsyncIterator[bytes]:
+    # Imported here so pyarrow is only needed when Arrow is requested, raises ImportError before anything is sent
+    import pyarrow
+
+    return encode_arrow_record_batches(pyarrow, columns)
+
+
+async def encode_arrow_record_batches(pyarrow: Any, columns: AsyncIterator[tuple[array, array]]) \
+        -> AsyncIterator[bytes]:
+    schema = pyarrow.schema([("time", pyarrow.timestamp("s", tz="UTC")), ("value", pyarrow.float32())])
+    buffer = io.BytesIO()
+    writer = pyarrow.ipc.new_stream(buffer, schema)
+    async for times, values in columns:
+        writer.write_batch(pyarrow.record_batch([
+            pyarrow.array(times, type=pyarrow.int64()).cast(schema.field("time").type),
+            pyarrow.array(values, type=pyarrow.float32()),
+        ], schema=schema))
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    writer.close()
+    yield buffer.getvalue()
@@ -1,48 +1,231 @@
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Header, Query, Response
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
 from datetime import datetime
-from typing import Optional
+from typing import Literal, Optional
 
 from api.constants import (
     READ_DATA_PERMISSION,
     VIEW_DATA_INVALIDATION_REASONS_PERMISSION,
+    VIEW_INGESTION_STATUS_PERMISSION,
+    VIEW_INDEX_STATS_PERMISSION,
+    VIEW_CACHE_STATS_PERMISSION,
     DATA_ENDPOINT,
     DATA_INVALIDATION_REASONS_ENDPOINT,
+    DATA_AGGREGATE_ENDPOINT,
+    INGESTION_STATUS_ENDPOINT,
+    INDEX_STATS_ENDPOINT,
+    CACHE_STATS_ENDPOINT,
+    METRICS_ENDPOINT,
+    NEXT_CURSOR_HEADER,
+    NDJSON_MEDIA_TYPE,
+    JSON_MEDIA_TYPE,
+    CSV_MEDIA_TYPE,
+    PACKED_FRAME_MEDIA_TYPE,
+    ARROW_STREAM_MEDIA_TYPE,
+    DATA_MEDIA_TYPES,
+    DEFAULT_PAGE_LIMIT,
+    MAX_PAGE_LIMIT,
+    BUCKET_PATTERN,
 )
+from api.content_negotiation import negotiate_media_type
 from api.decorators.requires_permissions import requires_permissions
-from api.decorators.fetch_data_from_server import fetch_data_from_server
+from api.middlewares.request_latency_middleware import RequestLatencyMiddleware
+from api.encoders import encode_ndjson, encode_csv, encode_packed_frames, encode_arrow_ipc
 from business_logic.business_logic_factory import BusinessLogicFactory
+from business_logic.archival_scheduler import ArchivalScheduler
+from business_logic.ingestion_scheduler import IngestionScheduler
 from business_logic.exceptions.failure_retrieving_invalid_data_reasons_exception \
     import FailureRetrievingInvalidDataReasonsException
 from business_logic.exceptions.failure_retrieving_data \
     import FailureRetrievingData
+from business_logic.exceptions.failure_retrieving_index_stats import FailureRetrievingIndexStats
+from business_logic.exceptions.failure_retrieving_data_aggregates import FailureRetrievingDataAggregates
+from business_logic.exceptions.invalid_bucket import InvalidBucket
+from business_logic.exceptions.invalid_cursor import InvalidCursor
+from infrastructure.metrics.constants import METRICS_MEDIA_TYPE
+from infrastructure.metrics.metrics import METRICS
+from models.cache_stats import CacheStats
 from models.data import Data
+from models.data_aggregate import DataAggregate
 from models.data_invalidation_reasons import DataInvalidationReasons
+from models.index_stats import IndexStats
+from models.projected_data import ProjectedData
+from models.ingestion_status import IngestionStatus
+
+PROJECTED_DATA_ADAPTER = TypeAdapter(list[ProjectedData])
 
-app = FastAPI()
 business_logic = BusinessLogicFactory.instantiate_business_logic()
+ingestion_scheduler = IngestionScheduler(business_logic=business_logic)
+archival_scheduler = ArchivalScheduler(business_logic=business_logic)
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    await business_logic.ensure_data_storage_indexes()
+    ingestion_scheduler.start()
+    archival_scheduler.start()
+    yield
+    await archival_scheduler.stop()
+    await ingestion_scheduler.stop()
+    await business_logic.close()
 
 
-@app.get(f"/{DATA_ENDPOINT}")
-@fetch_data_from_server(business_logic)
+app = FastAPI(lifespan=lifespan)
+if METRICS.enabled:
+    app.add_middleware(RequestLatencyMiddleware)
+
+
+@app.get(
+    f"/{DATA_ENDPOINT}",
+    response_model_exclude_none=True,
+    responses={200: {"content": {
+        NDJSON_MEDIA_TYPE: {},
+        CSV_MEDIA_TYPE: {},
+        PACKED_FRAME_MEDIA_TYPE: {},
+        ARROW_STREAM_MEDIA_TYPE: {},
+    }}},
+)
 @requires_permissions([READ_DATA_PERMISSION])
 async def get_data(
         start_time: datetime = None,
         end_time: datetime = None,
+        limit: Optional[int] = Query(None, gt=0, le=MAX_PAGE_LIMIT),
+        cursor: Optional[str] = None,
+        fields: Optional[list[Literal["time", "value", "tags"]]] = Query(None),
+        accept: Optional[str] = Header(None),
 ) -> list[Optional[Data]]:
+    # Falls back to JSON when nothing in the Accept header is supported
+    media_type = negotiate_media_type(accept, DATA_MEDIA_TYPES) or JSON_MEDIA_TYPE
+    if media_type != JSON_MEDIA_TYPE and (limit or cursor):
+        raise HTTPException(status_code=400, detail=f"limit and cursor aren't supported for {media_type}")
+    if media_type in (PACKED_FRAME_MEDIA_TYPE, ARROW_STREAM_MEDIA_TYPE) and fields:
+        raise HTTPException(
+            status_code=400,
+            detail=f"fields aren't supported for {media_type}, which always has the time and value",
+        )
+
+    if media_type == NDJSON_MEDIA_TYPE:
+        return StreamingResponse(
+            encode_ndjson(business_logic.stream_data(start_time=start_time, end_time=end_time, fields=fields)),
+            media_type=NDJSON_MEDIA_TYPE,
+        )
+    if media_type == CSV_MEDIA_TYPE:
+        return StreamingResponse(
+            encode_csv(
+                business_logic.stream_data(start_time=start_time, end_time=end_time, fields=fields),
+                fields=fields or ["time", "value", "tags"],
+            ),
+            media_type=CSV_MEDIA_TYPE,
+        )
     try:
-        return business_logic.get_data(start_time=start_time, end_time=end_time)
+        if media_type == PACKED_FRAME_MEDIA_TYPE:
+            return StreamingResponse(
+                encode_packed_frames(business_logic.stream_data_columns(start_time=start_time, end_time=end_time)),
+                media_type=PACKED_FRAME_MEDIA_TYPE,
+            )
+        if media_type == ARROW_STREAM_MEDIA_TYPE:
+            return StreamingResponse(
+                encode_arrow_ipc(business_logic.stream_data_columns(start_time=start_time, end_time=end_time)),
+                media_type=ARROW_STREAM_MEDIA_TYPE,
+            )
+        if limit or cursor:
+            data_page = await business_logic.get_data_page(
+                limit=limit or DEFAULT_PAGE_LIMIT,
+                start_time=start_time,
+                end_time=end_time,
+                cursor=cursor,
+                fields=fields,
+            )
+            # Returned as is, since with fields the data points don't have every field the Data schema requires
+            return Response(
+                content=PROJECTED_DATA_ADAPTER.dump_json(data_page.data, exclude_none=True),
+                media_type=JSON_MEDIA_TYPE,
+                headers={NEXT_CURSOR_HEADER: data_page.next_cursor} if data_page.next_cursor else None,
+            )
+        return Response(
+            content=await business_logic.get_data_json(start_time=start_time, end_time=end_time, fields=fields),
+            media_type=JSON_MEDIA_TYPE,
+        )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ImportError:
+        raise HTTPException(status_code=406, detail="Arrow output requires pyarrow to be installed")
     except FailureRetrievingData as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get(f"/{DATA_AGGREGATE_ENDPOINT}", response_model_exclude_none=True)
+@requires_permissions([READ_DATA_PERMISSION])
+async def get_data_aggregates(
+        bucket: str = Query(..., pattern=BUCKET_PATTERN),
+        start_time: datetime = None,
+        end_time: datetime = None,
+        aggregates: Optional[list[Literal["count", "min", "max", "mean", "last"]]] = Query(None),
+) -> list[DataAggregate]:
+    try:
+        return await business_logic.get_data_aggregates(
+            bucket=bucket,
+            start_time=start_time,
+            end_time=end_time,
+            aggregates=aggregates,
+        )
+    except InvalidBucket as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except FailureRetrievingDataAggregates as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @app.get(f"/{DATA_INVALIDATION_REASONS_ENDPOINT}")
-@fetch_data_from_server(business_logic)
 @requires_permissions([VIEW_DATA_INVALIDATION_REASONS_PERMISSION])
 async def get_discard_data(
         start_time: datetime = None,
         end_time: datetime = None,
+        reason: str = None,
+        tag: str = None,
 ) -> list[Optional[DataInvalidationReasons]]:
     try:
-        return business_logic.get_reasons_for_invalid_data(start_time=start_time, end_time=end_time)
+        return Response(
+            content=await business_logic.get_reasons_for_invalid_data_json(
+                start_time=start_time,
+                end_time=end_time,
+                reason=reason,
+                tag=tag,
+            ),
+            media_type=JSON_MEDIA_TYPE,
+        )
     except FailureRetrievingInvalidDataReasonsException as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get(f"/{INGESTION_STATUS_ENDPOINT}")
+@requires_permissions([VIEW_INGESTION_STATUS_PERMISSION])
+async def get_ingestion_status() -> IngestionStatus:
+    return ingestion_scheduler.get_status()
+
+
+@app.get(f"/{INDEX_STATS_ENDPOINT}")
+@requires_permissions([VIEW_INDEX_STATS_PERMISSION])
+async def get_index_stats() -> list[IndexStats]:
+    try:
+        return await business_logic.get_index_stats()
+    except FailureRetrievingIndexStats as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get(f"/{CACHE_STATS_ENDPOINT}", response_model_exclude_none=True)
+@requires_permissions([VIEW_CACHE_STATS_PERMISSION])
+async def get_cache_stats() -> CacheStats:
+    cache_stats = await business_logic.get_cache_stats()
+    if cache_stats is None:
+        raise HTTPException(status_code=404, detail="Query cache is disabled")
+    return cache_stats
+
+
+@app.get(f"/{METRICS_ENDPOINT}", include_in_schema=False)
+async def get_metrics() -> Response:
+    # Left without an API key so Prometheus can scrape it, it exposes no data points
+    if not METRICS.enabled:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return Response(content=METRICS.render(), media_type=METRICS_MEDIA_TYPE)
@@ -0,0 +1,36 @@
+import time
+from typing import Any, Awaitable, Callable
+
+from infrastructure.metrics.metrics import HTTP_REQUEST_SECONDS
+
+
+class RequestLatencyMiddleware:
+    # A plain ASGI middleware, so it adds no request/response wrapping and sees streamed bodies through to the end
+    def __init__(self, app: Callable[..., Awaitable[None]]):
+        self.app = app
+
+    async def __call__(self, scope: dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_and_observe(message: dict[str, Any]) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_and_observe)
+        finally:
+            # The router sets the matched route on the scope, its path template keeps the endpoint label bounded
+            route = scope.get("route")
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - start,
+                scope["method"],
+                route.path if route else "unmatched",
+                str(status_code),
+            )
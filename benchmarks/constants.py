@@ -0,0 +1,10 @@
+import os
+
+BENCHMARK_SIZES = [int(size) for size in os.getenv('BENCHMARK_SIZES', '10000,100000').split(',')]
+BENCHMARK_QUERY_REPEATS = int(os.getenv('BENCHMARK_QUERY_REPEATS', '5'))
+BENCHMARK_SPAN_SECONDS = float(os.getenv('BENCHMARK_SPAN_SECONDS', '1800'))
+BENCHMARK_SEED = int(os.getenv('BENCHMARK_SEED', '0'))
+BENCHMARK_BASELINE_PATH = f"{os.getenv('BENCHMARK_BASELINE_PATH', 'benchmarks/baselines.json')}"
+BENCHMARK_REGRESSION_TOLERANCE = float(os.getenv('BENCHMARK_REGRESSION_TOLERANCE', '0.2'))
+BENCHMARK_API_KEY = "user_api_key"
+BENCHMARK_TAGS = [[], [], [], ["sensor"], ["suspect"], ["system"]]
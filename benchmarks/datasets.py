@@ -0,0 +1,29 @@
+import random
+import struct
+import time
+from typing import Any
+
+from business_logic.business_logic import BusinessLogic
+from benchmarks.constants import BENCHMARK_SPAN_SECONDS, BENCHMARK_SEED, BENCHMARK_TAGS
+
+
+def generate_samples(size: int, end_time: float = None, seed: int = BENCHMARK_SEED) -> list[dict[str, Any]]:
+    # Shaped like the data server's samples and spread over the last BENCHMARK_SPAN_SECONDS,
+    # so the default rules only discard the ones tagged system or suspect
+    rng = random.Random(seed)
+    end_time = time.time() if end_time is None else end_time
+    interval = BENCHMARK_SPAN_SECONDS / size
+    start_time = end_time - size * interval
+    return [
+        {
+            "time": start_time + i * interval,
+            "value": list(struct.pack('<f', rng.uniform(-100, 100))),
+            "tags": list(rng.choice(BENCHMARK_TAGS)),
+        }
+        for i in range(size)
+    ]
+
+
+def generate_documents(size: int, decoded: bool = True) -> list[dict[str, Any]]:
+    samples = generate_samples(size)
+    return [BusinessLogic.build_document(s) for s in samples] if decoded else samples
@@ -0,0 +1,48 @@
+import resource
+import sys
+
+
+def percentile(values: list[float], q: float) -> float:
+    # Linear interpolation between the closest ranks
+    values = sorted(values)
+    position = (len(values) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+def get_peak_rss_bytes() -> int:
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak_rss if sys.platform == "darwin" else peak_rss * 1024
+
+
+def summarize(latencies: list[float], points: int, peak_rss_bytes: int) -> dict[str, float]:
+    return {
+        "operations": len(latencies),
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "points_per_second": points / sum(latencies),
+        "peak_rss_mib": peak_rss_bytes / 1024 / 1024,
+    }
+
+
+def find_regressions(
+        results: dict[str, dict[str, float]],
+        baselines: dict[str, dict[str, float]],
+        tolerance: float,
+) -> list[str]:
+    regressions = []
+    for name, result in results.items():
+        baseline = baselines.get(name)
+        if baseline is None:
+            continue
+        if result["p95_ms"] > baseline["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {result['p95_ms']:.3f} ms, baseline {baseline['p95_ms']:.3f} ms")
+        if result["points_per_second"] < baseline["points_per_second"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: {result['points_per_second']:.0f} points/s, "
+                f"baseline {baseline['points_per_second']:.0f} points/s"
+            )
+    return regressions
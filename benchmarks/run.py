@@ -0,0 +1,59 @@
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+
+from benchmarks.constants import BENCHMARK_SIZES, BENCHMARK_BASELINE_PATH, BENCHMARK_REGRESSION_TOLERANCE
+from benchmarks.measurement import find_regressions
+from benchmarks.suite import BENCHMARKS, run_benchmark
+
+
+def run_benchmarks(names: list[str], sizes: list[int]) -> dict[str, dict[str, float]]:
+    results = {}
+    # A fresh process per benchmark, so neither memory nor warmed up caches carry over between them
+    # (a pool with maxtasksperchild rather than ProcessPoolExecutor, whose max_tasks_per_child needs Python 3.11)
+    with multiprocessing.get_context("spawn").Pool(processes=1, maxtasksperchild=1) as pool:
+        for size in sizes:
+            for name in names:
+                result = pool.apply(run_benchmark, (name, size))
+                results[f"{name}[{size}]"] = result
+                print(
+                    f"{name}[{size}]: p50 {result['p50_ms']:.3f} ms, p95 {result['p95_ms']:.3f} ms, "
+                    f"p99 {result['p99_ms']:.3f} ms, {result['points_per_second']:.0f} points/s, "
+                    f"peak RSS {result['peak_rss_mib']:.1f} MiB",
+                    flush=True,
+                )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure the latency, throughput and memory of the ingest and query paths")
+    parser.add_argument("--benchmarks", nargs="+", choices=list(BENCHMARKS), default=list(BENCHMARKS))
+    parser.add_argument("--sizes", nargs="+", type=int, default=BENCHMARK_SIZES)
+    parser.add_argument("--baseline", default=BENCHMARK_BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=BENCHMARK_REGRESSION_TOLERANCE)
+    args = parser.parse_args()
+
+    results = run_benchmarks(names=args.benchmarks, sizes=args.sizes)
+
+    baselines = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as file:
+            baselines = json.load(file)
+    if args.save_baseline:
+        with open(args.baseline, "w") as file:
+            json.dump({**baselines, **results}, file, indent=2, sort_keys=True)
+        print(f"Baseline saved to {args.baseline}")
+        return
+
+    regressions = find_regressions(results=results, baselines=baselines, tolerance=args.tolerance)
+    for regression in regressions:
+        print(f"Regression: {regression}")
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
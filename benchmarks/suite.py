@@ -0,0 +1,129 @@
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Awaitable, Callable
+
+import httpx
+
+from api.constants import DATA_ENDPOINT, JSON_MEDIA_TYPE, NDJSON_MEDIA_TYPE, PACKED_FRAME_MEDIA_TYPE
+from benchmarks.constants import BENCHMARK_QUERY_REPEATS, BENCHMARK_API_KEY
+from benchmarks.datasets import generate_samples, generate_documents
+from benchmarks.measurement import get_peak_rss_bytes, summarize
+from business_logic.business_logic import BusinessLogic
+from infrastructure.clients.external_data_service import ExternalDataService
+from infrastructure.data.storage.memory.in_memory_data_storage import InMemoryDataStorage
+
+# Each benchmark returns the latency of every operation and the number of data points they processed
+BENCHMARKS: dict[str, Callable[[int], Awaitable[tuple[list[float], int]]]] = {}
+
+
+def benchmark(name: str) -> Callable:
+    def register(function: Callable) -> Callable:
+        BENCHMARKS[name] = function
+        return function
+    return register
+
+
+def run_benchmark(name: str, size: int) -> dict[str, float]:
+    # Meant to run in a fresh process, so the peak RSS is this benchmark's alone
+    latencies, points = asyncio.run(BENCHMARKS[name](size))
+    return summarize(latencies=latencies, points=points, peak_rss_bytes=get_peak_rss_bytes())
+
+
+def create_business_logic() -> BusinessLogic:
+    # No query cache nor hot data, so every query reaches the data storage
+    business_logic = BusinessLogic(data_storage=InMemoryDataStorage())
+    business_logic.logger.setLevel(logging.WARNING)
+    return business_logic
+
+
+async def load_business_logic(documents: list[dict], decoded: bool = True) -> BusinessLogic:
+    business_logic = create_business_logic()
+    if decoded:
+        await business_logic.data_storage.save_many_data(documents)
+    else:
+        # Documents stored before values were decoded on ingestion, which are decoded on every read
+        business_logic.data_storage.data_collection.insert(documents)
+    return business_logic
+
+
+async def time_operations(operation: Callable[[], Awaitable], repeats: int) -> list[float]:
+    latencies = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        await operation()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+@benchmark("ingest")
+async def benchmark_ingest(size: int) -> tuple[list[float], int]:
+    samples = iter(generate_samples(size))
+    # Stands in for the data server, so only the service's own overhead is measured
+    ExternalDataService.client = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(200, json=next(samples)))
+    )
+    business_logic = create_business_logic()
+    latencies = await time_operations(business_logic.fetch_data_from_server, repeats=size)
+    await business_logic.close()
+    return latencies, size
+
+
+@benchmark("get_data")
+async def benchmark_get_data(size: int) -> tuple[list[float], int]:
+    business_logic = await load_business_logic(generate_documents(size))
+    latencies = await time_operations(business_logic.get_data_json, repeats=BENCHMARK_QUERY_REPEATS)
+    return latencies, size * BENCHMARK_QUERY_REPEATS
+
+
+@benchmark("get_data_range")
+async def benchmark_get_data_range(size: int) -> tuple[list[float], int]:
+    documents = generate_documents(size)
+    business_logic = await load_business_logic(documents)
+    # The most recent tenth of the data, the usual dashboard query
+    start_time = datetime.fromtimestamp(documents[size - size // 10]["time"])
+    latencies = await time_operations(
+        lambda: business_logic.get_data_json(start_time=start_time),
+        repeats=BENCHMARK_QUERY_REPEATS * 10,
+    )
+    return latencies, size // 10 * BENCHMARK_QUERY_REPEATS * 10
+
+
+@benchmark("decode_value")
+async def benchmark_decode_value(size: int) -> tuple[list[float], int]:
+    business_logic = await load_business_logic(generate_documents(size, decoded=False), decoded=False)
+    latencies = await time_operations(business_logic.get_data_json, repeats=BENCHMARK_QUERY_REPEATS)
+    return latencies, size * BENCHMARK_QUERY_REPEATS
+
+
+async def benchmark_endpoint(size: int, accept: str) -> tuple[list[float], int]:
+    # Imported here because the endpoints module builds its own business logic when it's imported
+    from api import endpoints
+
+    endpoints.business_logic = await load_business_logic(generate_documents(size))
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=endpoints.app), base_url="http://benchmark")
+    headers = {"api-key": BENCHMARK_API_KEY, "accept": accept}
+
+    async def get_data() -> None:
+        response = await client.get(f"/{DATA_ENDPOINT}", headers=headers)
+        response.raise_for_status()
+
+    latencies = await time_operations(get_data, repeats=BENCHMARK_QUERY_REPEATS)
+    await client.aclose()
+    return latencies, size * BENCHMARK_QUERY_REPEATS
+
+
+@benchmark("endpoint_json")
+async def benchmark_endpoint_json(size: int) -> tuple[list[float], int]:
+    return await benchmark_endpoint(size, accept=JSON_MEDIA_TYPE)
+
+
+@benchmark("endpoint_ndjson")
+async def benchmark_endpoint_ndjson(size: int) -> tuple[list[float], int]:
+    return await benchmark_endpoint(size, accept=NDJSON_MEDIA_TYPE)
+
+
+@benchmark("endpoint_packed")
+async def benchmark_endpoint_packed(size: int) -> tuple[list[float], int]:
+    return await benchmark_endpoint(size, accept=PACKED_FRAME_MEDIA_TYPE)
@@ -0,0 +1,47 @@
+import asyncio
+import logging
+from typing import Optional
+
+from business_logic.business_logic import BusinessLogic
+from business_logic.constants import ARCHIVE_AFTER_SECONDS, ARCHIVE_INTERVAL_SECONDS
+
+
+class ArchivalScheduler:
+    def __init__(
+            self,
+            business_logic: BusinessLogic,
+            archive_after_seconds: int = ARCHIVE_AFTER_SECONDS,
+            interval_seconds: float = ARCHIVE_INTERVAL_SECONDS,
+    ):
+        self.business_logic = business_logic
+        self.archive_after_seconds = archive_after_seconds
+        self.interval_seconds = interval_seconds
+        self.logger = logging.getLogger(__name__)
+        self.__task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self.__task is not None and not self.__task.done()
+
+    def start(self) -> None:
+        if not self.archive_after_seconds:
+            return
+        if not self.running:
+            self.logger.info("Starting archival scheduler...")
+            self.__task = asyncio.create_task(self.__run())
+
+    async def stop(self) -> None:
+        if self.__task is None:
+            return
+        self.logger.info("Stopping archival scheduler...")
+        self.__task.cancel()
+        try:
+            await self.__task
+        except asyncio.CancelledError:
+            pass
+        self.__task = None
+
+    async def __run(self) -> None:
+        while True:
+            await self.business_logic.archive_data(archive_after_seconds=self.archive_after_seconds)
+            await asyncio.sleep(self.interval_seconds)
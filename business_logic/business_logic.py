@@ -1,128 +1,496 @@
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Optional
+import base64
+import binascii
+import json
 import struct
+import sys
 import logging
-from datetime import datetime, timedelta
+from array import array
+from collections import Counter
+from itertools import chain
+from datetime import datetime, timedelta, timezone
+from pydantic import TypeAdapter
+from infrastructure.cache.abstract_query_cache import AbstractQueryCache
 from infrastructure.data.storage.abstract_data_storage import AbstractDataStorage
+from infrastructure.data.storage.hot_data_ring_buffer import HotDataRingBuffer
 from infrastructure.clients.external_data_service import ExternalDataService
+from infrastructure.metrics.metrics import (
+    DECODE_SECONDS,
+    SERIALIZATION_SECONDS,
+    VALIDATED_POINTS_TOTAL,
+    INVALID_POINT_REASONS_TOTAL,
+)
+from business_logic.rule_engine import RuleEngine
 from business_logic.constants import (
-    SYSTEM_TAG,
-    SUSPECT_TAG,
-    REASON_DATA_IS_TOO_OLD,
-    REASON_DATA_IS_INTERNAL_TO_SYSTEM,
-    REASON_DATA_IS_INACCURATE,
+    FLOAT_SIZE_IN_BYTES,
+    DATA_FIELDS_TO_STORED_FIELDS,
+    BUCKET_UNITS_IN_SECONDS,
+    AGGREGATES,
+    DATA_CACHE_KIND,
+    DATA_INVALIDATION_REASONS_CACHE_KIND,
+    DATA_COLUMNS_CHUNK_SIZE,
+    STORED_DATA_FIELDS,
+    STORED_DATA_INVALIDATION_REASONS_FIELDS,
 )
+from business_logic.exceptions.failure_fetching_data import FailureFetchingData
 from business_logic.exceptions.failure_retrieving_data \
     import FailureRetrievingData
 from business_logic.exceptions.failure_retrieving_invalid_data_reasons_exception \
     import FailureRetrievingInvalidDataReasonsException
-from models.data import Data
-from models.data_invalidation_reasons import DataInvalidationReasons
+from business_logic.exceptions.failure_retrieving_index_stats import FailureRetrievingIndexStats
+from business_logic.exceptions.failure_retrieving_data_aggregates import FailureRetrievingDataAggregates
+from business_logic.exceptions.invalid_bucket import InvalidBucket
+from business_logic.exceptions.invalid_cursor import InvalidCursor
+from models.projected_data import ProjectedData
+from models.data_aggregate import DataAggregate
+from models.data_page import DataPage
+from models.cache_stats import CacheStats
+from models.index_stats import IndexStats
+from models.stored_data import StoredData
+from models.stored_data_invalidation_reasons import StoredDataInvalidationReasons
+
+STORED_DATA_ADAPTER = TypeAdapter(list[StoredData])
+STORED_DATA_INVALIDATION_REASONS_ADAPTER = TypeAdapter(list[StoredDataInvalidationReasons])
 
 
 class BusinessLogic:
-    def __init__(self, data_storage: AbstractDataStorage):
+    def __init__(
+            self,
+            data_storage: AbstractDataStorage,
+            query_cache: AbstractQueryCache = None,
+            rule_engine: RuleEngine = None,
+            hot_data: HotDataRingBuffer = None,
+    ):
         self.data_storage = data_storage
+        self.rule_engine = rule_engine or RuleEngine()
+        self.hot_data = hot_data
+        self.query_cache = query_cache
+        if query_cache:
+            data_storage.add_write_listener(query_cache.invalidate)
         self.logger = logging.getLogger(__name__)
         self.logger.setLevel(logging.DEBUG)
         self.logger.addHandler(logging.StreamHandler())
 
-    def fetch_data_from_server(self) -> None:
+    async def fetch_data_from_server(self) -> bool:
         try:
             self.logger.info("Fetching data from server...")
-            server_data = ExternalDataService.fetch_data_from_server()
+            server_data = await ExternalDataService.fetch_data_from_server()
 
             if server_data:
-                self.data_storage.save_data(server_data)
-
-                invalid_data = self.__invalidate_data(server_data)
+                data = self.build_document(server_data)
+                invalid_data = self.__invalidate_data([data])[0]
 
+                # Each data point is stored either as data or as invalid data with its reasons, never both
                 if invalid_data:
-                    self.data_storage.save_reasons_for_invalid_data(invalid_data)
+                    await self.data_storage.save_reasons_for_invalid_data(invalid_data)
                     self.logger.info("Invalid data saved with reasons.")
+                else:
+                    await self.data_storage.save_data(data)
+                    if self.hot_data is not None:
+                        self.hot_data.append([data])
+
+                await self.data_storage.update_rollups(
+                    data=[] if invalid_data else [data],
+                    discard_reasons=[invalid_data] if invalid_data else [],
+                )
             else:
                 self.logger.warning("No data fetched from server.")
+            return True
         except Exception as e:
             self.logger.error(f"Error fetching data from server: {e}")
+            return False
+
+    async def fetch_sample(self) -> Optional[dict[str, Any]]:
+        try:
+            server_data = await ExternalDataService.fetch_data_from_server()
+            return self.build_document(server_data) if server_data else None
+        except Exception as e:
+            self.logger.error(f"Error fetching data from server: {e}")
+            raise FailureFetchingData(f"Error fetching data from server: {e}")
+
+    async def save_samples(self, data: list[dict[str, Any]]) -> bool:
+        try:
+            valid_data, invalid_data = [], []
+            for d, invalid_d in zip(data, self.__invalidate_data(data)):
+                if invalid_d:
+                    invalid_data.append(invalid_d)
+                else:
+                    valid_data.append(d)
 
-    def get_data(self, start_time: datetime = None, end_time: datetime = None) -> list[Optional[Data]]:
+            if valid_data:
+                await self.data_storage.save_many_data(valid_data)
+                if self.hot_data is not None:
+                    self.hot_data.append(sorted(valid_data, key=lambda d: d["time"]))
+            if invalid_data:
+                await self.data_storage.save_many_reasons_for_invalid_data(invalid_data)
+
+            await self.data_storage.update_rollups(data=valid_data, discard_reasons=invalid_data)
+            return True
+        except Exception as e:
+            self.logger.error(f"Error saving data: {e}")
+            return False
+
+    async def get_data_json(
+            self,
+            start_time: datetime = None,
+            end_time: datetime = None,
+            fields: list[str] = None,
+    ) -> bytes:
         try:
             self.logger.info("Retrieving data...")
-            data = self.data_storage.get_data(start_time=start_time, end_time=end_time)
+            if self.hot_data is not None and start_time and self.hot_data.covers(start_time.timestamp()):
+                self.logger.info("Data retrieved from hot data")
+                data = self.hot_data.get_data(
+                    start_time=start_time.timestamp(),
+                    end_time=end_time.timestamp() if end_time else None,
+                    fields=self.__to_stored_fields(fields=fields),
+                )
+                with SERIALIZATION_SECONDS.time(DATA_CACHE_KIND):
+                    return STORED_DATA_ADAPTER.dump_json(data, by_alias=True, exclude_none=True)
 
-            data = self.__decode_value(data=data)
+            cache_key = self.__get_cache_key(DATA_CACHE_KIND, start_time, end_time, fields)
+            cached_data = await self.query_cache.get(cache_key) if self.query_cache else None
+            if cached_data is not None:
+                self.logger.info("Data retrieved from cache")
+                return cached_data
+            cache_version = await self.query_cache.get_version() if self.query_cache else None
+
+            data = await self.data_storage.get_data(
+                start_time=start_time,
+                end_time=end_time,
+                fields=self.__to_stored_fields(fields=fields),
+            )
+
+            data = self.__to_stored_fields_order(self.__decode_legacy_documents(data=data), STORED_DATA_FIELDS)
+            with SERIALIZATION_SECONDS.time(DATA_CACHE_KIND):
+                data = STORED_DATA_ADAPTER.dump_json(data, by_alias=True, exclude_none=True)
+
+            if self.query_cache:
+                await self.query_cache.set(
+                    key=cache_key,
+                    value=data,
+                    start=start_time.timestamp() if start_time else None,
+                    end=end_time.timestamp() if end_time else None,
+                    version=cache_version,
+                )
 
             self.logger.info("Data retrieved successfully")
-            return [
-                Data(time=self.__unix_timestamp_to_iso8601_timestamp(d['time']), value=d['value'], tags=d['tags'])
-                for d in data
-            ]
+            return data
         except Exception as e:
             self.logger.error(f"Error retrieving data: {e}")
             raise FailureRetrievingData(
                 f"Error retrieving data: {e}"
             )
 
-    def get_reasons_for_invalid_data(
+    async def stream_data_columns(
+            self,
+            start_time: datetime = None,
+            end_time: datetime = None,
+            chunk_size: int = DATA_COLUMNS_CHUNK_SIZE,
+    ) -> AsyncIterator[tuple[array, array]]:
+        data = self.data_storage.stream_data(
+            start_time=start_time,
+            end_time=end_time,
+            fields=["time", "decoded_value", "value"],
+        )
+        chunk = []
+        async for d in data:
+            chunk.append(d)
+            if len(chunk) == chunk_size:
+                yield self.__to_columns(chunk)
+                chunk = []
+        if chunk:
+            yield self.__to_columns(chunk)
+
+    async def get_data_page(
             self,
+            limit: int,
             start_time: datetime = None,
-            end_time: datetime = None
-    ) -> list[Optional[DataInvalidationReasons]]:
+            end_time: datetime = None,
+            cursor: str = None,
+            fields: list[str] = None,
+    ) -> DataPage:
+        after = self.__decode_cursor(cursor) if cursor else None
         try:
-            self.logger.info("Retrieving reasons for invalid data...")
+            self.logger.info("Retrieving data page...")
+            data, next_after = await self.data_storage.get_data_page(
+                limit=limit,
+                start_time=start_time,
+                end_time=end_time,
+                after=after,
+                fields=self.__to_stored_fields(fields=fields),
+            )
 
-            discard_reasons = self.data_storage.get_reasons_for_invalid_data(start_time=start_time, end_time=end_time)
+            data = self.__decode_legacy_documents(data=data)
 
-            discard_reasons = self.__decode_value(data=discard_reasons)
+            self.logger.info("Data page retrieved successfully")
+            return DataPage(
+                data=[self.__to_data(d) for d in data],
+                next_cursor=self.__encode_cursor(next_after) if next_after else None,
+            )
+        except InvalidCursor:
+            # The storage validates the id part, which depends on the backend that issued the cursor
+            raise
+        except Exception as e:
+            self.logger.error(f"Error retrieving data page: {e}")
+            raise FailureRetrievingData(
+                f"Error retrieving data page: {e}"
+            )
 
-            self.logger.info("Reasons for invalid data retrieved successfully")
+    async def stream_data(
+            self,
+            start_time: datetime = None,
+            end_time: datetime = None,
+            fields: list[str] = None,
+    ) -> AsyncIterator[ProjectedData]:
+        self.logger.info("Streaming data...")
+        data = self.data_storage.stream_data(
+            start_time=start_time,
+            end_time=end_time,
+            fields=self.__to_stored_fields(fields=fields),
+        )
+        async for d in data:
+            d = self.__decode_legacy_documents(data=[d])[0]
+            yield self.__to_data(d)
+
+    async def get_data_aggregates(
+            self,
+            bucket: str,
+            start_time: datetime = None,
+            end_time: datetime = None,
+            aggregates: list[str] = None,
+    ) -> list[DataAggregate]:
+        bucket_seconds = self.__bucket_to_seconds(bucket)
+        aggregates = aggregates or AGGREGATES
+        try:
+            self.logger.info("Retrieving data aggregates...")
+            data_aggregates = await self.data_storage.aggregate_data(
+                bucket_seconds=bucket_seconds,
+                start_time=start_time,
+                end_time=end_time,
+                aggregates=aggregates,
+            )
+
+            self.logger.info("Data aggregates retrieved successfully")
             return [
-                DataInvalidationReasons(
-                    time=self.__unix_timestamp_to_iso8601_timestamp(d['time']),
-                    value=d['value'],
-                    tags=d['tags'],
-                    reasons=d['reasons']
+                DataAggregate(
+                    time=self.__unix_timestamp_to_iso8601_timestamp(a['bucket']),
+                    **{aggregate: a[aggregate] for aggregate in aggregates},
                 )
-                for d in discard_reasons
+                for a in data_aggregates
             ]
+        except Exception as e:
+            self.logger.error(f"Error retrieving data aggregates: {e}")
+            raise FailureRetrievingDataAggregates(
+                f"Error retrieving data aggregates: {e}"
+            )
+
+    async def get_reasons_for_invalid_data_json(
+            self,
+            start_time: datetime = None,
+            end_time: datetime = None,
+            reason: str = None,
+            tag: str = None,
+    ) -> bytes:
+        try:
+            self.logger.info("Retrieving reasons for invalid data...")
+            cache_key = self.__get_cache_key(DATA_INVALIDATION_REASONS_CACHE_KIND, start_time, end_time, reason, tag)
+            cached_discard_reasons = await self.query_cache.get(cache_key) if self.query_cache else None
+            if cached_discard_reasons is not None:
+                self.logger.info("Reasons for invalid data retrieved from cache")
+                return cached_discard_reasons
+            cache_version = await self.query_cache.get_version() if self.query_cache else None
+
+            discard_reasons = await self.data_storage.get_reasons_for_invalid_data(
+                start_time=start_time,
+                end_time=end_time,
+                reason=reason,
+                tag=tag,
+            )
+
+            discard_reasons = self.__to_stored_fields_order(
+                self.__decode_legacy_documents(data=discard_reasons), STORED_DATA_INVALIDATION_REASONS_FIELDS
+            )
+            with SERIALIZATION_SECONDS.time(DATA_INVALIDATION_REASONS_CACHE_KIND):
+                discard_reasons = STORED_DATA_INVALIDATION_REASONS_ADAPTER.dump_json(discard_reasons, by_alias=True)
+
+            if self.query_cache:
+                await self.query_cache.set(
+                    key=cache_key,
+                    value=discard_reasons,
+                    start=start_time.timestamp() if start_time else None,
+                    end=end_time.timestamp() if end_time else None,
+                    version=cache_version,
+                )
+
+            self.logger.info("Reasons for invalid data retrieved successfully")
+            return discard_reasons
         except Exception as e:
             self.logger.error(f"Error retrieving reasons for invalid data: {e}")
             raise FailureRetrievingInvalidDataReasonsException(
                 f"Error retrieving reasons for invalid data: {e}"
             )
 
-    def __invalidate_data(self, data: dict[str, Any]) -> dict[str, Any]:
-        reasons = []
+    async def close(self) -> None:
+        await self.data_storage.close()
+        await ExternalDataService.close()
+
+    async def get_cache_stats(self) -> Optional[CacheStats]:
+        if not self.query_cache:
+            return None
+        return CacheStats(**await self.query_cache.get_stats())
+
+    async def ensure_data_storage_indexes(self) -> None:
+        try:
+            self.logger.info("Ensuring data storage indexes...")
+            await self.data_storage.ensure_indexes()
+        except Exception as e:
+            self.logger.error(f"Error ensuring data storage indexes: {e}")
+
+    async def archive_data(self, archive_after_seconds: int) -> int:
+        try:
+            # Only whole hours are archived, so every archive file covers a complete hour
+            before = datetime.now(tz=timezone.utc) - timedelta(seconds=archive_after_seconds)
+            before = before.replace(minute=0, second=0, microsecond=0)
+            self.logger.info(f"Archiving data older than {before.isoformat()}...")
+            archived_documents = await self.data_storage.archive_data(before=before)
+            self.logger.info(f"Archived {archived_documents} documents")
+            return archived_documents
+        except Exception as e:
+            self.logger.error(f"Error archiving data: {e}")
+            return 0
 
-        if self.__is_data_too_old(timestamp=data['time']):
-            reasons.append(REASON_DATA_IS_TOO_OLD)
+    async def get_index_stats(self) -> list[IndexStats]:
+        try:
+            self.logger.info("Retrieving index stats...")
+            index_stats = await self.data_storage.get_index_stats()
 
-        if self.__is_data_internal_to_system(data_tags=data['tags']):
-            reasons.append(REASON_DATA_IS_INTERNAL_TO_SYSTEM)
+            self.logger.info("Index stats retrieved successfully")
+            return [
+                IndexStats(
+                    collection=s['collection'],
+                    name=s['name'],
+                    key=s['key'],
+                    accesses=s['accesses']['ops'],
+                    since=s['accesses']['since'].isoformat() if s['accesses'].get('since') else None,
+                )
+                for s in index_stats
+            ]
+        except Exception as e:
+            self.logger.error(f"Error retrieving index stats: {e}")
+            raise FailureRetrievingIndexStats(
+                f"Error retrieving index stats: {e}"
+            )
 
-        if self.__is_data_potentially_inaccurate(data_tags=data['tags']):
-            reasons.append(REASON_DATA_IS_INACCURATE)
+    @staticmethod
+    def build_document(data: dict[str, Any]) -> dict[str, Any]:
+        # The raw value is kept for auditing, the decoded fields are what the read path returns
+        with DECODE_SECONDS.time("ingest"):
+            return {
+                **data,
+                "decoded_value": struct.unpack('<f', bytes(data["value"]))[0],
+                "iso_time": BusinessLogic.__unix_timestamp_to_iso8601_timestamp(data["time"]),
+                "date": datetime.fromtimestamp(data["time"], tz=timezone.utc),
+            }
 
-        return {"time": data['time'], "value": data["value"], "tags": data["tags"], "reasons": reasons} \
-            if reasons else {}
+    def __invalidate_data(self, data: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        reasons_per_data = self.rule_engine.validate(data)
+        if VALIDATED_POINTS_TOTAL.enabled:
+            # Counted once per batch rather than per data point
+            invalid_reasons = Counter(reason for reasons in reasons_per_data for reason in reasons)
+            invalid_count = sum(1 for reasons in reasons_per_data if reasons)
+            VALIDATED_POINTS_TOTAL.increment("valid", amount=len(data) - invalid_count)
+            VALIDATED_POINTS_TOTAL.increment("invalid", amount=invalid_count)
+            for reason, count in invalid_reasons.items():
+                INVALID_POINT_REASONS_TOTAL.increment(reason, amount=count)
+        return [
+            {**d, "reasons": reasons} if reasons else {}
+            for d, reasons in zip(data, reasons_per_data)
+        ]
 
     @staticmethod
-    def __is_data_too_old(timestamp: int) -> bool:
-        return timestamp < (datetime.now() - timedelta(hours=1)).timestamp()
+    def __bucket_to_seconds(bucket: str) -> int:
+        amount, unit = bucket[:-1], bucket[-1:]
+        if not amount.isdigit() or int(amount) == 0 or unit not in BUCKET_UNITS_IN_SECONDS:
+            raise InvalidBucket(f"Invalid bucket: {bucket}")
+        return int(amount) * BUCKET_UNITS_IN_SECONDS[unit]
 
     @staticmethod
-    def __is_data_internal_to_system(data_tags: list[str]) -> bool:
-        return SYSTEM_TAG in data_tags
+    def __get_cache_key(kind: str, start_time: Optional[datetime], end_time: Optional[datetime], *filters) -> str:
+        start = start_time.timestamp() if start_time else ""
+        end = end_time.timestamp() if end_time else ""
+        return json.dumps([kind, start, end, *filters])
 
     @staticmethod
-    def __is_data_potentially_inaccurate(data_tags: list[str]) -> bool:
-        return SUSPECT_TAG in data_tags
+    def __encode_cursor(after: tuple[float, str]) -> str:
+        return base64.urlsafe_b64encode(json.dumps(after).encode()).decode()
+
+    @staticmethod
+    def __decode_cursor(cursor: str) -> tuple[float, str]:
+        try:
+            after_time, after_key = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            return float(after_time), str(after_key)
+        except (binascii.Error, ValueError, TypeError) as e:
+            raise InvalidCursor(f"Invalid cursor: {cursor}") from e
 
     @staticmethod
     def __unix_timestamp_to_iso8601_timestamp(unix_timestamp: int):
         return datetime.fromtimestamp(unix_timestamp).isoformat()
 
+    @staticmethod
+    def __to_stored_fields(fields: list[str] = None) -> Optional[list[str]]:
+        return [stored_field for f in fields for stored_field in DATA_FIELDS_TO_STORED_FIELDS[f]] if fields else None
+
+    @staticmethod
+    def __to_stored_fields_order(data: list[dict[str, Any]], stored_fields: tuple[str, ...]) -> list[dict[str, Any]]:
+        # Serialized in the order of the keys, which depends on how each document was stored,
+        # so they're put in the order the hot data uses
+        return [{f: d[f] for f in stored_fields if f in d} for d in data]
+
+    @staticmethod
+    def __to_data(d: dict[str, Any]) -> ProjectedData:
+        return ProjectedData(time=d.get('iso_time'), value=d.get('decoded_value'), tags=d.get('tags'))
+
+    @staticmethod
+    def __to_columns(data: list[dict[str, Any]]) -> tuple[array, array]:
+        data = BusinessLogic.__decode_legacy_values(data=data)
+        times = array('q', [int(d['time']) for d in data])
+        values = array('f', [
+            d['decoded_value'] if d.get('decoded_value') is not None else float("nan") for d in data
+        ])
+        return times, values
+
+    @staticmethod
+    def __decode_legacy_values(data: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        # Documents stored before values were decoded at ingest time
+        legacy_data = [d for d in data if 'value' in d and 'decoded_value' not in d]
+        if legacy_data:
+            with DECODE_SECONDS.time("read"):
+                for d in BusinessLogic.__decode_value(data=legacy_data):
+                    d['decoded_value'] = d['value']
+        return data
+
+    @staticmethod
+    def __decode_legacy_documents(data: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        data = BusinessLogic.__decode_legacy_values(data=data)
+        for d in data:
+            if 'time' in d and 'iso_time' not in d:
+                d['iso_time'] = BusinessLogic.__unix_timestamp_to_iso8601_timestamp(d['time'])
+        return data
+
     @staticmethod
     def __decode_value(data: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        values = [d["value"] for d in data]
+
+        if all(len(value) == FLOAT_SIZE_IN_BYTES for value in values):
+            # Decode all the values at once as little-endian 32-bit floats
+            decoded_values = array('f', bytes(chain.from_iterable(values)))
+            if sys.byteorder == "big":
+                decoded_values.byteswap()
+            for d, decoded_value in zip(data, decoded_values):
+                d['value'] = decoded_value
+            return data
+
         for d in data:
             # Convert the array of bytes to bytes object
             byte_value = bytes(d["value"])
@@ -132,6 +500,3 @@ class BusinessLogic:
 
             d['value'] = decoded_value
         return data
-
-
-
@@ -1,9 +1,43 @@
+from typing import Optional
+
 from business_logic.business_logic import BusinessLogic
+from business_logic.constants import VALIDATION_RULES_PATH
+from business_logic.rule_engine import RuleEngine
 
+from infrastructure.cache.abstract_query_cache import AbstractQueryCache
+from infrastructure.cache.constants import QUERY_CACHE_BACKEND
+from infrastructure.cache.in_memory_query_cache import InMemoryQueryCache
+from infrastructure.cache.redis_query_cache import RedisQueryCache
+from infrastructure.data.storage.abstract_data_storage import AbstractDataStorage
+from infrastructure.data.storage.constants import HOT_DATA_CAPACITY, DATA_STORAGE_BACKEND
+from infrastructure.data.storage.hot_data_ring_buffer import HotDataRingBuffer
+from infrastructure.data.storage.memory.in_memory_data_storage import InMemoryDataStorage
 from infrastructure.data.storage.mongodb.mongodb_data_storage import MongoDBDataStorage
+from infrastructure.data.storage.sqlite.sqlite_data_storage import SQLiteDataStorage
 
 
 class BusinessLogicFactory:
     @staticmethod
     def instantiate_business_logic() -> BusinessLogic:
-        return BusinessLogic(data_storage=MongoDBDataStorage())
+        return BusinessLogic(
+            data_storage=BusinessLogicFactory.instantiate_data_storage(),
+            query_cache=BusinessLogicFactory.instantiate_query_cache(),
+            rule_engine=RuleEngine.from_file(VALIDATION_RULES_PATH),
+            hot_data=HotDataRingBuffer() if HOT_DATA_CAPACITY else None,
+        )
+
+    @staticmethod
+    def instantiate_data_storage(backend: str = DATA_STORAGE_BACKEND) -> AbstractDataStorage:
+        if backend == "memory":
+            return InMemoryDataStorage()
+        elif backend == "sqlite":
+            return SQLiteDataStorage()
+        return MongoDBDataStorage()
+
+    @staticmethod
+    def instantiate_query_cache(backend: str = QUERY_CACHE_BACKEND) -> Optional[AbstractQueryCache]:
+        if backend == "memory":
+            return InMemoryQueryCache()
+        elif backend == "redis":
+            return RedisQueryCache()
+        return None
@@ -1,5 +1,33 @@
+import os
+
 SYSTEM_TAG = "system"
 SUSPECT_TAG = "suspect"
 REASON_DATA_IS_TOO_OLD = "Data is too old"
 REASON_DATA_IS_INTERNAL_TO_SYSTEM = "Data is internal to the system"
 REASON_DATA_IS_INACCURATE = "Potentially inaccurate data"
+DATA_MAX_AGE_SECONDS = 3600
+DEFAULT_VALIDATION_RULES = [
+    {"reason": REASON_DATA_IS_TOO_OLD, "type": "max_age", "max_age_seconds": DATA_MAX_AGE_SECONDS},
+    {"reason": REASON_DATA_IS_INTERNAL_TO_SYSTEM, "type": "tags", "tags": [SYSTEM_TAG]},
+    {"reason": REASON_DATA_IS_INACCURATE, "type": "tags", "tags": [SUSPECT_TAG]},
+]
+VALIDATION_RULES_PATH = os.getenv('VALIDATION_RULES_PATH')
+FLOAT_SIZE_IN_BYTES = 4
+# Documents stored before values were decoded at ingest time only have the raw time and value
+DATA_FIELDS_TO_STORED_FIELDS = {"time": ["iso_time", "time"], "value": ["decoded_value", "value"], "tags": ["tags"]}
+STORED_DATA_FIELDS = ("iso_time", "decoded_value", "tags")
+STORED_DATA_INVALIDATION_REASONS_FIELDS = (*STORED_DATA_FIELDS, "reasons")
+# Data points per chunk of the packed and Arrow exports
+DATA_COLUMNS_CHUNK_SIZE = int(os.getenv('DATA_COLUMNS_CHUNK_SIZE', '10000'))
+BUCKET_UNITS_IN_SECONDS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+AGGREGATES = ("count", "min", "max", "mean", "last")
+DATA_CACHE_KIND = "data"
+DATA_INVALIDATION_REASONS_CACHE_KIND = "data_invalidation_reasons"
+INGESTION_INTERVAL_SECONDS = float(os.getenv('INGESTION_INTERVAL_SECONDS', '1'))
+INGESTION_MAX_BACKOFF_SECONDS = float(os.getenv('INGESTION_MAX_BACKOFF_SECONDS', '60'))
+INGESTION_CONCURRENCY = int(os.getenv('INGESTION_CONCURRENCY', '1'))
+INGESTION_QUEUE_SIZE = int(os.getenv('INGESTION_QUEUE_SIZE', '10000'))
+INGESTION_BATCH_SIZE = int(os.getenv('INGESTION_BATCH_SIZE', '500'))
+INGESTION_DEDUPE_WINDOW = int(os.getenv('INGESTION_DEDUPE_WINDOW', '10000'))
+ARCHIVE_AFTER_SECONDS = int(os.getenv('ARCHIVE_AFTER_SECONDS', '0'))
+ARCHIVE_INTERVAL_SECONDS = float(os.getenv('ARCHIVE_INTERVAL_SECONDS', '3600'))
@@ -0,0 +1,2 @@
+class FailureFetchingData(Exception):
+    pass
@@ -0,0 +1,2 @@
+class FailureRetrievingDataAggregates(Exception):
+    pass
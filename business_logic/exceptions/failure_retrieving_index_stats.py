@@ -0,0 +1,2 @@
+class FailureRetrievingIndexStats(Exception):
+    pass
@@ -0,0 +1,2 @@
+class InvalidBucket(Exception):
+    pass
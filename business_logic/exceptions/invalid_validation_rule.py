@@ -0,0 +1,2 @@
+class InvalidValidationRule(Exception):
+    pass
@@ -0,0 +1,172 @@
+import asyncio
+import logging
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Optional
+
+from business_logic.business_logic import BusinessLogic
+from business_logic.constants import (
+    INGESTION_INTERVAL_SECONDS,
+    INGESTION_MAX_BACKOFF_SECONDS,
+    INGESTION_CONCURRENCY,
+    INGESTION_QUEUE_SIZE,
+    INGESTION_BATCH_SIZE,
+    INGESTION_DEDUPE_WINDOW,
+)
+from business_logic.exceptions.failure_fetching_data import FailureFetchingData
+from models.ingestion_status import IngestionStatus
+
+
+class IngestionScheduler:
+    def __init__(
+            self,
+            business_logic: BusinessLogic,
+            interval_seconds: float = INGESTION_INTERVAL_SECONDS,
+            max_backoff_seconds: float = INGESTION_MAX_BACKOFF_SECONDS,
+            concurrency: int = INGESTION_CONCURRENCY,
+            queue_size: int = INGESTION_QUEUE_SIZE,
+            batch_size: int = INGESTION_BATCH_SIZE,
+            dedupe_window: int = INGESTION_DEDUPE_WINDOW,
+    ):
+        self.business_logic = business_logic
+        self.interval_seconds = interval_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.dedupe_window = dedupe_window
+        self.last_success_time: Optional[datetime] = None
+        self.consecutive_failures = 0
+        self.queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(maxsize=queue_size)
+        self.logger = logging.getLogger(__name__)
+        self.__task: Optional[asyncio.Task] = None
+        self.__seen_samples: OrderedDict[tuple, None] = OrderedDict()
+        self.__unsaved_samples: list[dict[str, Any]] = []
+
+    @property
+    def running(self) -> bool:
+        return self.__task is not None and not self.__task.done()
+
+    def start(self) -> None:
+        if not self.running:
+            self.logger.info("Starting ingestion scheduler...")
+            self.__task = asyncio.create_task(self.__run_fan_out() if self.concurrency > 1 else self.__run())
+
+    async def stop(self) -> None:
+        if self.__task is None:
+            return
+        self.logger.info("Stopping ingestion scheduler...")
+        self.__task.cancel()
+        try:
+            await self.__task
+        except asyncio.CancelledError:
+            pass
+        self.__task = None
+
+    async def run_once(self) -> bool:
+        succeeded = await self.business_logic.fetch_data_from_server()
+        self.__record_fetch(succeeded)
+        return succeeded
+
+    async def fetch_sample_once(self) -> bool:
+        try:
+            sample = await self.business_logic.fetch_sample()
+        except FailureFetchingData:
+            self.__record_fetch(False)
+            return False
+        self.__record_fetch(True)
+        if sample and self.__is_new_sample(sample):
+            # Waits for the writer when the queue is full, so fetchers can't outrun storage
+            await self.queue.put(sample)
+        return True
+
+    async def save_queued_samples(self) -> int:
+        batch = self.__take_queued_samples(batch=self.__unsaved_samples)
+        if not batch:
+            return 0
+        succeeded = await self.business_logic.save_samples(batch)
+        # Kept out of the queue until they're saved, so a failed batch is retried before newer samples.
+        # Only batches the storage didn't take fail, the ones it buffered are retried by the storage itself
+        self.__unsaved_samples = [] if succeeded else batch
+        if not succeeded:
+            self.consecutive_failures += 1
+            return 0
+        return len(batch)
+
+    def get_status(self) -> IngestionStatus:
+        lag_seconds = (datetime.now() - self.last_success_time).total_seconds() \
+            if self.last_success_time else None
+        return IngestionStatus(
+            running=self.running,
+            last_success_time=self.last_success_time.isoformat() if self.last_success_time else None,
+            lag_seconds=lag_seconds,
+            consecutive_failures=self.consecutive_failures,
+            queued_samples=self.queue.qsize(),
+        )
+
+    def next_delay(self) -> float:
+        if not self.consecutive_failures:
+            return self.interval_seconds
+        return min(self.interval_seconds * 2 ** self.consecutive_failures, self.max_backoff_seconds)
+
+    def __record_fetch(self, succeeded: bool) -> None:
+        if succeeded:
+            self.last_success_time = datetime.now()
+            # Still failing while there are samples that couldn't be saved
+            if not self.__unsaved_samples:
+                self.consecutive_failures = 0
+        else:
+            self.consecutive_failures += 1
+
+    def __is_new_sample(self, sample: dict[str, Any]) -> bool:
+        # Concurrent fetches can return the same sample, only the first one is kept
+        key = (sample["time"], tuple(sample["value"]))
+        if key in self.__seen_samples:
+            return False
+        self.__seen_samples[key] = None
+        if len(self.__seen_samples) > self.dedupe_window:
+            self.__seen_samples.popitem(last=False)
+        return True
+
+    def __take_queued_samples(self, batch: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        while len(batch) < self.batch_size and not self.queue.empty():
+            batch.append(self.queue.get_nowait())
+        return batch
+
+    async def __run(self) -> None:
+        while True:
+            await self.run_once()
+            await asyncio.sleep(self.next_delay())
+
+    async def __run_fan_out(self) -> None:
+        fetchers = [asyncio.create_task(self.__fetch_samples()) for _ in range(self.concurrency)]
+        try:
+            await self.__save_samples()
+        finally:
+            for fetcher in fetchers:
+                fetcher.cancel()
+            await asyncio.gather(*fetchers, return_exceptions=True)
+            while await self.save_queued_samples():
+                pass
+            unsaved_samples = len(self.__unsaved_samples) + self.queue.qsize()
+            if unsaved_samples:
+                self.logger.error(f"Stopped with {unsaved_samples} samples that couldn't be saved")
+
+    async def __fetch_samples(self) -> None:
+        while True:
+            await self.fetch_sample_once()
+            await asyncio.sleep(self.next_delay())
+
+    async def __save_samples(self) -> None:
+        while True:
+            if not self.__unsaved_samples:
+                # Waits for at least one sample, then writes whatever else is already queued with it
+                self.__unsaved_samples.append(await self.queue.get())
+            write = asyncio.ensure_future(self.save_queued_samples())
+            try:
+                saved_samples = await asyncio.shield(write)
+            except asyncio.CancelledError:
+                # Stopping waits for the batch being written, otherwise its samples would be lost
+                await write
+                raise
+            if not saved_samples:
+                await asyncio.sleep(self.next_delay())
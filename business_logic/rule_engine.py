@@ -0,0 +1,73 @@
+import time
+from typing import Any, Callable, Optional
+
+import yaml
+
+from business_logic.constants import DEFAULT_VALIDATION_RULES
+from business_logic.exceptions.invalid_validation_rule import InvalidValidationRule
+
+# A compiled check gets a data point and the reference time of its batch, and returns whether the rule is broken
+Check = Callable[[dict[str, Any], float], bool]
+
+RULE_COMPILERS: dict[str, Callable[[dict[str, Any]], Check]] = {}
+
+
+def rule_compiler(rule_type: str):
+    def register(compiler: Callable[[dict[str, Any]], Check]) -> Callable[[dict[str, Any]], Check]:
+        RULE_COMPILERS[rule_type] = compiler
+        return compiler
+    return register
+
+
+@rule_compiler("max_age")
+def compile_max_age_rule(rule: dict[str, Any]) -> Check:
+    max_age_seconds = float(rule["max_age_seconds"])
+    return lambda data, now: data["time"] < now - max_age_seconds
+
+
+@rule_compiler("tags")
+def compile_tags_rule(rule: dict[str, Any]) -> Check:
+    # A single string would be split into a set of its characters
+    if not isinstance(rule["tags"], list):
+        raise ValueError("tags must be a list")
+    tags = frozenset(rule["tags"])
+    return lambda data, now: not tags.isdisjoint(data["tags"])
+
+
+@rule_compiler("value_range")
+def compile_value_range_rule(rule: dict[str, Any]) -> Check:
+    minimum = float(rule.get("min", float("-inf")))
+    maximum = float(rule.get("max", float("inf")))
+    return lambda data, now: data.get("decoded_value") is None or not minimum <= data["decoded_value"] <= maximum
+
+
+class RuleEngine:
+    def __init__(self, rules: list[dict[str, Any]] = DEFAULT_VALIDATION_RULES):
+        # Without rules every data point would be accepted, which is never what a rules file means
+        if not isinstance(rules, list) or not rules:
+            raise InvalidValidationRule(f"Invalid validation rules, expected a non-empty list: {rules}")
+        self.rules = rules
+        self.__checks = [self.__compile(rule) for rule in rules]
+
+    @staticmethod
+    def from_file(path: Optional[str] = None) -> "RuleEngine":
+        if not path:
+            return RuleEngine()
+        with open(path) as file:
+            config = yaml.safe_load(file)
+        return RuleEngine(rules=config.get("rules") if isinstance(config, dict) else None)
+
+    def validate(self, data: list[dict[str, Any]], now: float = None) -> list[list[str]]:
+        # Every data point of the batch is checked against the same reference time
+        now = time.time() if now is None else now
+        checks = self.__checks
+        return [[reason for reason, check in checks if check(d, now)] for d in data]
+
+    @staticmethod
+    def __compile(rule: dict[str, Any]) -> tuple[str, Check]:
+        if not isinstance(rule, dict) or "reason" not in rule or rule.get("type") not in RULE_COMPILERS:
+            raise InvalidValidationRule(f"Invalid validation rule: {rule}")
+        try:
+            return rule["reason"], RULE_COMPILERS[rule["type"]](rule)
+        except (KeyError, TypeError, ValueError) as e:
+            raise InvalidValidationRule(f"Invalid validation rule: {rule} ({e})")
@@ -0,0 +1,36 @@
+from abc import ABC, abstractmethod
+from typing import Any, Optional
+
+
+class AbstractQueryCache(ABC):
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        ...
+
+    @abstractmethod
+    async def get_version(self) -> Optional[int]:
+        # Bumped on every invalidation, so results computed before it are not cached afterwards
+        ...
+
+    @abstractmethod
+    async def set(
+            self,
+            key: str,
+            value: bytes,
+            start: Optional[float],
+            end: Optional[float],
+            version: Optional[int],
+    ) -> None:
+        ...
+
+    @abstractmethod
+    async def invalidate(self, timestamps: list[float]) -> None:
+        ...
+
+    @abstractmethod
+    async def get_stats(self) -> dict[str, Any]:
+        ...
+
+    @staticmethod
+    def overlaps(start: Optional[float], end: Optional[float], timestamps: list[float]) -> bool:
+        return (start is None or max(timestamps) >= start) and (end is None or min(timestamps) <= end)
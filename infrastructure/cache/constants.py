@@ -0,0 +1,27 @@
+import os
+
+QUERY_CACHE_BACKEND = f"{os.getenv('QUERY_CACHE_BACKEND', 'none')}"
+QUERY_CACHE_MAX_ENTRIES = int(os.getenv('QUERY_CACHE_MAX_ENTRIES', '128'))
+QUERY_CACHE_TTL_SECONDS = float(os.getenv('QUERY_CACHE_TTL_SECONDS', '300'))
+REDIS_URL = f"{os.getenv('REDIS_URL', 'redis://localhost:6379/0')}"
+REDIS_CACHE_PREFIX = f"{os.getenv('REDIS_CACHE_PREFIX', 'open-cosmos:query-cache')}"
+REDIS_CACHE_TTL_SECONDS = int(os.getenv('REDIS_CACHE_TTL_SECONDS', '300'))
+REDIS_CACHE_MAX_ENTRIES = int(os.getenv('REDIS_CACHE_MAX_ENTRIES', '1024'))
+# Stores the entry only if no invalidation happened since its version was read, drops expired windows
+# and, beyond the max entries, the entries that expire the soonest (the oldest ones, as they all share the TTL)
+REDIS_SET_IF_CURRENT_SCRIPT = """
+if (redis.call('GET', KEYS[1]) or '0') ~= ARGV[1] then
+    return 0
+end
+redis.call('SET', KEYS[2], ARGV[2], 'EX', ARGV[3])
+redis.call('ZADD', KEYS[3], ARGV[4], ARGV[5])
+redis.call('ZREMRANGEBYSCORE', KEYS[3], '-inf', ARGV[6])
+local overflow = redis.call('ZCARD', KEYS[3]) - tonumber(ARGV[7])
+if overflow > 0 then
+    for _, window in ipairs(redis.call('ZRANGE', KEYS[3], 0, overflow - 1)) do
+        redis.call('DEL', ARGV[8] .. cjson.decode(window)[1])
+    end
+    redis.call('ZREMRANGEBYRANK', KEYS[3], 0, overflow - 1)
+end
+return 1
+"""
@@ -0,0 +1,60 @@
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from infrastructure.cache.abstract_query_cache import AbstractQueryCache
+from infrastructure.cache.constants import QUERY_CACHE_MAX_ENTRIES, QUERY_CACHE_TTL_SECONDS
+
+
+class InMemoryQueryCache(AbstractQueryCache):
+    def __init__(self, max_entries: int = QUERY_CACHE_MAX_ENTRIES, ttl_seconds: float = QUERY_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        # Value, window and expiry of each entry, in least recently used order
+        self.__entries: OrderedDict[str, tuple[bytes, Optional[float], Optional[float], float]] = OrderedDict()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self.__entries.get(key)
+        if entry is not None and entry[3] <= time.monotonic():
+            del self.__entries[key]
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.__entries.move_to_end(key)
+        return entry[0]
+
+    async def get_version(self) -> Optional[int]:
+        return self.version
+
+    async def set(
+            self,
+            key: str,
+            value: bytes,
+            start: Optional[float],
+            end: Optional[float],
+            version: Optional[int],
+    ) -> None:
+        if version != self.version:
+            return
+        self.__entries[key] = (value, start, end, time.monotonic() + self.ttl_seconds)
+        self.__entries.move_to_end(key)
+        while len(self.__entries) > self.max_entries:
+            self.__entries.popitem(last=False)
+
+    async def invalidate(self, timestamps: list[float]) -> None:
+        if not timestamps:
+            return
+        self.version += 1
+        for key in [k for k, (_, start, end, _) in self.__entries.items() if self.overlaps(start, end, timestamps)]:
+            del self.__entries[key]
+
+    async def get_stats(self) -> dict[str, Any]:
+        now = time.monotonic()
+        for key in [k for k, entry in self.__entries.items() if entry[3] <= now]:
+            del self.__entries[key]
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self.__entries)}
@@ -0,0 +1,119 @@
+import json
+import logging
+import time
+from typing import Any, Optional
+
+from infrastructure.cache.abstract_query_cache import AbstractQueryCache
+from infrastructure.cache.constants import (
+    REDIS_URL,
+    REDIS_CACHE_PREFIX,
+    REDIS_CACHE_TTL_SECONDS,
+    REDIS_CACHE_MAX_ENTRIES,
+    REDIS_SET_IF_CURRENT_SCRIPT,
+)
+
+
+class RedisQueryCache(AbstractQueryCache):
+    def __init__(
+            self,
+            url: str = REDIS_URL,
+            prefix: str = REDIS_CACHE_PREFIX,
+            ttl_seconds: int = REDIS_CACHE_TTL_SECONDS,
+            max_entries: int = REDIS_CACHE_MAX_ENTRIES,
+            client: Any = None,
+    ):
+        if client is None:
+            # Imported here so redis is only needed when this cache is configured
+            from redis import asyncio as redis
+
+            client = redis.from_url(url)
+        self.client = client
+        self.prefix = prefix
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.logger = logging.getLogger(__name__)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        try:
+            value = await self.client.get(self.__entry_key(key))
+            await self.client.incr(f"{self.prefix}:{'hits' if value is not None else 'misses'}")
+            return value
+        except Exception as e:
+            self.logger.error(f"Error reading from query cache: {e}")
+            return None
+
+    async def get_version(self) -> Optional[int]:
+        # Kept in Redis, so an invalidation by any worker or instance rejects the results computed before it
+        try:
+            return int(await self.client.get(self.__version_key()) or 0)
+        except Exception as e:
+            self.logger.error(f"Error reading the query cache version: {e}")
+            return None
+
+    async def set(
+            self,
+            key: str,
+            value: bytes,
+            start: Optional[float],
+            end: Optional[float],
+            version: Optional[int],
+    ) -> None:
+        if version is None:
+            return
+        try:
+            # The windows sorted set is what invalidation scans to find the overlapping entries,
+            # each window is scored by its entry's expiry so expired ones are dropped with it
+            now = time.time()
+            await self.client.eval(
+                REDIS_SET_IF_CURRENT_SCRIPT,
+                3,
+                self.__version_key(),
+                self.__entry_key(key),
+                self.__windows_key(),
+                str(version),
+                value,
+                self.ttl_seconds,
+                now + self.ttl_seconds,
+                json.dumps([key, start, end]),
+                now,
+                self.max_entries,
+                self.__entry_key(""),
+            )
+        except Exception as e:
+            self.logger.error(f"Error writing to query cache: {e}")
+
+    async def invalidate(self, timestamps: list[float]) -> None:
+        if not timestamps:
+            return
+        try:
+            # Bumped first, so reads running while the entries are deleted aren't cached afterwards
+            await self.client.incr(self.__version_key())
+            windows = await self.client.zrangebyscore(self.__windows_key(), time.time(), "+inf")
+            overlapping_windows = [
+                window for window in windows if self.overlaps(*json.loads(window)[1:], timestamps=timestamps)
+            ]
+            if overlapping_windows:
+                async with self.client.pipeline(transaction=False) as pipeline:
+                    pipeline.delete(*[self.__entry_key(json.loads(window)[0]) for window in overlapping_windows])
+                    pipeline.zrem(self.__windows_key(), *overlapping_windows)
+                    await pipeline.execute()
+        except Exception as e:
+            self.logger.error(f"Error invalidating query cache: {e}")
+
+    async def get_stats(self) -> dict[str, Any]:
+        try:
+            hits, misses = await self.client.mget(f"{self.prefix}:hits", f"{self.prefix}:misses")
+            entries = await self.client.zcount(self.__windows_key(), time.time(), "+inf")
+        except Exception as e:
+            self.logger.error(f"Error reading the query cache stats: {e}")
+            return {"available": False}
+        return {"hits": int(hits or 0), "misses": int(misses or 0), "entries": entries}
+
+    def __entry_key(self, key: str) -> str:
+        return f"{self.prefix}:entry:{key}"
+
+    def __version_key(self) -> str:
+        return f"{self.prefix}:version"
+
+    def __windows_key(self) -> str:
+        return f"{self.prefix}:windows"
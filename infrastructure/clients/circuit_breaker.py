@@ -0,0 +1,40 @@
+import time
+
+from infrastructure.clients.constants import (
+    SERVICE_CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+    SERVICE_CIRCUIT_BREAKER_RESET_SECONDS,
+)
+
+
+class CircuitBreaker:
+    def __init__(
+            self,
+            failure_threshold: int = SERVICE_CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+            reset_seconds: float = SERVICE_CIRCUIT_BREAKER_RESET_SECONDS,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.consecutive_failures = 0
+        self.opened_at = None
+
+    @property
+    def open(self) -> bool:
+        return self.opened_at is not None
+
+    def allow_request(self) -> bool:
+        # Once open, a single trial request is let through every reset_seconds
+        if self.opened_at is None:
+            return True
+        if time.monotonic() - self.opened_at >= self.reset_seconds:
+            self.opened_at = time.monotonic()
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.consecutive_failures = 0
+        self.opened_at = None
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
@@ -0,0 +1,12 @@
+import os
+
+SERVICE_URL = f"{os.getenv('SERVICE_URL', 'http://localhost:28462')}"
+SERVICE_CONNECT_TIMEOUT_SECONDS = float(os.getenv('SERVICE_CONNECT_TIMEOUT_SECONDS', '2'))
+SERVICE_READ_TIMEOUT_SECONDS = float(os.getenv('SERVICE_READ_TIMEOUT_SECONDS', '5'))
+SERVICE_MAX_CONNECTIONS = int(os.getenv('SERVICE_MAX_CONNECTIONS', '10'))
+SERVICE_KEEPALIVE_EXPIRY_SECONDS = float(os.getenv('SERVICE_KEEPALIVE_EXPIRY_SECONDS', '30'))
+SERVICE_MAX_RETRIES = int(os.getenv('SERVICE_MAX_RETRIES', '3'))
+SERVICE_RETRY_BACKOFF_SECONDS = float(os.getenv('SERVICE_RETRY_BACKOFF_SECONDS', '0.1'))
+SERVICE_RETRY_MAX_BACKOFF_SECONDS = float(os.getenv('SERVICE_RETRY_MAX_BACKOFF_SECONDS', '2'))
+SERVICE_CIRCUIT_BREAKER_FAILURE_THRESHOLD = int(os.getenv('SERVICE_CIRCUIT_BREAKER_FAILURE_THRESHOLD', '5'))
+SERVICE_CIRCUIT_BREAKER_RESET_SECONDS = float(os.getenv('SERVICE_CIRCUIT_BREAKER_RESET_SECONDS', '30'))
@@ -1,17 +1,92 @@
-import requests
-import os
+import asyncio
+import logging
+import random
+import time
+from typing import Any, Optional
+
+import httpx
 from fastapi import HTTPException
 
+from infrastructure.clients.circuit_breaker import CircuitBreaker
+from infrastructure.metrics.metrics import DATA_SERVER_FETCH_SECONDS
+from infrastructure.clients.constants import (
+    SERVICE_URL,
+    SERVICE_CONNECT_TIMEOUT_SECONDS,
+    SERVICE_READ_TIMEOUT_SECONDS,
+    SERVICE_MAX_CONNECTIONS,
+    SERVICE_KEEPALIVE_EXPIRY_SECONDS,
+    SERVICE_MAX_RETRIES,
+    SERVICE_RETRY_BACKOFF_SECONDS,
+    SERVICE_RETRY_MAX_BACKOFF_SECONDS,
+)
+
 
 class ExternalDataService:
+    # Shared by every fetch so connections to the data server are kept alive between polls
+    client: Optional[httpx.AsyncClient] = None
+    circuit_breaker = CircuitBreaker()
+    logger = logging.getLogger(__name__)
+
+    @staticmethod
+    async def fetch_data_from_server() -> Optional[Any]:
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            data = await ExternalDataService.__fetch_data_with_retries()
+            outcome = "success" if data is not None else "not_found"
+            return data
+        finally:
+            DATA_SERVER_FETCH_SECONDS.observe(time.perf_counter() - start, outcome)
+
+    @staticmethod
+    async def __fetch_data_with_retries() -> Optional[Any]:
+        if not ExternalDataService.circuit_breaker.allow_request():
+            raise HTTPException(status_code=503, detail="Data server circuit breaker is open")
+
+        for attempt in range(SERVICE_MAX_RETRIES + 1):
+            if attempt:
+                await asyncio.sleep(ExternalDataService.get_retry_delay(attempt))
+            try:
+                response = await ExternalDataService.get_client().get(SERVICE_URL)
+            except httpx.TransportError as e:
+                ExternalDataService.logger.warning(f"Error fetching data from server (attempt {attempt + 1}): {e}")
+                continue
+            if response.status_code == 200:
+                ExternalDataService.circuit_breaker.record_success()
+                return response.json()
+            elif response.status_code == 404:
+                ExternalDataService.circuit_breaker.record_success()
+                return None
+            elif response.status_code < 500:
+                break
+            ExternalDataService.logger.warning(
+                f"Data server responded with {response.status_code} (attempt {attempt + 1})"
+            )
+
+        ExternalDataService.circuit_breaker.record_failure()
+        raise HTTPException(status_code=500, detail="Failed to fetch data from server")
+
     @staticmethod
-    def fetch_data_from_server():
-        url = os.getenv("SERVICE_URL", "http://localhost:28462")
-        response = requests.get(url)
-        if response.status_code == 200:
-            return response.json()
-        elif response.status_code == 404:
-            return None
-        else:
-            raise HTTPException(status_code=500, detail="Failed to fetch data from server")
+    def get_client() -> httpx.AsyncClient:
+        if ExternalDataService.client is None or ExternalDataService.client.is_closed:
+            ExternalDataService.client = httpx.AsyncClient(
+                timeout=httpx.Timeout(SERVICE_READ_TIMEOUT_SECONDS, connect=SERVICE_CONNECT_TIMEOUT_SECONDS),
+                limits=httpx.Limits(
+                    max_connections=SERVICE_MAX_CONNECTIONS,
+                    max_keepalive_connections=SERVICE_MAX_CONNECTIONS,
+                    keepalive_expiry=SERVICE_KEEPALIVE_EXPIRY_SECONDS,
+                ),
+            )
+        return ExternalDataService.client
 
+    @staticmethod
+    def get_retry_delay(attempt: int) -> float:
+        # Exponential backoff with full jitter
+        backoff = SERVICE_RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1)
+        return random.uniform(0, min(SERVICE_RETRY_MAX_BACKOFF_SECONDS, backoff))
+
+    @staticmethod
+    async def close() -> None:
+        if ExternalDataService.client is not None:
+            await ExternalDataService.client.aclose()
+            ExternalDataService.client = None
@@ -1,24 +1,107 @@
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
 from datetime import datetime
 
 from abc import ABC, abstractmethod
 
+from infrastructure.data.storage.aggregation import aggregate_in_buckets
+
 
 class AbstractDataStorage(ABC):
+    def __init__(self):
+        self.write_listeners: list[Callable[[list[float]], Awaitable[None]]] = []
+
+    def add_write_listener(self, listener: Callable[[list[float]], Awaitable[None]]) -> None:
+        self.write_listeners.append(listener)
+
+    async def notify_write_listeners(self, data: list[dict[str, Any]]) -> None:
+        timestamps = [d["time"] for d in data]
+        for listener in self.write_listeners:
+            await listener(timestamps)
 
     @abstractmethod
-    def save_data(self, data: dict[str, Any]) -> None:
+    async def save_data(self, data: dict[str, Any]) -> None:
         ...
 
     @abstractmethod
-    def get_data(self, start_time: datetime = None, end_time: datetime = None) -> list[Optional[dict[str, Any]]]:
+    async def save_many_data(self, data: list[dict[str, Any]]) -> None:
         ...
 
     @abstractmethod
-    def save_reasons_for_invalid_data(self, discard_reasons: dict[str, Any]) -> None:
+    async def get_data(self, start_time: datetime = None, end_time: datetime = None, fields: list[str] = None) \
+            -> list[Optional[dict[str, Any]]]:
         ...
 
     @abstractmethod
-    def get_reasons_for_invalid_data(self, start_time: datetime = None, end_time: datetime = None) \
-            -> list[Optional[dict[str, Any]]]:
+    async def get_data_page(
+            self,
+            limit: int,
+            start_time: datetime = None,
+            end_time: datetime = None,
+            after: tuple[float, str] = None,
+            fields: list[str] = None,
+    ) -> tuple[list[dict[str, Any]], Optional[tuple[float, str]]]:
         ...
+
+    @abstractmethod
+    def stream_data(self, start_time: datetime = None, end_time: datetime = None, fields: list[str] = None) \
+            -> AsyncIterator[dict[str, Any]]:
+        ...
+
+    async def aggregate_data(
+            self,
+            bucket_seconds: int,
+            start_time: datetime = None,
+            end_time: datetime = None,
+            aggregates: list[str] = None,
+    ) -> list[dict[str, Any]]:
+        data = self.stream_data(start_time=start_time, end_time=end_time, fields=["time", "decoded_value"])
+        # Buckets are half-open, so a data point at the end time belongs to the next bucket and is left out
+        end = end_time.timestamp() if end_time else None
+        return aggregate_in_buckets(
+            data=[
+                (d["time"], d["decoded_value"]) async for d in data
+                if "decoded_value" in d and (end is None or d["time"] < end)
+            ],
+            bucket_seconds=bucket_seconds,
+        )
+
+    @abstractmethod
+    async def save_reasons_for_invalid_data(self, discard_reasons: dict[str, Any]) -> None:
+        ...
+
+    @abstractmethod
+    async def save_many_reasons_for_invalid_data(self, discard_reasons: list[dict[str, Any]]) -> None:
+        ...
+
+    @abstractmethod
+    async def get_reasons_for_invalid_data(
+            self,
+            start_time: datetime = None,
+            end_time: datetime = None,
+            reason: str = None,
+            tag: str = None,
+    ) -> list[Optional[dict[str, Any]]]:
+        ...
+
+    async def update_rollups(self, data: list[dict[str, Any]], discard_reasons: list[dict[str, Any]]) -> None:
+        pass
+
+    async def ensure_indexes(self) -> None:
+        pass
+
+    async def get_index_stats(self) -> list[dict[str, Any]]:
+        return []
+
+    async def archive_data(self, before: datetime) -> int:
+        return 0
+
+    @staticmethod
+    def get_natural_key(d: dict[str, Any]) -> Optional[str]:
+        # The same sample always has the same time and value bytes
+        return f"{d['time']}:{bytes(d['value']).hex()}" if "value" in d else None
+
+    async def flush(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        await self.flush()
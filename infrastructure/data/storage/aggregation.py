@@ -0,0 +1,28 @@
+from typing import Any, Iterable
+
+
+def aggregate_in_buckets(data: Iterable[tuple[float, float]], bucket_seconds: int) -> list[dict[str, Any]]:
+    buckets = {}
+    for time, value in sorted(data):
+        bucket = time - time % bucket_seconds
+        aggregate = buckets.get(bucket)
+        if aggregate is None:
+            buckets[bucket] = {"bucket": bucket, "count": 1, "sum": value, "min": value, "max": value, "last": value}
+        else:
+            aggregate["count"] += 1
+            aggregate["sum"] += value
+            aggregate["min"] = min(aggregate["min"], value)
+            aggregate["max"] = max(aggregate["max"], value)
+            aggregate["last"] = value
+
+    return [
+        {
+            "bucket": a["bucket"],
+            "count": a["count"],
+            "min": a["min"],
+            "max": a["max"],
+            "mean": a["sum"] / a["count"],
+            "last": a["last"],
+        }
+        for a in buckets.values()
+    ]
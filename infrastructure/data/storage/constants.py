@@ -0,0 +1,5 @@
+import os
+
+HOT_DATA_CAPACITY = int(os.getenv('HOT_DATA_CAPACITY', '100000'))
+ARCHIVE_DIRECTORY = f"{os.getenv('ARCHIVE_DIRECTORY', 'archive')}"
+DATA_STORAGE_BACKEND = f"{os.getenv('DATA_STORAGE_BACKEND', 'mongodb')}"
@@ -0,0 +1,105 @@
+import math
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Any, Optional
+
+from infrastructure.data.storage.constants import HOT_DATA_CAPACITY
+
+MICROSECONDS_PER_SECOND = 1_000_000
+
+
+class HotDataRingBuffer:
+    def __init__(self, capacity: int = HOT_DATA_CAPACITY):
+        self.capacity = capacity
+        self.times = array('q', bytes(8 * capacity))
+        self.values = array('f', bytes(4 * capacity))
+        self.tag_ids = array('I', bytes(4 * capacity))
+        self.start = 0
+        self.size = 0
+        # Every data point newer than this is in the buffer, older ones may have been
+        # ingested before the service started, evicted or skipped for arriving out of order
+        self.complete_after = self.__to_microseconds(time.time())
+        self.__tags: list[Optional[list[str]]] = []
+        self.__tag_ids: dict[Optional[tuple[str, ...]], int] = {}
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, index: int) -> int:
+        # Lets bisect search the timestamps in time order
+        return self.times[(self.start + index) % self.capacity]
+
+    def append(self, data: list[dict[str, Any]]) -> None:
+        for d in data:
+            t = self.__to_microseconds(d["time"])
+            if self.size and t < self[self.size - 1]:
+                self.complete_after = max(self.complete_after, t)
+                continue
+            value = d.get("decoded_value")
+            value = math.nan if value is None else value
+            tag_id = self.__get_tag_id(d.get("tags"))
+            if self.size and t == self[self.size - 1] and self.__is_last(value, tag_id):
+                continue
+            if self.size == self.capacity:
+                self.complete_after = max(self.complete_after, self.times[self.start])
+                self.start = (self.start + 1) % self.capacity
+                self.size -= 1
+            i = (self.start + self.size) % self.capacity
+            self.times[i] = t
+            self.values[i] = value
+            self.tag_ids[i] = tag_id
+            self.size += 1
+
+    def covers(self, start_time: Optional[float]) -> bool:
+        return start_time is not None and self.__to_microseconds(start_time) > self.complete_after
+
+    def get_data(
+            self,
+            start_time: float,
+            end_time: Optional[float] = None,
+            fields: list[str] = None,
+    ) -> list[dict[str, Any]]:
+        first = bisect_left(self, self.__to_microseconds(start_time))
+        last = bisect_right(self, self.__to_microseconds(end_time)) if end_time is not None else self.size
+        fields = fields or ["iso_time", "decoded_value", "tags"]
+        with_iso_time, with_value, with_tags = ("iso_time" in fields, "decoded_value" in fields, "tags" in fields)
+        times, values, tag_ids, tags = self.times, self.values, self.tag_ids, self.__tags
+        iso_seconds = {}
+        data = []
+        for index in range(first, last):
+            i = (self.start + index) % self.capacity
+            d = {}
+            if with_iso_time:
+                seconds, microsecond = divmod(times[i], MICROSECONDS_PER_SECOND)
+                # Data points are usually less than a second apart, so the local time is formatted once per second
+                iso_second = iso_seconds.get(seconds)
+                if iso_second is None:
+                    iso_second = iso_seconds[seconds] = datetime.fromtimestamp(seconds).isoformat()
+                d["iso_time"] = f"{iso_second}.{microsecond:06d}" if microsecond else iso_second
+            if with_value:
+                value = values[i]
+                d["decoded_value"] = None if value != value else value
+            if with_tags:
+                d["tags"] = tags[tag_ids[i]]
+            data.append(d)
+        return data
+
+    def __is_last(self, value: float, tag_id: int) -> bool:
+        i = (self.start + self.size - 1) % self.capacity
+        last_value = self.values[i]
+        same_value = last_value == array('f', [value])[0] or (math.isnan(last_value) and math.isnan(value))
+        return same_value and self.tag_ids[i] == tag_id
+
+    def __get_tag_id(self, tags: Optional[list[str]]) -> int:
+        key = tuple(tags) if tags is not None else None
+        tag_id = self.__tag_ids.get(key)
+        if tag_id is None:
+            tag_id = self.__tag_ids[key] = len(self.__tags)
+            self.__tags.append(list(tags) if tags is not None else None)
+        return tag_id
+
+    @staticmethod
+    def __to_microseconds(t: float) -> int:
+        return round(t * MICROSECONDS_PER_SECOND)
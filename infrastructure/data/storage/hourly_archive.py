@@ -0,0 +1,30 @@
+import gzip
+import json
+import os
+from datetime import datetime, timezone
+from typing import Any
+
+from infrastructure.data.storage.constants import ARCHIVE_DIRECTORY
+
+
+class HourlyArchive:
+    def __init__(self, directory: str = ARCHIVE_DIRECTORY):
+        self.directory = directory
+
+    def write(self, name: str, documents: list[dict[str, Any]]) -> list[str]:
+        # One gzip JSON lines file per UTC hour, e.g. archive/data_collection/2024/03/28/16.jsonl.gz.
+        # Later writes to the same hour are appended as a new gzip member, which gzip readers handle transparently
+        hours = {}
+        for d in documents:
+            hour = datetime.fromtimestamp(d["time"], tz=timezone.utc).strftime("%Y/%m/%d/%H")
+            hours.setdefault(hour, []).append(d)
+
+        paths = []
+        for hour, hour_documents in hours.items():
+            path = os.path.join(self.directory, name, f"{hour}.jsonl.gz")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with gzip.open(path, "at", encoding="utf-8") as file:
+                for d in hour_documents:
+                    file.write(json.dumps({k: v for k, v in d.items() if k != "_id"}, default=str) + "\n")
+            paths.append(path)
+        return paths
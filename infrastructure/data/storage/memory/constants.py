@@ -0,0 +1,5 @@
+import os
+
+MEMORY_SNAPSHOT_PATH = f"{os.getenv('MEMORY_SNAPSHOT_PATH', '')}"
+MEMORY_SNAPSHOT_INTERVAL_SECONDS = float(os.getenv('MEMORY_SNAPSHOT_INTERVAL_SECONDS', '60'))
+MEMORY_STREAM_BATCH_SIZE = int(os.getenv('MEMORY_STREAM_BATCH_SIZE', '1000'))
@@ -0,0 +1,166 @@
+import asyncio
+import os
+import pickle
+import time
+from datetime import datetime
+from typing import Any, AsyncIterator, Optional
+from business_logic.exceptions.invalid_cursor import InvalidCursor
+from infrastructure.data.storage.abstract_data_storage import AbstractDataStorage
+from infrastructure.data.storage.hourly_archive import HourlyArchive
+from infrastructure.data.storage.memory.sorted_collection import SortedCollection
+from infrastructure.data.storage.memory.constants import (
+    MEMORY_SNAPSHOT_PATH,
+    MEMORY_SNAPSHOT_INTERVAL_SECONDS,
+    MEMORY_STREAM_BATCH_SIZE,
+)
+from infrastructure.metrics.metrics import STORAGE_OPERATION_SECONDS
+
+
+class InMemoryDataStorage(AbstractDataStorage):
+    def __init__(
+            self,
+            snapshot_path: str = MEMORY_SNAPSHOT_PATH,
+            snapshot_interval_seconds: float = MEMORY_SNAPSHOT_INTERVAL_SECONDS,
+            archive: HourlyArchive = None,
+    ):
+        super().__init__()
+        self.snapshot_path = snapshot_path
+        self.snapshot_interval_seconds = snapshot_interval_seconds
+        self.archive = archive or HourlyArchive()
+        self.data_collection = SortedCollection()
+        self.discard_collection = SortedCollection()
+        self.last_snapshot = time.monotonic()
+        self.__snapshot_task: Optional[asyncio.Task] = None
+        if snapshot_path and os.path.exists(snapshot_path):
+            self.load_snapshot()
+
+    async def save_data(self, data: dict[str, Any]) -> None:
+        await self.save_many_data([data])
+
+    async def save_many_data(self, data: list[dict[str, Any]]) -> None:
+        await self.__insert(self.data_collection, data, "data")
+
+    async def get_data(self, start_time: datetime = None, end_time: datetime = None, fields: list[str] = None) \
+            -> list[Optional[dict[str, Any]]]:
+        with STORAGE_OPERATION_SECONDS.time("memory", "query", "data"):
+            start, end = self.data_collection.get_range(*self.__get_time_range(start_time, end_time))
+            return [self.__project(d, fields) for d in self.data_collection.documents[start:end]]
+
+    async def get_data_page(
+            self,
+            limit: int,
+            start_time: datetime = None,
+            end_time: datetime = None,
+            after: tuple[float, str] = None,
+            fields: list[str] = None,
+    ) -> tuple[list[dict[str, Any]], Optional[tuple[float, str]]]:
+        with STORAGE_OPERATION_SECONDS.time("memory", "query", "data"):
+            start, end = self.data_collection.get_range(*self.__get_time_range(start_time, end_time))
+            if after:
+                after_time, after_id = after
+                start = max(start, self.data_collection.get_position_after(after_time, self.__to_cursor_id(after_id)))
+            end = min(end, start + limit)
+            data = [self.__project(d, fields) for d in self.data_collection.documents[start:end]]
+        next_after = (self.data_collection.times[end - 1], str(self.data_collection.ids[end - 1])) \
+            if len(data) == limit else None
+        return data, next_after
+
+    async def stream_data(self, start_time: datetime = None, end_time: datetime = None, fields: list[str] = None) \
+            -> AsyncIterator[dict[str, Any]]:
+        start, end = self.data_collection.get_range(*self.__get_time_range(start_time, end_time))
+        # Sliced up front, so writes while streaming don't shift the documents being read
+        documents = self.data_collection.documents[start:end]
+        for i in range(0, len(documents), MEMORY_STREAM_BATCH_SIZE):
+            for d in documents[i:i + MEMORY_STREAM_BATCH_SIZE]:
+                yield self.__project(d, fields)
+            await asyncio.sleep(0)
+
+    async def save_reasons_for_invalid_data(self, discard_reasons: dict[str, Any]) -> None:
+        await self.save_many_reasons_for_invalid_data([discard_reasons])
+
+    async def save_many_reasons_for_invalid_data(self, discard_reasons: list[dict[str, Any]]) -> None:
+        await self.__insert(self.discard_collection, discard_reasons, "discard")
+
+    async def get_reasons_for_invalid_data(
+            self,
+            start_time: datetime = None,
+            end_time: datetime = None,
+            reason: str = None,
+            tag: str = None,
+    ) -> list[Optional[dict[str, Any]]]:
+        with STORAGE_OPERATION_SECONDS.time("memory", "query", "discard"):
+            start, end = self.discard_collection.get_range(*self.__get_time_range(start_time, end_time))
+            return [
+                self.__project(d)
+                for d in self.discard_collection.documents[start:end]
+                if (not reason or reason in d.get("reasons", [])) and (not tag or tag in (d.get("tags") or []))
+            ]
+
+    async def archive_data(self, before: datetime) -> int:
+        archived_documents = 0
+        for name, collection in (("data", self.data_collection), ("discard", self.discard_collection)):
+            documents = collection.remove_before(before.timestamp())
+            if documents:
+                await asyncio.to_thread(self.archive.write, name, documents)
+                await self.notify_write_listeners(documents)
+                archived_documents += len(documents)
+        return archived_documents
+
+    async def close(self) -> None:
+        if self.__snapshot_task:
+            await self.__snapshot_task
+        if self.snapshot_path:
+            await asyncio.to_thread(self.save_snapshot, self.__get_snapshot_state())
+
+    def save_snapshot(self, state: dict[str, list[dict[str, Any]]]) -> None:
+        # Written next to the snapshot and renamed over it, so a crash never leaves a partial snapshot behind
+        temporary_path = f"{self.snapshot_path}.tmp"
+        with open(temporary_path, "wb") as file:
+            pickle.dump(state, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary_path, self.snapshot_path)
+
+    def load_snapshot(self) -> None:
+        with open(self.snapshot_path, "rb") as file:
+            state = pickle.load(file)
+        self.data_collection.insert(state["data"])
+        self.discard_collection.insert(state["discard"])
+
+    async def __insert(self, collection: SortedCollection, documents: list[dict[str, Any]], name: str) -> None:
+        with STORAGE_OPERATION_SECONDS.time("memory", "insert", name):
+            for d in documents:
+                d.setdefault("key", self.get_natural_key(d))
+            documents = collection.insert(documents)
+        await self.notify_write_listeners(documents)
+        self.__schedule_snapshot()
+
+    def __schedule_snapshot(self) -> None:
+        if not self.snapshot_path or (self.__snapshot_task and not self.__snapshot_task.done()):
+            return
+        if time.monotonic() - self.last_snapshot < self.snapshot_interval_seconds:
+            return
+        self.last_snapshot = time.monotonic()
+        self.__snapshot_task = asyncio.create_task(asyncio.to_thread(self.save_snapshot, self.__get_snapshot_state()))
+
+    def __get_snapshot_state(self) -> dict[str, list[dict[str, Any]]]:
+        # Shallow copies, so the snapshot thread pickles a consistent view while new documents are inserted
+        return {"data": list(self.data_collection.documents), "discard": list(self.discard_collection.documents)}
+
+    @staticmethod
+    def __to_cursor_id(after_id: str) -> int:
+        try:
+            return int(after_id)
+        except ValueError as e:
+            raise InvalidCursor(f"Invalid cursor id: {after_id}") from e
+
+    @staticmethod
+    def __project(d: dict[str, Any], fields: list[str] = None) -> dict[str, Any]:
+        # Copies, so callers can't modify the stored documents
+        return {f: d[f] for f in fields if f in d} if fields else dict(d)
+
+    @staticmethod
+    def __get_time_range(start_time: datetime = None, end_time: datetime = None) \
+            -> tuple[Optional[float], Optional[float]]:
+        return (
+            start_time.timestamp() if start_time else None,
+            end_time.timestamp() if end_time else None,
+        )
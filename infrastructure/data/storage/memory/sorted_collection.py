@@ -0,0 +1,52 @@
+from bisect import bisect_left, bisect_right
+from typing import Any, Optional
+
+
+class SortedCollection:
+    def __init__(self):
+        # Parallel lists kept in (time, id) order, so a time range is two bisects away
+        self.times: list[float] = []
+        self.ids: list[int] = []
+        self.documents: list[dict[str, Any]] = []
+        self.keys: set[str] = set()
+        self.next_id = 0
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def insert(self, documents: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        inserted = []
+        for d in documents:
+            key = d.get("key")
+            if key is not None:
+                if key in self.keys:
+                    continue
+                self.keys.add(key)
+            # In order samples are appended, late ones go after the documents with the same time
+            i = bisect_right(self.times, d["time"])
+            self.times.insert(i, d["time"])
+            self.ids.insert(i, self.next_id)
+            self.documents.insert(i, d)
+            self.next_id += 1
+            inserted.append(d)
+        return inserted
+
+    def get_range(self, start_time: Optional[float] = None, end_time: Optional[float] = None) -> tuple[int, int]:
+        start = 0 if start_time is None else bisect_left(self.times, start_time)
+        end = len(self.times) if end_time is None else bisect_right(self.times, end_time)
+        return start, end
+
+    def get_position_after(self, after_time: float, after_id: int) -> int:
+        i = bisect_left(self.times, after_time)
+        while i < len(self.times) and self.times[i] == after_time and self.ids[i] <= after_id:
+            i += 1
+        return i
+
+    def remove_before(self, time: float) -> list[dict[str, Any]]:
+        end = bisect_left(self.times, time)
+        removed = self.documents[:end]
+        del self.times[:end]
+        del self.ids[:end]
+        del self.documents[:end]
+        self.keys.difference_update(d["key"] for d in removed if d.get("key") is not None)
+        return removed
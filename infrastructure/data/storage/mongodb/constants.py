@@ -4,3 +4,16 @@ MONGODB_CONNECTION_STRING = f"{os.getenv('MONGODB_CONNECTION_STRING', 'mongodb:/
 MONGODB_DATABASE_NAME = f"{os.getenv('MONGODB_DATABASE_NAME', 'open-cosmos')}"
 MONGODB_DATA_COLLECTION_NAME = f"{os.getenv('MONGODB_DATA_COLLECTION_NAME', 'data_collection')}"
 MONGODB_DISCARD_COLLECTION_NAME = f"{os.getenv('MONGODB_DISCARD_COLLECTION_NAME', 'data_invalidation_reasons_collection')}"
+MONGODB_MINUTE_ROLLUP_COLLECTION_NAME = f"{os.getenv('MONGODB_MINUTE_ROLLUP_COLLECTION_NAME', 'data_minute_rollups')}"
+MONGODB_HOUR_ROLLUP_COLLECTION_NAME = f"{os.getenv('MONGODB_HOUR_ROLLUP_COLLECTION_NAME', 'data_hour_rollups')}"
+MONGODB_WRITE_BUFFER_MAX_SIZE = int(os.getenv('MONGODB_WRITE_BUFFER_MAX_SIZE', '500'))
+MONGODB_WRITE_BUFFER_MAX_AGE_SECONDS = float(os.getenv('MONGODB_WRITE_BUFFER_MAX_AGE_SECONDS', '1'))
+MONGODB_WRITE_BUFFER_MAX_RETAINED_SIZE = int(os.getenv('MONGODB_WRITE_BUFFER_MAX_RETAINED_SIZE', '100000'))
+MONGODB_STREAM_BATCH_SIZE = int(os.getenv('MONGODB_STREAM_BATCH_SIZE', '1000'))
+ROLLUP_AGGREGATES = ("count", "min", "max", "mean", "last")
+DUPLICATE_KEY_ERROR_CODE = 11000
+INDEX_OPTIONS_CONFLICT_ERROR_CODE = 85
+MONGODB_DATA_RETENTION_SECONDS = int(os.getenv('MONGODB_DATA_RETENTION_SECONDS', '0'))
+# How often MongoDB's TTL monitor deletes the expired documents
+MONGODB_TTL_MONITOR_INTERVAL_SECONDS = float(os.getenv('MONGODB_TTL_MONITOR_INTERVAL_SECONDS', '60'))
+MONGODB_ARCHIVE_BATCH_SIZE = int(os.getenv('MONGODB_ARCHIVE_BATCH_SIZE', '1000'))
@@ -1,38 +1,465 @@
-import pymongo
+import asyncio
+import logging
+import time
+from bson import ObjectId
+from bson.errors import InvalidId
+from collections import Counter
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, UpdateOne
+from pymongo.errors import BulkWriteError, OperationFailure
 from datetime import datetime
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Optional
+from business_logic.exceptions.invalid_cursor import InvalidCursor
 from infrastructure.data.storage.abstract_data_storage import AbstractDataStorage
+from infrastructure.data.storage.hourly_archive import HourlyArchive
+from infrastructure.data.storage.write_behind_buffer import WriteBehindBuffer
+from infrastructure.metrics.metrics import STORAGE_OPERATION_SECONDS
 from infrastructure.data.storage.mongodb.constants import (
     MONGODB_CONNECTION_STRING,
     MONGODB_DATABASE_NAME,
     MONGODB_DATA_COLLECTION_NAME,
     MONGODB_DISCARD_COLLECTION_NAME,
+    MONGODB_MINUTE_ROLLUP_COLLECTION_NAME,
+    MONGODB_HOUR_ROLLUP_COLLECTION_NAME,
+    MONGODB_WRITE_BUFFER_MAX_SIZE,
+    MONGODB_WRITE_BUFFER_MAX_AGE_SECONDS,
+    MONGODB_WRITE_BUFFER_MAX_RETAINED_SIZE,
+    MONGODB_STREAM_BATCH_SIZE,
+    ROLLUP_AGGREGATES,
+    DUPLICATE_KEY_ERROR_CODE,
+    INDEX_OPTIONS_CONFLICT_ERROR_CODE,
+    MONGODB_DATA_RETENTION_SECONDS,
+    MONGODB_TTL_MONITOR_INTERVAL_SECONDS,
+    MONGODB_ARCHIVE_BATCH_SIZE,
 )
 
 
 class MongoDBDataStorage(AbstractDataStorage):
-    def __init__(self):
-        self.client = pymongo.MongoClient(MONGODB_CONNECTION_STRING)
+    def __init__(
+            self,
+            write_buffer_max_size: int = MONGODB_WRITE_BUFFER_MAX_SIZE,
+            write_buffer_max_age_seconds: float = MONGODB_WRITE_BUFFER_MAX_AGE_SECONDS,
+            write_buffer_max_retained_size: int = MONGODB_WRITE_BUFFER_MAX_RETAINED_SIZE,
+            retention_seconds: int = MONGODB_DATA_RETENTION_SECONDS,
+            archive: HourlyArchive = None,
+    ):
+        super().__init__()
+        self.retention_seconds = retention_seconds
+        self.archive = archive or HourlyArchive()
+        self.client = AsyncIOMotorClient(MONGODB_CONNECTION_STRING)
         self.db = self.client[MONGODB_DATABASE_NAME]
         self.data_collection = self.db[MONGODB_DATA_COLLECTION_NAME]
         self.discard_collection = self.db[MONGODB_DISCARD_COLLECTION_NAME]
+        self.minute_rollup_collection = self.db[MONGODB_MINUTE_ROLLUP_COLLECTION_NAME]
+        self.hour_rollup_collection = self.db[MONGODB_HOUR_ROLLUP_COLLECTION_NAME]
+        self.data_buffer = WriteBehindBuffer(
+            flush_callback=self.__insert_data,
+            max_size=write_buffer_max_size,
+            max_age_seconds=write_buffer_max_age_seconds,
+            max_retained_size=write_buffer_max_retained_size,
+        )
+        self.discard_buffer = WriteBehindBuffer(
+            flush_callback=self.__insert_reasons_for_invalid_data,
+            max_size=write_buffer_max_size,
+            max_age_seconds=write_buffer_max_age_seconds,
+            max_retained_size=write_buffer_max_retained_size,
+        )
+        self.rollup_buffer = WriteBehindBuffer(
+            flush_callback=self.__upsert_rollups,
+            max_size=write_buffer_max_size,
+            max_age_seconds=write_buffer_max_age_seconds,
+            max_retained_size=write_buffer_max_retained_size,
+        )
+        # Keys of the documents the unique index rejected, so they aren't counted in the rollups either
+        self.__rejected_data_keys = Counter()
+        self.__rejected_discard_keys = Counter()
+        # Keys of the documents whose insert failed without telling whether it landed, a retry finding them
+        # already stored is their own earlier write rather than a duplicate
+        self.__unconfirmed_data_keys: set[str] = set()
+        self.__unconfirmed_discard_keys: set[str] = set()
+        self.logger = logging.getLogger(__name__)
+        self.__expired_before = 0.0
+        self.__expiry_task: Optional[asyncio.Task] = None
 
-    def save_data(self, data: dict[str, Any]) -> None:
-        self.data_collection.insert_one(data)
+    async def save_data(self, data: dict[str, Any]) -> None:
+        await self.data_buffer.add([data])
 
-    def get_data(self, start_time: datetime = None, end_time: datetime = None) -> list[Optional[dict[str, Any]]]:
+    async def save_many_data(self, data: list[dict[str, Any]]) -> None:
+        await self.data_buffer.add(data)
+
+    async def get_data(self, start_time: datetime = None, end_time: datetime = None, fields: list[str] = None) \
+            -> list[Optional[dict[str, Any]]]:
         query = self.__get_time_filter_query(start_time=start_time, end_time=end_time)
-        data = self.data_collection.find(query)
-        return list(data)
+        data = self.data_collection.find(query, self.__get_projection(fields=fields))
+        with STORAGE_OPERATION_SECONDS.time("mongodb", "query", self.data_collection.name):
+            return await data.to_list(length=None)
 
-    def save_reasons_for_invalid_data(self, discard_reasons: dict[str, Any]) -> None:
-        self.discard_collection.insert_one(discard_reasons)
+    async def get_data_page(
+            self,
+            limit: int,
+            start_time: datetime = None,
+            end_time: datetime = None,
+            after: tuple[float, str] = None,
+            fields: list[str] = None,
+    ) -> tuple[list[dict[str, Any]], Optional[tuple[float, str]]]:
+        query = self.__get_time_filter_query(start_time=start_time, end_time=end_time)
+        if after:
+            after_time, after_id = after
+            try:
+                after_id = ObjectId(after_id)
+            except InvalidId as e:
+                raise InvalidCursor(f"Invalid cursor id: {after_id}") from e
+            query = {
+                "$and": [
+                    query,
+                    {"$or": [{"time": {"$gt": after_time}}, {"time": after_time, "_id": {"$gt": after_id}}]},
+                ]
+            }
+        # The page is keyed on time and _id, so both are projected even when the caller didn't ask for them
+        projection = {f: 1 for f in fields + ["time"]} if fields else None
+        data = self.data_collection.find(query, projection) \
+            .sort([("time", ASCENDING), ("_id", ASCENDING)]) \
+            .limit(limit)
+        with STORAGE_OPERATION_SECONDS.time("mongodb", "query", self.data_collection.name):
+            data = await data.to_list(length=None)
+        next_after = (data[-1]["time"], str(data[-1]["_id"])) if len(data) == limit else None
+        keys_to_remove = ["_id"] if not fields or "time" in fields else ["_id", "time"]
+        for d in data:
+            for key in keys_to_remove:
+                del d[key]
+        return data, next_after
 
-    def get_reasons_for_invalid_data(self, start_time: datetime = None, end_time: datetime = None) \
-            -> list[Optional[dict[str, Any]]]:
+    async def stream_data(self, start_time: datetime = None, end_time: datetime = None, fields: list[str] = None) \
+            -> AsyncIterator[dict[str, Any]]:
+        query = self.__get_time_filter_query(start_time=start_time, end_time=end_time)
+        projection = self.__get_projection(fields=fields)
+        data = self.data_collection.find(query, projection, batch_size=MONGODB_STREAM_BATCH_SIZE)
+        async for d in data.sort("time", ASCENDING):
+            yield d
+
+    async def aggregate_data(
+            self,
+            bucket_seconds: int,
+            start_time: datetime = None,
+            end_time: datetime = None,
+            aggregates: list[str] = None,
+    ) -> list[dict[str, Any]]:
+        rollup_collection = self.__get_rollup_collection(
+            bucket_seconds=bucket_seconds,
+            start_time=start_time,
+            end_time=end_time,
+            aggregates=aggregates,
+        )
+        if rollup_collection is not None:
+            return await self.__aggregate_rollups(
+                rollup_collection=rollup_collection,
+                bucket_seconds=bucket_seconds,
+                start_time=start_time,
+                end_time=end_time,
+            )
+
+        # Buckets are half-open, so the end is excluded here as it is from the rollups
+        query = self.__get_time_filter_query(start_time=start_time)
+        if end_time:
+            query.setdefault("time", {})["$lt"] = end_time.timestamp()
+        query["decoded_value"] = {"$exists": True}
+        pipeline = [
+            {"$match": query},
+            {"$sort": {"time": ASCENDING}},
+            {"$group": {
+                "_id": {"$subtract": ["$time", {"$mod": ["$time", bucket_seconds]}]},
+                "count": {"$sum": 1},
+                "min": {"$min": "$decoded_value"},
+                "max": {"$max": "$decoded_value"},
+                "mean": {"$avg": "$decoded_value"},
+                "last": {"$last": "$decoded_value"},
+            }},
+            {"$sort": {"_id": ASCENDING}},
+            {"$project": {"_id": 0, "bucket": "$_id", "count": 1, "min": 1, "max": 1, "mean": 1, "last": 1}},
+        ]
+        with STORAGE_OPERATION_SECONDS.time("mongodb", "aggregate", self.data_collection.name):
+            return await self.data_collection.aggregate(pipeline).to_list(length=None)
+
+    async def save_reasons_for_invalid_data(self, discard_reasons: dict[str, Any]) -> None:
+        await self.discard_buffer.add([discard_reasons])
+
+    async def save_many_reasons_for_invalid_data(self, discard_reasons: list[dict[str, Any]]) -> None:
+        await self.discard_buffer.add(discard_reasons)
+
+    async def get_reasons_for_invalid_data(
+            self,
+            start_time: datetime = None,
+            end_time: datetime = None,
+            reason: str = None,
+            tag: str = None,
+    ) -> list[Optional[dict[str, Any]]]:
         query = self.__get_time_filter_query(start_time=start_time, end_time=end_time)
-        discard_reasons = self.discard_collection.find(query)
-        return list(discard_reasons)
+        if reason:
+            query["reasons"] = reason
+        if tag:
+            query["tags"] = tag
+        discard_reasons = self.discard_collection.find(query, self.__get_projection())
+        with STORAGE_OPERATION_SECONDS.time("mongodb", "query", self.discard_collection.name):
+            return await discard_reasons.to_list(length=None)
+
+    async def update_rollups(self, data: list[dict[str, Any]], discard_reasons: list[dict[str, Any]]) -> None:
+        await self.rollup_buffer.add(
+            [{"time": d["time"], "decoded_value": d["decoded_value"], "key": self.get_natural_key(d)} for d in data]
+            + [{"time": d["time"], "reasons": d["reasons"], "key": self.get_natural_key(d)} for d in discard_reasons]
+        )
+
+    async def ensure_indexes(self) -> None:
+        # create_index is a no-op when an index with the same keys already exists
+        await self.data_collection.create_index([("time", ASCENDING), ("_id", ASCENDING)])
+        await self.discard_collection.create_index([("time", ASCENDING)])
+        for collection in (self.data_collection, self.discard_collection):
+            # Partial so documents stored before the key existed don't collide on a missing key
+            await collection.create_index(
+                [("key", ASCENDING)],
+                unique=True,
+                partialFilterExpression={"key": {"$exists": True}},
+            )
+        await self.discard_collection.create_index([("reasons", ASCENDING), ("time", ASCENDING)])
+        await self.discard_collection.create_index([("tags", ASCENDING), ("time", ASCENDING)])
+        for collection in (self.data_collection, self.discard_collection):
+            await self.__ensure_date_index(collection)
+        if self.retention_seconds and self.__expiry_task is None:
+            self.__expiry_task = asyncio.create_task(self.__notify_expired_data())
+
+    async def get_index_stats(self) -> list[dict[str, Any]]:
+        index_stats = []
+        for collection in (self.data_collection, self.discard_collection):
+            stats = await collection.aggregate([{"$indexStats": {}}]).to_list(length=None)
+            index_stats.extend({"collection": collection.name, **s} for s in stats)
+        return index_stats
+
+    async def archive_data(self, before: datetime) -> int:
+        # Buffered documents can be older than before as well
+        await self.flush()
+        archived_documents = 0
+        for collection in (self.data_collection, self.discard_collection):
+            documents = collection.find({"date": {"$lt": before}}, batch_size=MONGODB_ARCHIVE_BATCH_SIZE)
+            batch = []
+            async for d in documents.sort("date", ASCENDING):
+                batch.append(d)
+                if len(batch) == MONGODB_ARCHIVE_BATCH_SIZE:
+                    archived_documents += await self.__archive_batch(collection, batch)
+                    batch = []
+            if batch:
+                archived_documents += await self.__archive_batch(collection, batch)
+        return archived_documents
+
+    async def flush(self) -> None:
+        await self.data_buffer.flush()
+        await self.discard_buffer.flush()
+        await self.rollup_buffer.flush()
+
+    async def close(self) -> None:
+        if self.__expiry_task is not None:
+            self.__expiry_task.cancel()
+            self.__expiry_task = None
+        await self.flush()
+        self.client.close()
+
+    async def notify_expired_data(self) -> None:
+        # Only documents older than a whole TTL monitor pass are surely deleted by now
+        expired_before = time.time() - self.retention_seconds - MONGODB_TTL_MONITOR_INTERVAL_SECONDS
+        if expired_before <= self.__expired_before:
+            return
+        for listener in self.write_listeners:
+            await listener([self.__expired_before, expired_before])
+        self.__expired_before = expired_before
+
+    async def __ensure_date_index(self, collection: Any) -> None:
+        # With a retention the index on date is also a TTL index, so MongoDB deletes the expired documents itself
+        options = {"expireAfterSeconds": self.retention_seconds} if self.retention_seconds else {}
+        try:
+            await collection.create_index([("date", ASCENDING)], **options)
+        except OperationFailure as e:
+            if e.code != INDEX_OPTIONS_CONFLICT_ERROR_CODE or not self.retention_seconds:
+                raise
+            await self.db.command(
+                "collMod",
+                collection.name,
+                index={"keyPattern": {"date": 1}, "expireAfterSeconds": self.retention_seconds},
+            )
+
+    async def __notify_expired_data(self) -> None:
+        # The TTL index deletes the expired documents without going through the write listeners,
+        # so they are told about the expired time range after every pass of the TTL monitor instead
+        while True:
+            await asyncio.sleep(MONGODB_TTL_MONITOR_INTERVAL_SECONDS)
+            try:
+                await self.notify_expired_data()
+            except Exception as e:
+                self.logger.error(f"Error notifying expired data: {e}")
+
+    async def __archive_batch(self, collection: Any, batch: list[dict[str, Any]]) -> int:
+        # Documents are only deleted once they're written to the archive
+        await asyncio.to_thread(self.archive.write, collection.name, batch)
+        await collection.delete_many({"_id": {"$in": [d["_id"] for d in batch]}})
+        await self.notify_write_listeners(batch)
+        return len(batch)
+
+    async def __insert_data(self, data: list[dict[str, Any]]) -> None:
+        await self.__insert_ignoring_duplicates(
+            self.data_collection, data, self.__rejected_data_keys, self.__unconfirmed_data_keys
+        )
+
+    async def __insert_reasons_for_invalid_data(self, discard_reasons: list[dict[str, Any]]) -> None:
+        await self.__insert_ignoring_duplicates(
+            self.discard_collection, discard_reasons, self.__rejected_discard_keys, self.__unconfirmed_discard_keys
+        )
+
+    async def __insert_ignoring_duplicates(
+            self,
+            collection: Any,
+            documents: list[dict[str, Any]],
+            rejected_keys: Counter,
+            unconfirmed_keys: set[str],
+    ) -> None:
+        for d in documents:
+            d.setdefault("key", self.get_natural_key(d))
+        try:
+            with STORAGE_OPERATION_SECONDS.time("mongodb", "insert", collection.name):
+                await collection.insert_many(documents, ordered=False)
+        except BulkWriteError as e:
+            write_errors = e.details.get("writeErrors", [])
+            rejected_indexes = {
+                error["index"] for error in write_errors
+                if error["code"] == DUPLICATE_KEY_ERROR_CODE
+                and documents[error["index"]]["key"] not in unconfirmed_keys
+            }
+            failed_indexes = {
+                error["index"] for error in write_errors if error["code"] != DUPLICATE_KEY_ERROR_CODE
+            }
+            rejected_keys.update(documents[i]["key"] for i in rejected_indexes)
+            unconfirmed_keys.difference_update(d["key"] for d in documents)
+            # Unordered, so every other document was inserted
+            await self.notify_write_listeners(
+                [d for i, d in enumerate(documents) if i not in rejected_indexes and i not in failed_indexes]
+            )
+            if failed_indexes:
+                # Only the documents that failed are left for the write-behind buffer to retry,
+                # without the _id insert_many gave them
+                documents[:] = [documents[i] for i in sorted(failed_indexes)]
+                for d in documents:
+                    d.pop("_id", None)
+                raise
+            return
+        except Exception:
+            # Retried without the _id insert_many gave them, and as unconfirmed in case the write landed anyway
+            for d in documents:
+                d.pop("_id", None)
+            unconfirmed_keys.update(d["key"] for d in documents)
+            raise
+        unconfirmed_keys.difference_update(d["key"] for d in documents)
+        await self.notify_write_listeners(documents)
+
+    async def __upsert_rollups(self, entries: list[dict[str, Any]]) -> None:
+        # Inserting the buffered documents first tells which of these entries are duplicates
+        await self.data_buffer.flush()
+        await self.discard_buffer.flush()
+        entries = [e for e in entries if not self.__is_rejected(e)]
+        self.__rejected_data_keys.clear()
+        self.__rejected_discard_keys.clear()
+        if not entries:
+            return
+
+        for rollup_collection, granularity in self.__get_rollup_collections():
+            updates = {}
+            for e in entries:
+                bucket = int(e["time"] // granularity * granularity)
+                update = updates.setdefault(bucket, {"$inc": {}, "$min": {}, "$max": {}})
+                if "decoded_value" in e:
+                    value = e["decoded_value"]
+                    update["$inc"]["count"] = update["$inc"].get("count", 0) + 1
+                    update["$inc"]["sum"] = update["$inc"].get("sum", 0) + value
+                    update["$min"]["min"] = min(update["$min"].get("min", value), value)
+                    update["$max"]["max"] = max(update["$max"].get("max", value), value)
+                    # Embedded documents compare field by field, so $max keeps the value of the latest time
+                    last = update["$max"].get("last")
+                    if last is None or (e["time"], value) > (last["time"], last["value"]):
+                        update["$max"]["last"] = {"time": e["time"], "value": value}
+                for reason in e.get("reasons", []):
+                    update["$inc"][f"discarded.{reason}"] = update["$inc"].get(f"discarded.{reason}", 0) + 1
+            operations = [
+                UpdateOne({"_id": bucket}, {op: fields for op, fields in update.items() if fields}, upsert=True)
+                for bucket, update in updates.items()
+            ]
+            with STORAGE_OPERATION_SECONDS.time("mongodb", "upsert", rollup_collection.name):
+                await rollup_collection.bulk_write(operations, ordered=False)
+
+    async def __aggregate_rollups(
+            self,
+            rollup_collection: Any,
+            bucket_seconds: int,
+            start_time: datetime = None,
+            end_time: datetime = None,
+    ) -> list[dict[str, Any]]:
+        # Rollup documents are keyed by the start of their minute/hour
+        query = {"count": {"$gt": 0}}
+        if start_time or end_time:
+            query["_id"] = {}
+        if start_time:
+            query["_id"]["$gte"] = start_time.timestamp()
+        if end_time:
+            query["_id"]["$lt"] = end_time.timestamp()
+        pipeline = [
+            {"$match": query},
+            {"$group": {
+                "_id": {"$subtract": ["$_id", {"$mod": ["$_id", bucket_seconds]}]},
+                "count": {"$sum": "$count"},
+                "sum": {"$sum": "$sum"},
+                "min": {"$min": "$min"},
+                "max": {"$max": "$max"},
+                "last": {"$max": "$last"},
+            }},
+            {"$sort": {"_id": ASCENDING}},
+            {"$project": {
+                "_id": 0,
+                "bucket": "$_id",
+                "count": 1,
+                "min": 1,
+                "max": 1,
+                "mean": {"$divide": ["$sum", "$count"]},
+                "last": "$last.value",
+            }},
+        ]
+        with STORAGE_OPERATION_SECONDS.time("mongodb", "aggregate", rollup_collection.name):
+            return await rollup_collection.aggregate(pipeline).to_list(length=None)
+
+    def __is_rejected(self, entry: dict[str, Any]) -> bool:
+        rejected_keys = self.__rejected_data_keys if "decoded_value" in entry else self.__rejected_discard_keys
+        if rejected_keys[entry["key"]] > 0:
+            rejected_keys[entry["key"]] -= 1
+            return True
+        return False
+
+    def __get_rollup_collections(self) -> list[tuple[Any, int]]:
+        return [(self.hour_rollup_collection, 3600), (self.minute_rollup_collection, 60)]
+
+    def __get_rollup_collection(
+            self,
+            bucket_seconds: int,
+            start_time: datetime = None,
+            end_time: datetime = None,
+            aggregates: list[str] = None,
+    ) -> Optional[Any]:
+        if not aggregates or not set(aggregates).issubset(ROLLUP_AGGREGATES):
+            return None
+        for rollup_collection, granularity in self.__get_rollup_collections():
+            if bucket_seconds % granularity == 0 and all(
+                    t is None or t.timestamp() % granularity == 0 for t in (start_time, end_time)
+            ):
+                return rollup_collection
+        return None
+
+    @staticmethod
+    def __get_projection(fields: list[str] = None) -> dict[str, int]:
+        projection = {f: 1 for f in fields} if fields else {}
+        projection["_id"] = 0
+        return projection
 
     @staticmethod
     def __get_time_filter_query(start_time: datetime = None, end_time: datetime = None) -> dict[str, Any]:
@@ -0,0 +1,8 @@
+import os
+
+SQLITE_DATABASE_PATH = f"{os.getenv('SQLITE_DATABASE_PATH', 'open-cosmos.sqlite3')}"
+SQLITE_MMAP_SIZE_BYTES = int(os.getenv('SQLITE_MMAP_SIZE_BYTES', str(256 * 1024 * 1024)))
+SQLITE_STREAM_BATCH_SIZE = int(os.getenv('SQLITE_STREAM_BATCH_SIZE', '1000'))
+SQLITE_DATA_TABLE_NAME = "data"
+SQLITE_DISCARD_TABLE_NAME = "data_invalidation_reasons"
+SQLITE_LABEL_SETS_TABLE_NAME = "label_sets"
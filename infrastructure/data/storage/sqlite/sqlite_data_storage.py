@@ -0,0 +1,309 @@
+import asyncio
+import json
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Callable, Optional
+from business_logic.exceptions.invalid_cursor import InvalidCursor
+from infrastructure.data.storage.abstract_data_storage import AbstractDataStorage
+from infrastructure.data.storage.hourly_archive import HourlyArchive
+from infrastructure.data.storage.sqlite.constants import (
+    SQLITE_DATABASE_PATH,
+    SQLITE_MMAP_SIZE_BYTES,
+    SQLITE_STREAM_BATCH_SIZE,
+    SQLITE_DATA_TABLE_NAME,
+    SQLITE_DISCARD_TABLE_NAME,
+    SQLITE_LABEL_SETS_TABLE_NAME,
+)
+from infrastructure.metrics.metrics import STORAGE_OPERATION_SECONDS
+
+# Stored fields and the column each one is kept in, tags and reasons are ids of the label sets table
+FIELD_COLUMNS = {
+    "time": "time",
+    "value": "value",
+    "decoded_value": "decoded_value",
+    "iso_time": "iso_time",
+    "tags": "tags_id",
+    "key": "key",
+}
+DISCARD_FIELD_COLUMNS = {**FIELD_COLUMNS, "reasons": "reasons_id"}
+
+
+class SQLiteDataStorage(AbstractDataStorage):
+    def __init__(self, database_path: str = SQLITE_DATABASE_PATH, archive: HourlyArchive = None):
+        super().__init__()
+        self.archive = archive or HourlyArchive()
+        # sqlite3 connections are blocking, so every statement runs on this single thread, one at a time
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite")
+        self.connection = sqlite3.connect(database_path, check_same_thread=False, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE_BYTES}")
+        self.__create_tables()
+        # Tags and reasons repeat a handful of combinations, so each one is stored once and kept in memory
+        self.__labels: dict[int, list[str]] = {}
+        self.__label_ids: dict[str, int] = {}
+        for label_id, labels in self.connection.execute(f"SELECT id, labels FROM {SQLITE_LABEL_SETS_TABLE_NAME}"):
+            self.__labels[label_id] = json.loads(labels)
+            self.__label_ids[labels] = label_id
+
+    async def save_data(self, data: dict[str, Any]) -> None:
+        await self.save_many_data([data])
+
+    async def save_many_data(self, data: list[dict[str, Any]]) -> None:
+        with STORAGE_OPERATION_SECONDS.time("sqlite", "insert", SQLITE_DATA_TABLE_NAME):
+            data = await self.__run(self.__insert, SQLITE_DATA_TABLE_NAME, FIELD_COLUMNS, data)
+        await self.notify_write_listeners(data)
+
+    async def get_data(self, start_time: datetime = None, end_time: datetime = None, fields: list[str] = None) \
+            -> list[Optional[dict[str, Any]]]:
+        time_filter = self.__get_time_filter(start_time, end_time)
+        with STORAGE_OPERATION_SECONDS.time("sqlite", "query", SQLITE_DATA_TABLE_NAME):
+            data, _ = await self.__run(self.__select, SQLITE_DATA_TABLE_NAME, FIELD_COLUMNS, fields, time_filter)
+        return data
+
+    async def get_data_page(
+            self,
+            limit: int,
+            start_time: datetime = None,
+            end_time: datetime = None,
+            after: tuple[float, str] = None,
+            fields: list[str] = None,
+    ) -> tuple[list[dict[str, Any]], Optional[tuple[float, str]]]:
+        where, parameters = self.__get_time_filter(start_time, end_time)
+        if after:
+            after_time, after_id = after
+            where.append("(time > ? OR (time = ? AND id > ?))")
+            parameters.extend([after_time, after_time, self.__to_cursor_id(after_id)])
+        with STORAGE_OPERATION_SECONDS.time("sqlite", "query", SQLITE_DATA_TABLE_NAME):
+            data, last = await self.__run(
+                self.__select, SQLITE_DATA_TABLE_NAME, FIELD_COLUMNS, fields, (where, parameters), limit
+            )
+        next_after = (last[0], str(last[1])) if len(data) == limit else None
+        return data, next_after
+
+    async def stream_data(self, start_time: datetime = None, end_time: datetime = None, fields: list[str] = None) \
+            -> AsyncIterator[dict[str, Any]]:
+        after = None
+        while True:
+            data, after = await self.get_data_page(
+                limit=SQLITE_STREAM_BATCH_SIZE,
+                start_time=start_time,
+                end_time=end_time,
+                after=after,
+                fields=fields,
+            )
+            for d in data:
+                yield d
+            if after is None:
+                return
+
+    async def aggregate_data(
+            self,
+            bucket_seconds: int,
+            start_time: datetime = None,
+            end_time: datetime = None,
+            aggregates: list[str] = None,
+    ) -> list[dict[str, Any]]:
+        # Buckets are half-open, so a data point at the end time belongs to the next bucket and is left out
+        where, parameters = self.__get_time_filter(start_time)
+        if end_time:
+            where.append("time < ?")
+            parameters.append(end_time.timestamp())
+        with STORAGE_OPERATION_SECONDS.time("sqlite", "aggregate", SQLITE_DATA_TABLE_NAME):
+            return await self.__run(self.__aggregate, bucket_seconds, (where, parameters))
+
+    async def save_reasons_for_invalid_data(self, discard_reasons: dict[str, Any]) -> None:
+        await self.save_many_reasons_for_invalid_data([discard_reasons])
+
+    async def save_many_reasons_for_invalid_data(self, discard_reasons: list[dict[str, Any]]) -> None:
+        with STORAGE_OPERATION_SECONDS.time("sqlite", "insert", SQLITE_DISCARD_TABLE_NAME):
+            discard_reasons = await self.__run(
+                self.__insert, SQLITE_DISCARD_TABLE_NAME, DISCARD_FIELD_COLUMNS, discard_reasons
+            )
+        await self.notify_write_listeners(discard_reasons)
+
+    async def get_reasons_for_invalid_data(
+            self,
+            start_time: datetime = None,
+            end_time: datetime = None,
+            reason: str = None,
+            tag: str = None,
+    ) -> list[Optional[dict[str, Any]]]:
+        with STORAGE_OPERATION_SECONDS.time("sqlite", "query", SQLITE_DISCARD_TABLE_NAME):
+            discard_reasons, _ = await self.__run(
+                self.__select_reasons_for_invalid_data, self.__get_time_filter(start_time, end_time), reason, tag
+            )
+        return discard_reasons
+
+    async def ensure_indexes(self) -> None:
+        await self.__run(self.__create_tables)
+
+    async def archive_data(self, before: datetime) -> int:
+        archived_documents = 0
+        for table, field_columns in (
+                (SQLITE_DATA_TABLE_NAME, FIELD_COLUMNS),
+                (SQLITE_DISCARD_TABLE_NAME, DISCARD_FIELD_COLUMNS),
+        ):
+            documents = await self.__run(self.__archive, table, field_columns, before.timestamp())
+            if documents:
+                await self.notify_write_listeners(documents)
+                archived_documents += len(documents)
+        return archived_documents
+
+    async def close(self) -> None:
+        await self.__run(self.connection.close)
+        self.executor.shutdown()
+
+    async def __run(self, function: Callable, *args) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self.executor, function, *args)
+
+    def __create_tables(self) -> None:
+        for table, label_columns in (
+                (SQLITE_DATA_TABLE_NAME, ["tags_id INTEGER"]),
+                (SQLITE_DISCARD_TABLE_NAME, ["tags_id INTEGER", "reasons_id INTEGER"]),
+        ):
+            # The unique key drops duplicate samples, NULL keys never collide
+            self.connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                "id INTEGER PRIMARY KEY, time REAL NOT NULL, value BLOB, decoded_value REAL, iso_time TEXT, "
+                f"{', '.join(label_columns)}, key TEXT UNIQUE)"
+            )
+            # The rowid is part of every index, so this also serves the (time, id) order of the pages
+            self.connection.execute(f"CREATE INDEX IF NOT EXISTS {table}_time ON {table} (time)")
+        self.connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {SQLITE_LABEL_SETS_TABLE_NAME} (id INTEGER PRIMARY KEY, labels TEXT UNIQUE)"
+        )
+
+    def __insert(self, table: str, field_columns: dict[str, str], documents: list[dict[str, Any]]) \
+            -> list[dict[str, Any]]:
+        inserted = []
+        columns = list(field_columns.values())
+        statement = f"INSERT OR IGNORE INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+        for d in documents:
+            d.setdefault("key", self.get_natural_key(d))
+        # Built before the transaction, so new label sets are committed even if the insert is rolled back
+        rows = [[self.__to_column(field, d.get(field)) for field in field_columns] for d in documents]
+        with self.connection:
+            self.connection.execute("BEGIN")
+            for d, row in zip(documents, rows):
+                if self.connection.execute(statement, row).rowcount:
+                    inserted.append(d)
+        return inserted
+
+    def __select(
+            self,
+            table: str,
+            field_columns: dict[str, str],
+            fields: Optional[list[str]],
+            time_filter: tuple[list[str], list[Any]],
+            limit: int = None,
+    ) -> tuple[list[dict[str, Any]], Optional[tuple[float, int]]]:
+        fields = [f for f in fields if f in field_columns] if fields else list(field_columns)
+        where, parameters = time_filter
+        statement = f"SELECT {', '.join(field_columns[f] for f in fields)}, time, id FROM {table}"
+        if where:
+            statement += f" WHERE {' AND '.join(where)}"
+        statement += " ORDER BY time, id"
+        if limit:
+            statement += " LIMIT ?"
+            parameters = [*parameters, limit]
+        rows = self.connection.execute(statement, parameters).fetchall()
+
+        # Rows are read as tuples, only the label set ids need translating
+        labels = self.__labels
+        label_indexes = [i for i, f in enumerate(fields) if f in ("tags", "reasons")]
+        data = []
+        for row in rows:
+            d = dict(zip(fields, row))
+            for i in label_indexes:
+                label_id = row[i]
+                d[fields[i]] = list(labels[label_id]) if label_id is not None else None
+            data.append(d)
+        return data, rows[-1][-2:] if rows else None
+
+    def __select_reasons_for_invalid_data(
+            self,
+            time_filter: tuple[list[str], list[Any]],
+            reason: str = None,
+            tag: str = None,
+    ) -> tuple[list[dict[str, Any]], Optional[tuple[float, int]]]:
+        where, parameters = time_filter
+        # Filtering on the label set ids containing the reason or tag, rather than on every row's labels
+        for column, label in (("reasons_id", reason), ("tags_id", tag)):
+            if label:
+                label_ids = [label_id for label_id, labels in self.__labels.items() if label in labels]
+                where.append(f"{column} IN ({', '.join('?' * len(label_ids))})")
+                parameters.extend(label_ids)
+        return self.__select(SQLITE_DISCARD_TABLE_NAME, DISCARD_FIELD_COLUMNS, None, (where, parameters))
+
+    def __aggregate(self, bucket_seconds: int, time_filter: tuple[list[str], list[Any]]) -> list[dict[str, Any]]:
+        where, parameters = time_filter
+        where = ["decoded_value IS NOT NULL", *where]
+        statement = (
+            "SELECT bucket, COUNT(*), MIN(decoded_value), MAX(decoded_value), AVG(decoded_value), MAX(last) FROM ("
+            "SELECT CAST(time / ? AS INTEGER) * ? AS bucket, decoded_value, LAST_VALUE(decoded_value) OVER ("
+            "PARTITION BY CAST(time / ? AS INTEGER) ORDER BY time, id "
+            "ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING) AS last "
+            f"FROM {SQLITE_DATA_TABLE_NAME} WHERE {' AND '.join(where)}"
+            ") GROUP BY bucket ORDER BY bucket"
+        )
+        rows = self.connection.execute(statement, [bucket_seconds, bucket_seconds, bucket_seconds, *parameters])
+        return [
+            {"bucket": bucket, "count": count, "min": min_value, "max": max_value, "mean": mean, "last": last}
+            for bucket, count, min_value, max_value, mean, last in rows
+        ]
+
+    def __archive(self, table: str, field_columns: dict[str, str], before: float) -> list[dict[str, Any]]:
+        documents, _ = self.__select(table, field_columns, None, (["time < ?"], [before]))
+        if not documents:
+            return documents
+        # Archived like the documents MongoDB stores, with the value as a byte array
+        for d in documents:
+            d["date"] = datetime.fromtimestamp(d["time"], tz=timezone.utc)
+            if d["value"] is not None:
+                d["value"] = list(d["value"])
+        # Rows are only deleted once they're written to the archive
+        self.archive.write(table, documents)
+        with self.connection:
+            self.connection.execute("BEGIN")
+            self.connection.execute(f"DELETE FROM {table} WHERE time < ?", [before])
+        return documents
+
+    def __to_column(self, field: str, value: Any) -> Any:
+        if value is None:
+            return None
+        if field == "value":
+            return bytes(value)
+        if field in ("tags", "reasons"):
+            return self.__get_label_id(value)
+        return value
+
+    def __get_label_id(self, labels: list[str]) -> int:
+        serialized_labels = json.dumps(labels)
+        label_id = self.__label_ids.get(serialized_labels)
+        if label_id is None:
+            label_id = self.connection.execute(
+                f"INSERT INTO {SQLITE_LABEL_SETS_TABLE_NAME} (labels) VALUES (?)", [serialized_labels]
+            ).lastrowid
+            self.__labels[label_id] = list(labels)
+            self.__label_ids[serialized_labels] = label_id
+        return label_id
+
+    @staticmethod
+    def __to_cursor_id(after_id: str) -> int:
+        try:
+            return int(after_id)
+        except ValueError as e:
+            raise InvalidCursor(f"Invalid cursor id: {after_id}") from e
+
+    @staticmethod
+    def __get_time_filter(start_time: datetime = None, end_time: datetime = None) -> tuple[list[str], list[Any]]:
+        where, parameters = [], []
+        if start_time:
+            where.append("time >= ?")
+            parameters.append(start_time.timestamp())
+        if end_time:
+            where.append("time <= ?")
+            parameters.append(end_time.timestamp())
+        return where, parameters
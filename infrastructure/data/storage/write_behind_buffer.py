@@ -0,0 +1,63 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Optional
+
+
+class WriteBehindBuffer:
+    def __init__(
+            self,
+            flush_callback: Callable[[list[dict[str, Any]]], Awaitable[None]],
+            max_size: int,
+            max_age_seconds: float,
+            max_retained_size: int,
+    ):
+        # The callback may take the documents it did write out of the list before raising, only the rest are retried
+        self.flush_callback = flush_callback
+        self.max_size = max_size
+        self.max_age_seconds = max_age_seconds
+        self.max_retained_size = max_retained_size
+        self.logger = logging.getLogger(__name__)
+        self.__documents: list[dict[str, Any]] = []
+        self.__age_flush_task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self.__documents)
+
+    async def add(self, documents: list[dict[str, Any]]) -> None:
+        self.__documents.extend(documents)
+        if len(self.__documents) >= self.max_size:
+            # The documents are accepted either way, the buffer retries them on the next flush,
+            # so callers must not send them again
+            try:
+                await self.flush()
+            except Exception as e:
+                self.logger.error(f"Error flushing write-behind buffer: {e}")
+        elif self.__age_flush_task is None or self.__age_flush_task.done():
+            self.__age_flush_task = asyncio.create_task(self.__flush_after_max_age())
+
+    async def flush(self) -> None:
+        if self.__age_flush_task is not None and self.__age_flush_task is not asyncio.current_task():
+            self.__age_flush_task.cancel()
+        self.__age_flush_task = None
+
+        documents, self.__documents = self.__documents, []
+        if not documents:
+            return
+        try:
+            await self.flush_callback(documents)
+        except Exception:
+            # Keep the documents so the next flush retries them, but only up to max_retained_size,
+            # so a long outage doesn't take all the memory
+            self.__documents[:0] = documents
+            overflow = len(self.__documents) - self.max_retained_size
+            if overflow > 0:
+                del self.__documents[:overflow]
+                self.logger.error(f"Write-behind buffer is full, dropped its {overflow} oldest documents")
+            raise
+
+    async def __flush_after_max_age(self) -> None:
+        await asyncio.sleep(self.max_age_seconds)
+        try:
+            await self.flush()
+        except Exception as e:
+            self.logger.error(f"Error flushing write-behind buffer: {e}")
@@ -0,0 +1,5 @@
+import os
+
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'false').lower() == 'true'
+LATENCY_BUCKETS_SECONDS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+METRICS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
@@ -0,0 +1,21 @@
+from infrastructure.metrics.histogram import get_labels, format_labels
+
+
+class Counter:
+    def __init__(self, name: str, description: str, label_names: tuple[str, ...] = (), enabled: bool = True):
+        self.name = name
+        self.description = description
+        self.label_names = label_names
+        self.enabled = enabled
+        self.series: dict[tuple[str, ...], float] = {}
+
+    def increment(self, *label_values: str, amount: float = 1) -> None:
+        if not self.enabled:
+            return
+        self.series[label_values] = self.series.get(label_values, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} counter"]
+        for label_values, count in self.series.items():
+            lines.append(f"{self.name}{format_labels(get_labels(self.label_names, label_values))} {count}")
+        return lines
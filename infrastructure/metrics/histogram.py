@@ -0,0 +1,80 @@
+import time
+from bisect import bisect_left
+from contextlib import nullcontext
+from typing import Any, ContextManager
+
+from infrastructure.metrics.constants import LATENCY_BUCKETS_SECONDS
+
+# Shared by every disabled timer, so timing a disabled histogram costs a method call
+DISABLED_TIMER = nullcontext()
+
+
+class Timer:
+    def __init__(self, histogram: "Histogram", label_values: tuple[str, ...]):
+        self.histogram = histogram
+        self.label_values = label_values
+        self.start = 0.0
+
+    def __enter__(self) -> "Timer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.histogram.observe(time.perf_counter() - self.start, *self.label_values)
+
+
+class Histogram:
+    def __init__(
+            self,
+            name: str,
+            description: str,
+            label_names: tuple[str, ...] = (),
+            buckets: tuple[float, ...] = LATENCY_BUCKETS_SECONDS,
+            enabled: bool = True,
+    ):
+        self.name = name
+        self.description = description
+        self.label_names = label_names
+        self.buckets = buckets
+        self.enabled = enabled
+        # Per label values: the count of each bucket (not cumulative, the last one is +Inf), the sum and the count.
+        # Only the event loop observes, so plain lists are updated without locking
+        self.series: dict[tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        if not self.enabled:
+            return
+        series = self.series.get(label_values)
+        if series is None:
+            series = self.series[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def time(self, *label_values: str) -> ContextManager:
+        return Timer(self, label_values) if self.enabled else DISABLED_TIMER
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+        for label_values, (bucket_counts, total, count) in self.series.items():
+            labels = get_labels(self.label_names, label_values)
+            cumulative_count = 0
+            for bound, bucket_count in zip([*self.buckets, "+Inf"], bucket_counts):
+                cumulative_count += bucket_count
+                bucket_labels = format_labels([*labels, f'le="{bound}"'])
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative_count}")
+            lines.append(f"{self.name}_sum{format_labels(labels)} {total}")
+            lines.append(f"{self.name}_count{format_labels(labels)} {count}")
+        return lines
+
+
+def get_labels(label_names: tuple[str, ...], label_values: tuple[str, ...]) -> list[str]:
+    return [f'{name}="{escape_label_value(value)}"' for name, value in zip(label_names, label_values)]
+
+
+def escape_label_value(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(labels: list[str]) -> str:
+    return f"{{{','.join(labels)}}}" if labels else ""
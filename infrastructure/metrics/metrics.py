@@ -0,0 +1,39 @@
+from infrastructure.metrics.metrics_registry import MetricsRegistry
+
+METRICS = MetricsRegistry()
+
+HTTP_REQUEST_SECONDS = METRICS.histogram(
+    "http_request_seconds",
+    "Time from receiving a request to sending the end of its response, streamed bodies included, per endpoint.",
+    label_names=("method", "endpoint", "status"),
+)
+DATA_SERVER_FETCH_SECONDS = METRICS.histogram(
+    "data_server_fetch_seconds",
+    "Time to fetch a sample from the data server, retries included.",
+    label_names=("outcome",),
+)
+STORAGE_OPERATION_SECONDS = METRICS.histogram(
+    "storage_operation_seconds",
+    "Time spent in data storage queries, inserts and aggregations, per backend.",
+    label_names=("backend", "operation", "collection"),
+)
+DECODE_SECONDS = METRICS.histogram(
+    "decode_seconds",
+    "Time to decode the values of a batch of data points.",
+    label_names=("stage",),
+)
+SERIALIZATION_SECONDS = METRICS.histogram(
+    "serialization_seconds",
+    "Time to serialize a response body to JSON.",
+    label_names=("kind",),
+)
+VALIDATED_POINTS_TOTAL = METRICS.counter(
+    "validated_points_total",
+    "Data points validated on ingestion, valid or invalid.",
+    label_names=("status",),
+)
+INVALID_POINT_REASONS_TOTAL = METRICS.counter(
+    "invalid_point_reasons_total",
+    "Reasons data points were found invalid on ingestion, a data point can have several.",
+    label_names=("reason",),
+)
@@ -0,0 +1,31 @@
+from typing import Union
+
+from infrastructure.metrics.constants import METRICS_ENABLED, LATENCY_BUCKETS_SECONDS
+from infrastructure.metrics.counter import Counter
+from infrastructure.metrics.histogram import Histogram
+
+
+class MetricsRegistry:
+    def __init__(self, enabled: bool = METRICS_ENABLED):
+        self.enabled = enabled
+        self.metrics: list[Union[Histogram, Counter]] = []
+
+    def histogram(
+            self,
+            name: str,
+            description: str,
+            label_names: tuple[str, ...] = (),
+            buckets: tuple[float, ...] = LATENCY_BUCKETS_SECONDS,
+    ) -> Histogram:
+        histogram = Histogram(name, description, label_names=label_names, buckets=buckets, enabled=self.enabled)
+        self.metrics.append(histogram)
+        return histogram
+
+    def counter(self, name: str, description: str, label_names: tuple[str, ...] = ()) -> Counter:
+        counter = Counter(name, description, label_names=label_names, enabled=self.enabled)
+        self.metrics.append(counter)
+        return counter
+
+    def render(self) -> str:
+        # Prometheus text exposition format
+        return "\n".join(line for metric in self.metrics for line in metric.render()) + "\n"
@@ -0,0 +1,47 @@
+import asyncio
+import logging
+from typing import Any
+from pymongo import UpdateOne
+
+from business_logic.business_logic import BusinessLogic
+from infrastructure.data.storage.mongodb.mongodb_data_storage import MongoDBDataStorage
+
+BATCH_SIZE = 1000
+DECODED_FIELDS = ("decoded_value", "iso_time", "date")
+
+logger = logging.getLogger(__name__)
+
+
+async def backfill_collection(collection: Any) -> int:
+    backfilled_documents = 0
+    operations = []
+    async for d in collection.find({"decoded_value": {"$exists": False}}):
+        document = BusinessLogic.build_document(d)
+        operations.append(UpdateOne({"_id": d["_id"]}, {"$set": {f: document[f] for f in DECODED_FIELDS}}))
+        if len(operations) == BATCH_SIZE:
+            await collection.bulk_write(operations, ordered=False)
+            backfilled_documents += len(operations)
+            operations = []
+    if operations:
+        await collection.bulk_write(operations, ordered=False)
+        backfilled_documents += len(operations)
+    return backfilled_documents
+
+
+async def backfill_decoded_values(data_storage: MongoDBDataStorage) -> None:
+    for collection in (data_storage.data_collection, data_storage.discard_collection):
+        backfilled_documents = await backfill_collection(collection)
+        logger.info(f"Backfilled {backfilled_documents} documents in {collection.name}")
+
+
+async def main() -> None:
+    data_storage = MongoDBDataStorage()
+    try:
+        await backfill_decoded_values(data_storage)
+    finally:
+        await data_storage.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
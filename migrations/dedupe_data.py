@@ -0,0 +1,75 @@
+import asyncio
+import logging
+from typing import Any
+from pymongo import UpdateOne
+
+from infrastructure.data.storage.mongodb.mongodb_data_storage import MongoDBDataStorage
+from migrations.rebuild_rollups import rebuild_rollups
+
+BATCH_SIZE = 1000
+
+logger = logging.getLogger(__name__)
+
+
+async def backfill_keys(collection: Any) -> int:
+    backfilled_documents = 0
+    operations = []
+    async for d in collection.find({"key": {"$exists": False}, "value": {"$exists": True}}, {"time": 1, "value": 1}):
+        operations.append(UpdateOne({"_id": d["_id"]}, {"$set": {"key": MongoDBDataStorage.get_natural_key(d)}}))
+        if len(operations) == BATCH_SIZE:
+            await collection.bulk_write(operations, ordered=False)
+            backfilled_documents += len(operations)
+            operations = []
+    if operations:
+        await collection.bulk_write(operations, ordered=False)
+        backfilled_documents += len(operations)
+    return backfilled_documents
+
+
+async def delete_duplicates(collection: Any) -> int:
+    # Keeps the first stored document of every key
+    duplicates = collection.aggregate(
+        [
+            {"$match": {"key": {"$exists": True}}},
+            {"$sort": {"_id": 1}},
+            {"$group": {"_id": "$key", "ids": {"$push": "$_id"}, "count": {"$sum": 1}}},
+            {"$match": {"count": {"$gt": 1}}},
+        ],
+        allowDiskUse=True,
+    )
+    deleted_documents = 0
+    ids = []
+    async for d in duplicates:
+        ids.extend(d["ids"][1:])
+        if len(ids) >= BATCH_SIZE:
+            deleted_documents += (await collection.delete_many({"_id": {"$in": ids}})).deleted_count
+            ids = []
+    if ids:
+        deleted_documents += (await collection.delete_many({"_id": {"$in": ids}})).deleted_count
+    return deleted_documents
+
+
+async def dedupe_data(data_storage: MongoDBDataStorage) -> None:
+    for collection in (data_storage.data_collection, data_storage.discard_collection):
+        backfilled_documents = await backfill_keys(collection)
+        deleted_documents = await delete_duplicates(collection)
+        logger.info(
+            f"Backfilled keys of {backfilled_documents} documents and deleted {deleted_documents} duplicates "
+            f"in {collection.name}"
+        )
+    await data_storage.ensure_indexes()
+    # The rollups counted the duplicates too
+    await rebuild_rollups(data_storage)
+
+
+async def main() -> None:
+    data_storage = MongoDBDataStorage()
+    try:
+        await dedupe_data(data_storage)
+    finally:
+        await data_storage.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
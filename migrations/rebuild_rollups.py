@@ -0,0 +1,52 @@
+import asyncio
+import logging
+
+from infrastructure.data.storage.mongodb.mongodb_data_storage import MongoDBDataStorage
+
+BATCH_SIZE = 1000
+
+logger = logging.getLogger(__name__)
+
+
+async def rebuild_rollups(data_storage: MongoDBDataStorage) -> None:
+    await data_storage.minute_rollup_collection.drop()
+    await data_storage.hour_rollup_collection.drop()
+
+    data = data_storage.data_collection.find(
+        {"decoded_value": {"$exists": True}},
+        {"_id": 0, "time": 1, "decoded_value": 1},
+        batch_size=BATCH_SIZE,
+    )
+    async for batch in iterate_in_batches(data):
+        await data_storage.update_rollups(data=batch, discard_reasons=[])
+
+    discard_reasons = data_storage.discard_collection.find({}, {"_id": 0, "time": 1, "reasons": 1}, batch_size=BATCH_SIZE)
+    async for batch in iterate_in_batches(discard_reasons):
+        await data_storage.update_rollups(data=[], discard_reasons=batch)
+
+    await data_storage.flush()
+    logger.info("Rollups rebuilt")
+
+
+async def iterate_in_batches(cursor):
+    batch = []
+    async for d in cursor:
+        batch.append(d)
+        if len(batch) == BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def main() -> None:
+    data_storage = MongoDBDataStorage()
+    try:
+        await rebuild_rollups(data_storage)
+    finally:
+        await data_storage.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
@@ -0,0 +1,43 @@
+import asyncio
+import logging
+from typing import Any
+
+from infrastructure.data.storage.mongodb.mongodb_data_storage import MongoDBDataStorage
+from migrations.dedupe_data import backfill_keys
+from migrations.rebuild_rollups import rebuild_rollups
+
+BATCH_SIZE = 1000
+
+logger = logging.getLogger(__name__)
+
+
+async def remove_discarded_data(data_collection: Any, discard_collection: Any) -> int:
+    # Data points that were also stored as invalid data are removed from the data collection
+    removed_documents = 0
+    keys = []
+    async for d in discard_collection.find({"key": {"$exists": True}}, {"_id": 0, "key": 1}):
+        keys.append(d["key"])
+        if len(keys) == BATCH_SIZE:
+            removed_documents += (await data_collection.delete_many({"key": {"$in": keys}})).deleted_count
+            keys = []
+    if keys:
+        removed_documents += (await data_collection.delete_many({"key": {"$in": keys}})).deleted_count
+    return removed_documents
+
+
+async def main() -> None:
+    data_storage = MongoDBDataStorage()
+    try:
+        for collection in (data_storage.data_collection, data_storage.discard_collection):
+            await backfill_keys(collection)
+        removed_documents = await remove_discarded_data(data_storage.data_collection, data_storage.discard_collection)
+        logger.info(f"Removed {removed_documents} discarded data points from {data_storage.data_collection.name}")
+        # The rollups counted those data points as valid too
+        await rebuild_rollups(data_storage)
+    finally:
+        await data_storage.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
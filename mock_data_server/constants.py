@@ -0,0 +1,17 @@
+import os
+
+MOCK_DATA_SERVER_HOST = f"{os.getenv('MOCK_DATA_SERVER_HOST', '127.0.0.1')}"
+MOCK_DATA_SERVER_PORT = int(os.getenv('MOCK_DATA_SERVER_PORT', '28462'))
+MOCK_SAMPLE_RATE_PER_SECOND = float(os.getenv('MOCK_SAMPLE_RATE_PER_SECOND', '0'))
+MOCK_STALE_FRACTION = float(os.getenv('MOCK_STALE_FRACTION', '0.1'))
+MOCK_SUSPECT_FRACTION = float(os.getenv('MOCK_SUSPECT_FRACTION', '0.1'))
+MOCK_SYSTEM_FRACTION = float(os.getenv('MOCK_SYSTEM_FRACTION', '0.1'))
+MOCK_STALE_AGE_SECONDS = float(os.getenv('MOCK_STALE_AGE_SECONDS', '7200'))
+MOCK_LATENCY_DISTRIBUTION = f"{os.getenv('MOCK_LATENCY_DISTRIBUTION', 'constant')}"
+MOCK_LATENCY_SECONDS = float(os.getenv('MOCK_LATENCY_SECONDS', '0'))
+MOCK_ERROR_FRACTION = float(os.getenv('MOCK_ERROR_FRACTION', '0'))
+MOCK_NOT_FOUND_FRACTION = float(os.getenv('MOCK_NOT_FOUND_FRACTION', '0'))
+MOCK_REPLAY_PATH = f"{os.getenv('MOCK_REPLAY_PATH', '')}"
+MOCK_SEED = int(os.getenv('MOCK_SEED')) if os.getenv('MOCK_SEED') else None
+LATENCY_DISTRIBUTIONS = ("constant", "uniform", "exponential")
+OTHER_TAGS = ["sensor", "telemetry", "payload"]
@@ -0,0 +1,124 @@
+import argparse
+import asyncio
+import random
+import time
+from typing import Union
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, Response
+
+from mock_data_server.sample_generator import SampleGenerator, ReplaySampleSource
+from mock_data_server.constants import (
+    MOCK_DATA_SERVER_HOST,
+    MOCK_DATA_SERVER_PORT,
+    MOCK_SAMPLE_RATE_PER_SECOND,
+    MOCK_STALE_FRACTION,
+    MOCK_SUSPECT_FRACTION,
+    MOCK_SYSTEM_FRACTION,
+    MOCK_STALE_AGE_SECONDS,
+    MOCK_LATENCY_DISTRIBUTION,
+    MOCK_LATENCY_SECONDS,
+    MOCK_ERROR_FRACTION,
+    MOCK_NOT_FOUND_FRACTION,
+    MOCK_REPLAY_PATH,
+    MOCK_SEED,
+    LATENCY_DISTRIBUTIONS,
+)
+
+
+class MockDataServer:
+    def __init__(
+            self,
+            sample_source: Union[SampleGenerator, ReplaySampleSource] = None,
+            sample_rate_per_second: float = MOCK_SAMPLE_RATE_PER_SECOND,
+            latency_distribution: str = MOCK_LATENCY_DISTRIBUTION,
+            latency_seconds: float = MOCK_LATENCY_SECONDS,
+            error_fraction: float = MOCK_ERROR_FRACTION,
+            not_found_fraction: float = MOCK_NOT_FOUND_FRACTION,
+            seed: int = MOCK_SEED,
+    ):
+        if latency_distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution: {latency_distribution}")
+        self.sample_source = sample_source or SampleGenerator(seed=seed)
+        self.sample_rate_per_second = sample_rate_per_second
+        self.latency_distribution = latency_distribution
+        self.latency_seconds = latency_seconds
+        self.error_fraction = error_fraction
+        self.not_found_fraction = not_found_fraction
+        self.random = random.Random(seed)
+        self.last_sample_time = float("-inf")
+        self.app = FastAPI()
+        self.app.get("/")(self.get_sample)
+
+    async def get_sample(self) -> Response:
+        latency = self.get_latency()
+        if latency:
+            await asyncio.sleep(latency)
+        if self.random.random() < self.error_fraction:
+            return JSONResponse(status_code=500, content={"detail": "Injected error"})
+        if self.random.random() < self.not_found_fraction:
+            return JSONResponse(status_code=404, content={"detail": "Injected not found"})
+
+        # Above the sample rate there's no new sample yet, which the data server answers with a 404
+        now = time.time()
+        if self.sample_rate_per_second and now - self.last_sample_time < 1 / self.sample_rate_per_second:
+            return JSONResponse(status_code=404, content={"detail": "No new sample"})
+        sample = self.sample_source.next_sample(now)
+        if sample is None:
+            return JSONResponse(status_code=404, content={"detail": "No more samples to replay"})
+        self.last_sample_time = now
+        return JSONResponse(content=sample)
+
+    def get_latency(self) -> float:
+        if self.latency_distribution == "uniform":
+            return self.random.uniform(0, 2 * self.latency_seconds)
+        elif self.latency_distribution == "exponential":
+            return self.random.expovariate(1 / self.latency_seconds) if self.latency_seconds else 0
+        return self.latency_seconds
+
+
+def main() -> None:
+    # Only needed to serve the app, which the tests drive in process
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Serve synthetic or replayed samples like the data server")
+    parser.add_argument("--host", default=MOCK_DATA_SERVER_HOST)
+    parser.add_argument("--port", type=int, default=MOCK_DATA_SERVER_PORT)
+    parser.add_argument("--sample-rate", type=float, default=MOCK_SAMPLE_RATE_PER_SECOND)
+    parser.add_argument("--stale-fraction", type=float, default=MOCK_STALE_FRACTION)
+    parser.add_argument("--suspect-fraction", type=float, default=MOCK_SUSPECT_FRACTION)
+    parser.add_argument("--system-fraction", type=float, default=MOCK_SYSTEM_FRACTION)
+    parser.add_argument("--stale-age", type=float, default=MOCK_STALE_AGE_SECONDS)
+    parser.add_argument("--latency-distribution", choices=LATENCY_DISTRIBUTIONS, default=MOCK_LATENCY_DISTRIBUTION)
+    parser.add_argument("--latency", type=float, default=MOCK_LATENCY_SECONDS)
+    parser.add_argument("--error-fraction", type=float, default=MOCK_ERROR_FRACTION)
+    parser.add_argument("--not-found-fraction", type=float, default=MOCK_NOT_FOUND_FRACTION)
+    parser.add_argument("--replay", default=MOCK_REPLAY_PATH)
+    parser.add_argument("--keep-time", action="store_true")
+    parser.add_argument("--seed", type=int, default=MOCK_SEED)
+    args = parser.parse_args()
+
+    if args.replay:
+        sample_source = ReplaySampleSource(path=args.replay, keep_time=args.keep_time)
+    else:
+        sample_source = SampleGenerator(
+            stale_fraction=args.stale_fraction,
+            suspect_fraction=args.suspect_fraction,
+            system_fraction=args.system_fraction,
+            stale_age_seconds=args.stale_age,
+            seed=args.seed,
+        )
+    server = MockDataServer(
+        sample_source=sample_source,
+        sample_rate_per_second=args.sample_rate,
+        latency_distribution=args.latency_distribution,
+        latency_seconds=args.latency,
+        error_fraction=args.error_fraction,
+        not_found_fraction=args.not_found_fraction,
+        seed=args.seed,
+    )
+    uvicorn.run(server.app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import gzip
+import json
+import random
+import struct
+from typing import Any, Optional
+
+from business_logic.constants import SYSTEM_TAG, SUSPECT_TAG
+from mock_data_server.constants import (
+    MOCK_STALE_FRACTION,
+    MOCK_SUSPECT_FRACTION,
+    MOCK_SYSTEM_FRACTION,
+    MOCK_STALE_AGE_SECONDS,
+    OTHER_TAGS,
+)
+
+
+class SampleGenerator:
+    def __init__(
+            self,
+            stale_fraction: float = MOCK_STALE_FRACTION,
+            suspect_fraction: float = MOCK_SUSPECT_FRACTION,
+            system_fraction: float = MOCK_SYSTEM_FRACTION,
+            stale_age_seconds: float = MOCK_STALE_AGE_SECONDS,
+            seed: int = None,
+    ):
+        self.stale_fraction = stale_fraction
+        self.suspect_fraction = suspect_fraction
+        self.system_fraction = system_fraction
+        self.stale_age_seconds = stale_age_seconds
+        self.random = random.Random(seed)
+
+    def next_sample(self, now: float) -> Optional[dict[str, Any]]:
+        # Same shape as the data server's samples: a unix time, a little-endian float32 as a byte array and tags
+        tags = [self.random.choice(OTHER_TAGS)] if self.random.random() < 0.5 else []
+        if self.random.random() < self.suspect_fraction:
+            tags.append(SUSPECT_TAG)
+        if self.random.random() < self.system_fraction:
+            tags.append(SYSTEM_TAG)
+        stale = self.random.random() < self.stale_fraction
+        return {
+            "time": int(now - self.stale_age_seconds if stale else now),
+            "value": list(struct.pack('<f', self.random.uniform(-100, 100))),
+            "tags": tags,
+        }
+
+
+class ReplaySampleSource:
+    def __init__(self, path: str, keep_time: bool = False):
+        # JSON lines of samples, e.g. recorded from the data server or written by the archival (.jsonl.gz)
+        open_file = gzip.open if path.endswith(".gz") else open
+        with open_file(path, "rt", encoding="utf-8") as file:
+            self.samples = [json.loads(line) for line in file if line.strip()]
+        self.keep_time = keep_time
+        self.position = 0
+        self.time_offset: Optional[float] = None
+
+    def next_sample(self, now: float) -> Optional[dict[str, Any]]:
+        if self.position == len(self.samples):
+            return None
+        sample = self.samples[self.position]
+        self.position += 1
+        # Shifted so the first sample is served as current and the rest keep their spacing
+        if self.time_offset is None:
+            self.time_offset = 0 if self.keep_time else now - sample["time"]
+        return {
+            "time": int(sample["time"] + self.time_offset),
+            "value": sample["value"],
+            "tags": sample.get("tags") or [],
+        }
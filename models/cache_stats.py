@@ -0,0 +1,9 @@
+from typing import Optional
+from pydantic import BaseModel
+
+
+class CacheStats(BaseModel):
+    available: bool = True
+    hits: Optional[int] = None
+    misses: Optional[int] = None
+    entries: Optional[int] = None
@@ -5,5 +5,3 @@ class Data(BaseModel):
     time: str
     value: float
     tags: list[str]
-
-
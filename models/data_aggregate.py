@@ -0,0 +1,11 @@
+from typing import Optional
+from pydantic import BaseModel
+
+
+class DataAggregate(BaseModel):
+    time: str
+    count: Optional[int] = None
+    min: Optional[float] = None
+    max: Optional[float] = None
+    mean: Optional[float] = None
+    last: Optional[float] = None
@@ -0,0 +1,9 @@
+from typing import Optional
+from pydantic import BaseModel
+
+from models.projected_data import ProjectedData
+
+
+class DataPage(BaseModel):
+    data: list[ProjectedData]
+    next_cursor: Optional[str]
@@ -0,0 +1,10 @@
+from typing import Optional
+from pydantic import BaseModel
+
+
+class IndexStats(BaseModel):
+    collection: str
+    name: str
+    key: dict[str, int]
+    accesses: int
+    since: Optional[str]
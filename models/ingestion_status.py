@@ -0,0 +1,10 @@
+from typing import Optional
+from pydantic import BaseModel
+
+
+class IngestionStatus(BaseModel):
+    running: bool
+    last_success_time: Optional[str]
+    lag_seconds: Optional[float]
+    consecutive_failures: int
+    queued_samples: int = 0
@@ -0,0 +1,9 @@
+from typing import Optional
+from pydantic import BaseModel
+
+
+class ProjectedData(BaseModel):
+    # Data with only the fields that were asked for
+    time: Optional[str] = None
+    value: Optional[float] = None
+    tags: Optional[list[str]] = None
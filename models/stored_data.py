@@ -0,0 +1,12 @@
+from typing import Annotated, Optional
+from typing_extensions import NotRequired, TypedDict
+from pydantic import ConfigDict, Field
+
+
+class StoredData(TypedDict):
+    # Serializes the documents returned by the data storage straight into the shape of Data
+    __pydantic_config__ = ConfigDict(extra="ignore")
+
+    iso_time: NotRequired[Annotated[Optional[str], Field(serialization_alias="time")]]
+    decoded_value: NotRequired[Annotated[Optional[float], Field(serialization_alias="value")]]
+    tags: NotRequired[Optional[list[str]]]
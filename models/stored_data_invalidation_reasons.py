@@ -0,0 +1,5 @@
+from models.stored_data import StoredData
+
+
+class StoredDataInvalidationReasons(StoredData):
+    reasons: list[str]
@@ -0,0 +1,39 @@
+from unittest.mock import patch, MagicMock
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.middlewares.request_latency_middleware import RequestLatencyMiddleware
+
+
+def create_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(RequestLatencyMiddleware)
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int) -> dict:
+        return {"item_id": item_id}
+
+    return app
+
+
+class TestRequestLatencyMiddleware:
+    @staticmethod
+    @patch("api.middlewares.request_latency_middleware.HTTP_REQUEST_SECONDS")
+    def test_observes_request_latency_per_route(http_request_seconds_mock: MagicMock):
+        # Arrange
+        client = TestClient(create_app())
+
+        # Act
+        client.get("/items/1")
+        client.get("/items/not-an-int")
+        client.get("/unknown")
+
+        # Assert
+        observed_labels = [c.args[1:] for c in http_request_seconds_mock.observe.call_args_list]
+        assert observed_labels == [
+            ("GET", "/items/{item_id}", "200"),
+            ("GET", "/items/{item_id}", "422"),
+            ("GET", "unmatched", "404"),
+        ]
+        assert all(c.args[0] >= 0 for c in http_request_seconds_mock.observe.call_args_list)
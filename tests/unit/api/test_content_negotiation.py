@@ -0,0 +1,31 @@
+from typing import Optional
+
+import pytest
+
+from api.constants import DATA_MEDIA_TYPES
+from api.content_negotiation import negotiate_media_type
+
+
+class TestContentNegotiation:
+    @staticmethod
+    @pytest.mark.parametrize("accept, media_type", [
+        (None, "application/json"),
+        ("*/*", "application/json"),
+        ("text/csv", "text/csv"),
+        ("text/csv;q=0, application/json", "application/json"),
+        ("text/csv; q=0.5, application/x-ndjson", "application/x-ndjson"),
+        ("application/json;q=0.2, text/*;q=0.8", "text/csv"),
+        ("text/*, text/csv;q=0", None),
+        ("*/*;q=0.1, application/octet-stream", "application/octet-stream"),
+        ("application/vnd.apache.arrow.stream, application/json", "application/json"),
+        ("text/html", None),
+        ("text/csv;q=invalid", None),
+    ])
+    def test_negotiate_media_type(accept: Optional[str], media_type: Optional[str]):
+        # Arrange
+
+        # Act
+        result = negotiate_media_type(accept, DATA_MEDIA_TYPES)
+
+        # Assert
+        assert result == media_type
@@ -0,0 +1,108 @@
+import asyncio
+import struct
+from array import array
+from typing import Any, AsyncIterator
+
+import pytest
+
+from api.encoders import encode_csv, encode_ndjson, encode_packed_frame, encode_packed_frames, encode_arrow_ipc
+from models.projected_data import ProjectedData
+
+
+async def to_async_iterator(data: list[Any]) -> AsyncIterator[Any]:
+    for d in data:
+        yield d
+
+
+async def collect(chunks: AsyncIterator[str]) -> str:
+    return "".join([chunk async for chunk in chunks])
+
+
+async def collect_bytes(chunks: AsyncIterator[bytes]) -> list[bytes]:
+    return [chunk async for chunk in chunks]
+
+
+class TestEncoders:
+    @staticmethod
+    def test_encode_ndjson():
+        # Arrange
+        data = [ProjectedData(time="2024-03-28T16:54:51", value=1.0), ProjectedData(time="2024-03-28T16:54:52", value=2.0, tags=[])]
+
+        # Act
+        ndjson = asyncio.run(collect(encode_ndjson(to_async_iterator(data))))
+
+        # Assert
+        assert ndjson == (
+            '{"time":"2024-03-28T16:54:51","value":1.0}\n'
+            '{"time":"2024-03-28T16:54:52","value":2.0,"tags":[]}\n'
+        )
+
+    @staticmethod
+    def test_encode_csv():
+        # Arrange
+        data = [
+            ProjectedData(time="2024-03-28T16:54:51", value=1.0, tags=["suspect", "system"]),
+            ProjectedData(time="2024-03-28T16:54:52", value=2.0, tags=[]),
+        ]
+
+        # Act
+        csv = asyncio.run(collect(encode_csv(to_async_iterator(data), fields=["time", "value", "tags"])))
+
+        # Assert
+        assert csv == (
+            "time,value,tags\r\n"
+            '2024-03-28T16:54:51,1.0,"suspect,system"\r\n'
+            "2024-03-28T16:54:52,2.0,\r\n"
+        )
+
+    @staticmethod
+    def test_encode_csv_with_fields():
+        # Arrange
+        data = [ProjectedData(value=1.0), ProjectedData(value=2.0)]
+
+        # Act
+        csv = asyncio.run(collect(encode_csv(to_async_iterator(data), fields=["value"])))
+
+        # Assert
+        assert csv == "value\r\n1.0\r\n2.0\r\n"
+
+    @staticmethod
+    def test_encode_packed_frame():
+        # Arrange
+        times = array('q', [1711644891, 1711644892])
+        values = array('f', [1.5, -2.0])
+
+        # Act
+        frame = encode_packed_frame(times, values)
+
+        # Assert
+        assert frame == struct.pack("<Q2q2f", 2, 1711644891, 1711644892, 1.5, -2.0)
+
+    @staticmethod
+    def test_encode_packed_frames():
+        # Arrange
+        columns = [(array('q', [1711644891]), array('f', [1.5])), (array('q', [1711644892]), array('f', [-2.0]))]
+
+        # Act
+        frames = asyncio.run(collect_bytes(encode_packed_frames(to_async_iterator(columns))))
+
+        # Assert
+        assert frames == [
+            struct.pack("<Qqf", 1, 1711644891, 1.5),
+            struct.pack("<Qqf", 1, 1711644892, -2.0),
+            struct.pack("<Q", 0),
+        ]
+
+    @staticmethod
+    def test_encode_arrow_ipc():
+        # Arrange
+        pyarrow = pytest.importorskip("pyarrow")
+        columns = [(array('q', [1711644891]), array('f', [1.5])), (array('q', [1711644892]), array('f', [-2.0]))]
+
+        # Act
+        stream = b"".join(asyncio.run(collect_bytes(encode_arrow_ipc(to_async_iterator(columns)))))
+
+        # Assert
+        table = pyarrow.ipc.open_stream(stream).read_all()
+        assert table.column("time").cast(pyarrow.int64()).to_pylist() == [1711644891, 1711644892]
+        assert table.column("value").to_pylist() == [1.5, -2.0]
@@ -0,0 +1,58 @@
+import pytest
+
+from benchmarks.measurement import percentile, summarize, find_regressions
+
+
+class TestMeasurement:
+    @staticmethod
+    @pytest.mark.parametrize("q, expected_percentile", [
+        (0, 1.0),
+        (50, 2.5),
+        (95, 3.85),
+        (100, 4.0),
+    ])
+    def test_percentile(q: float, expected_percentile: float):
+        # Arrange
+        values = [4.0, 1.0, 3.0, 2.0]
+
+        # Act
+        result = percentile(values, q)
+
+        # Assert
+        assert result == pytest.approx(expected_percentile)
+
+    @staticmethod
+    def test_summarize():
+        # Arrange
+        latencies = [0.001, 0.003]
+
+        # Act
+        summary = summarize(latencies=latencies, points=100, peak_rss_bytes=2 * 1024 * 1024)
+
+        # Assert
+        assert summary["operations"] == 2
+        assert summary["p50_ms"] == pytest.approx(2)
+        assert summary["points_per_second"] == pytest.approx(25000)
+        assert summary["peak_rss_mib"] == 2
+
+    @staticmethod
+    def test_find_regressions():
+        # Arrange
+        baselines = {
+            "get_data[10]": {"p95_ms": 10, "points_per_second": 1000},
+            "ingest[10]": {"p95_ms": 10, "points_per_second": 1000},
+        }
+        results = {
+            "get_data[10]": {"p95_ms": 11, "points_per_second": 900},
+            "ingest[10]": {"p95_ms": 13, "points_per_second": 700},
+            "decode_value[10]": {"p95_ms": 100, "points_per_second": 1},
+        }
+
+        # Act
+        regressions = find_regressions(results=results, baselines=baselines, tolerance=0.2)
+
+        # Assert
+        assert regressions == [
+            "ingest[10]: p95 13.000 ms, baseline 10.000 ms",
+            "ingest[10]: 700 points/s, baseline 1000 points/s",
+        ]
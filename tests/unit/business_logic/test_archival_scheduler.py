@@ -0,0 +1,42 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+from business_logic.archival_scheduler import ArchivalScheduler
+
+
+class TestArchivalScheduler:
+    @staticmethod
+    def test_start_and_stop():
+        # Arrange
+        archival_scheduler = ArchivalScheduler(business_logic=AsyncMock(), archive_after_seconds=86400)
+
+        async def start_and_stop():
+            archival_scheduler.start()
+            await asyncio.sleep(0.05)
+            running = archival_scheduler.running
+            await archival_scheduler.stop()
+            return running
+
+        # Act
+        was_running = asyncio.run(start_and_stop())
+
+        # Assert
+        assert was_running
+        assert not archival_scheduler.running
+        archival_scheduler.business_logic.archive_data.assert_called_once_with(archive_after_seconds=86400)
+
+    @staticmethod
+    def test_start_when_archival_is_disabled():
+        # Arrange
+        archival_scheduler = ArchivalScheduler(business_logic=AsyncMock(), archive_after_seconds=0)
+
+        async def start():
+            archival_scheduler.start()
+            return archival_scheduler.running
+
+        # Act
+        running = asyncio.run(start())
+
+        # Assert
+        assert not running
+        archival_scheduler.business_logic.archive_data.assert_not_called()
@@ -1,8 +1,13 @@
+import asyncio
+import base64
+import json
 import pytest
 import struct
-from unittest.mock import MagicMock, patch, call
+from array import array
+from unittest.mock import AsyncMock, MagicMock, patch, call
 from typing import Any
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from pymongo.errors import AutoReconnect
 from pytest_lazyfixture import lazy_fixture
 
 from business_logic.business_logic import BusinessLogic
@@ -15,14 +20,25 @@ from business_logic.constants import (
 )
 from business_logic.exceptions.failure_retrieving_invalid_data_reasons_exception \
     import FailureRetrievingInvalidDataReasonsException
+from business_logic.exceptions.failure_fetching_data import FailureFetchingData
 from business_logic.exceptions.failure_retrieving_data import FailureRetrievingData
-from models.data import Data
+from business_logic.exceptions.failure_retrieving_index_stats import FailureRetrievingIndexStats
+from business_logic.exceptions.invalid_bucket import InvalidBucket
+from business_logic.exceptions.invalid_cursor import InvalidCursor
+from infrastructure.cache.in_memory_query_cache import InMemoryQueryCache
+from infrastructure.data.storage.hot_data_ring_buffer import HotDataRingBuffer
+from infrastructure.data.storage.mongodb.mongodb_data_storage import MongoDBDataStorage
+from infrastructure.metrics.counter import Counter
+from models.projected_data import ProjectedData
+from models.data_aggregate import DataAggregate
+from models.data_page import DataPage
 from models.data_invalidation_reasons import DataInvalidationReasons
+from models.index_stats import IndexStats
 
 
 @pytest.fixture
 def business_logic() -> BusinessLogic:
-    return BusinessLogic(data_storage=MagicMock())
+    return BusinessLogic(data_storage=AsyncMock())
 
 
 @pytest.fixture
@@ -91,6 +107,23 @@ def invalidation_reasons_with_time_in_iso_format(
     ) for d in modified_data]
 
 
+def to_projected_data(data: bytes) -> list[ProjectedData]:
+    return [ProjectedData(**d) for d in json.loads(data)]
+
+
+def to_data_invalidation_reasons(data: bytes) -> list[DataInvalidationReasons]:
+    return [DataInvalidationReasons(**d) for d in json.loads(data)]
+
+
+def to_document(data_dict: dict[str, Any]) -> dict[str, Any]:
+    return {
+        **data_dict,
+        "decoded_value": struct.unpack('<f', bytes(data_dict["value"]))[0],
+        "iso_time": datetime.fromtimestamp(data_dict["time"]).isoformat(),
+        "date": datetime.fromtimestamp(data_dict["time"], tz=timezone.utc),
+    }
+
+
 def change_time_and_value_format(data_dict: dict[str, Any]) -> dict[str, Any]:
     byte_value = bytes(data_dict["value"])
     decoded_value = struct.unpack('<f', byte_value)[0]
@@ -102,9 +135,9 @@ def change_time_and_value_format(data_dict: dict[str, Any]) -> dict[str, Any]:
 
 
 @pytest.fixture
-def data_with_time_in_iso_format(server_data: list[dict[str, Any]]) -> list[Data]:
+def data_with_time_in_iso_format(server_data: list[dict[str, Any]]) -> list[ProjectedData]:
     modified_data = [change_time_and_value_format(d) for d in server_data]
-    return [Data(time=d['time'], value=d['value'], tags=d['tags']) for d in modified_data]
+    return [ProjectedData(time=d['time'], value=d['value'], tags=d['tags']) for d in modified_data]
 
 
 @pytest.fixture
@@ -112,9 +145,9 @@ def data_with_endtime_constraint(server_data: list[dict[str, Any]]) -> list[dict
     return server_data[:2]
 
 @pytest.fixture
-def data_with_endtime_constraint_with_time_in_iso_format(data_with_endtime_constraint: list[dict[str, Any]]) -> list[Data]:
+def data_with_endtime_constraint_with_time_in_iso_format(data_with_endtime_constraint: list[dict[str, Any]]) -> list[ProjectedData]:
     modified_data = [change_time_and_value_format(d) for d in data_with_endtime_constraint]
-    return [Data(time=d['time'], value=d['value'], tags=d['tags']) for d in modified_data]
+    return [ProjectedData(time=d['time'], value=d['value'], tags=d['tags']) for d in modified_data]
 
 
 class TestBusinessLogic:
@@ -131,7 +164,7 @@ class TestBusinessLogic:
         fetch_data_from_server_mock.side_effect = Exception("An error occurred")
 
         # Act
-        business_logic.fetch_data_from_server()
+        asyncio.run(business_logic.fetch_data_from_server())
 
         # Assert
         business_logic.logger.info.assert_called_once_with("Fetching data from server...")
@@ -154,11 +187,14 @@ class TestBusinessLogic:
         fetch_data_from_server_mock.return_value = server_data
 
         # Act
-        business_logic.fetch_data_from_server()
+        asyncio.run(business_logic.fetch_data_from_server())
 
         # Assert
-        business_logic.data_storage.save_data.assert_called_once_with(server_data)
+        business_logic.data_storage.save_data.assert_called_once_with(to_document(server_data))
         business_logic.data_storage.save_reasons_for_invalid_data.assert_not_called()
+        business_logic.data_storage.update_rollups.assert_called_once_with(
+            data=[to_document(server_data)], discard_reasons=[]
+        )
         business_logic.logger.info.assert_has_calls([call("Fetching data from server...")])
         business_logic.logger.error.assert_not_called()
 
@@ -174,15 +210,18 @@ class TestBusinessLogic:
         business_logic.logger = get_logger_mock
         data_time = (datetime.now() - timedelta(hours=2)).timestamp()
         server_data = {"time": data_time, "value": [184, 240, 52, 191], "tags": []}
-        invalidation_reasons = {"time": data_time, "value": [184, 240, 52, 191], "tags": [], "reasons": [REASON_DATA_IS_TOO_OLD]}
+        invalidation_reasons = {**to_document(server_data), "reasons": [REASON_DATA_IS_TOO_OLD]}
         fetch_data_from_server_mock.return_value = server_data
 
         # Act
-        business_logic.fetch_data_from_server()
+        asyncio.run(business_logic.fetch_data_from_server())
 
         # Assert
-        business_logic.data_storage.save_data.assert_called_once_with(server_data)
+        business_logic.data_storage.save_data.assert_not_called()
         business_logic.data_storage.save_reasons_for_invalid_data.assert_called_once_with(invalidation_reasons)
+        business_logic.data_storage.update_rollups.assert_called_once_with(
+            data=[], discard_reasons=[invalidation_reasons]
+        )
         business_logic.logger.info.assert_has_calls(
             [
                 call("Fetching data from server..."),
@@ -204,7 +243,7 @@ class TestBusinessLogic:
         fetch_data_from_server_mock.return_value = {}
 
         # Act
-        business_logic.fetch_data_from_server()
+        asyncio.run(business_logic.fetch_data_from_server())
 
         # Assert
         business_logic.data_storage.save_data.assert_not_called()
@@ -213,6 +252,111 @@ class TestBusinessLogic:
         business_logic.logger.warning.assert_has_calls([call("No data fetched from server.")])
         business_logic.logger.error.assert_not_called()
 
+    @staticmethod
+    @patch('infrastructure.clients.external_data_service.ExternalDataService.fetch_data_from_server')
+    def test_fetch_data_from_server_when_storage_flush_fails(fetch_data_from_server_mock: MagicMock):
+        # Arrange
+        data_storage = MongoDBDataStorage(write_buffer_max_size=1, write_buffer_max_age_seconds=60)
+        for name in ("data_collection", "discard_collection", "minute_rollup_collection", "hour_rollup_collection"):
+            setattr(data_storage, name, AsyncMock())
+        data_storage.data_collection.insert_many.side_effect = [AutoReconnect("connection lost"), None, None, None]
+        business_logic = BusinessLogic(data_storage=data_storage, hot_data=HotDataRingBuffer(capacity=10))
+        now = int(datetime.now().timestamp())
+        fetch_data_from_server_mock.side_effect = [
+            {"time": t, "value": [0, 0, 128, 63], "tags": []} for t in range(now, now + 3)
+        ]
+
+        async def fetch_and_flush():
+            succeeded = [await business_logic.fetch_data_from_server() for _ in range(3)]
+            await data_storage.flush()
+            return succeeded
+
+        # Act
+        succeeded = asyncio.run(fetch_and_flush())
+
+        # Assert
+        rollup_count = sum(
+            operation._doc["$inc"].get("count", 0)
+            for c in data_storage.minute_rollup_collection.bulk_write.call_args_list
+            for operation in c.args[0]
+        )
+        assert succeeded == [True, True, True]
+        assert rollup_count == 3
+        assert business_logic.hot_data.size == 3
+
+    @staticmethod
+    @patch('infrastructure.clients.external_data_service.ExternalDataService.fetch_data_from_server')
+    def test_fetch_sample(fetch_data_from_server_mock: MagicMock, business_logic: BusinessLogic):
+        # Arrange
+        server_data = {"time": 1711644891, "value": [68, 51, 127, 191], "tags": []}
+        fetch_data_from_server_mock.return_value = server_data
+
+        # Act
+        sample = asyncio.run(business_logic.fetch_sample())
+
+        # Assert
+        assert sample == to_document(server_data)
+        business_logic.data_storage.save_data.assert_not_called()
+
+    @staticmethod
+    @patch('infrastructure.clients.external_data_service.ExternalDataService.fetch_data_from_server')
+    @patch('business_logic.business_logic.logging.getLogger')
+    def test_fetch_sample_when_exception_occurs(
+            get_logger_mock: MagicMock,
+            fetch_data_from_server_mock: MagicMock,
+            business_logic: BusinessLogic
+    ):
+        # Arrange
+        business_logic.logger = get_logger_mock
+        fetch_data_from_server_mock.side_effect = Exception("An error occurred")
+
+        # Act
+        with pytest.raises(FailureFetchingData):
+            asyncio.run(business_logic.fetch_sample())
+
+        # Assert
+        business_logic.logger.error.assert_called_once_with("Error fetching data from server: An error occurred")
+
+    @staticmethod
+    def test_save_samples(business_logic: BusinessLogic):
+        # Arrange
+        old_time = (datetime.now() - timedelta(hours=2)).timestamp()
+        valid_data = to_document({"time": datetime.now().timestamp(), "value": [68, 51, 127, 191], "tags": []})
+        old_data = to_document({"time": old_time, "value": [184, 240, 52, 191], "tags": []})
+        invalidation_reasons = {**old_data, "reasons": [REASON_DATA_IS_TOO_OLD]}
+
+        # Act
+        saved = asyncio.run(business_logic.save_samples([valid_data, old_data]))
+
+        # Assert
+        assert saved
+        business_logic.data_storage.save_many_data.assert_called_once_with([valid_data])
+        business_logic.data_storage.save_many_reasons_for_invalid_data.assert_called_once_with([invalidation_reasons])
+        business_logic.data_storage.update_rollups.assert_called_once_with(
+            data=[valid_data], discard_reasons=[invalidation_reasons]
+        )
+
+    @staticmethod
+    def test_save_samples_counts_validated_data(business_logic: BusinessLogic):
+        # Arrange
+        validated_points_total = Counter("validated_points_total", "", label_names=("status",))
+        invalid_point_reasons_total = Counter("invalid_point_reasons_total", "", label_names=("reason",))
+        old_time = (datetime.now() - timedelta(hours=2)).timestamp()
+        valid_data = to_document({"time": datetime.now().timestamp(), "value": [68, 51, 127, 191], "tags": []})
+        old_data = to_document({"time": old_time, "value": [184, 240, 52, 191], "tags": [SUSPECT_TAG]})
+
+        # Act
+        with patch("business_logic.business_logic.VALIDATED_POINTS_TOTAL", validated_points_total), \
+                patch("business_logic.business_logic.INVALID_POINT_REASONS_TOTAL", invalid_point_reasons_total):
+            asyncio.run(business_logic.save_samples([valid_data, old_data]))
+
+        # Assert
+        assert validated_points_total.series == {("valid",): 1, ("invalid",): 1}
+        assert invalid_point_reasons_total.series == {
+            (REASON_DATA_IS_TOO_OLD,): 1,
+            (REASON_DATA_IS_INACCURATE,): 1,
+        }
+
     @staticmethod
     @patch('business_logic.business_logic.logging.getLogger')
     def test_get_data_when_exception_occurs(
@@ -225,7 +369,7 @@ class TestBusinessLogic:
 
         # Act
         with pytest.raises(FailureRetrievingData):
-            business_logic.get_data()
+            asyncio.run(business_logic.get_data_json())
 
         # Assert
         business_logic.data_storage.get_data.assert_called_once()
@@ -274,10 +418,10 @@ class TestBusinessLogic:
     ):
         # Arrange
         business_logic.logger = get_logger_mock
-        business_logic.data_storage.get_data = MagicMock(return_value=server_data_input)
+        business_logic.data_storage.get_data = AsyncMock(return_value=server_data_input)
 
         # Act
-        data = business_logic.get_data(start_time=start_time, end_time=end_time)
+        data = to_projected_data(asyncio.run(business_logic.get_data_json(start_time=start_time, end_time=end_time)))
 
         # Assert
         assert data == return_data
@@ -290,6 +434,210 @@ class TestBusinessLogic:
         )
         business_logic.logger.error.assert_not_called()
 
+    @staticmethod
+    def test_get_data_decodes_values_as_little_endian_floats(business_logic: BusinessLogic):
+        # Arrange
+        values = [0.5, -1.25, 1024.0, -7.75]
+        business_logic.data_storage.get_data.return_value = [
+            {"time": 1711644891, "value": list(struct.pack('<f', v)), "tags": []} for v in values
+        ]
+
+        # Act
+        data = to_projected_data(asyncio.run(business_logic.get_data_json()))
+
+        # Assert
+        assert [d.value for d in data] == values
+
+    @staticmethod
+    def test_get_data_uses_values_decoded_at_ingest_time(
+            business_logic: BusinessLogic,
+            server_data: list[dict[str, Any]],
+            data_with_time_in_iso_format: list[ProjectedData]
+    ):
+        # Arrange
+        business_logic.data_storage.get_data.return_value = [to_document(d) for d in server_data]
+
+        # Act
+        data = to_projected_data(asyncio.run(business_logic.get_data_json()))
+
+        # Assert
+        assert data == data_with_time_in_iso_format
+
+    @staticmethod
+    def test_get_data_with_fields(business_logic: BusinessLogic):
+        # Arrange
+        business_logic.data_storage.get_data.return_value = [{"iso_time": "2024-03-28T16:54:51", "decoded_value": 1.0}]
+
+        # Act
+        data = to_projected_data(asyncio.run(business_logic.get_data_json(fields=["time", "value"])))
+
+        # Assert
+        assert data == [ProjectedData(time="2024-03-28T16:54:51", value=1.0)]
+        business_logic.data_storage.get_data.assert_called_once_with(
+            start_time=None, end_time=None, fields=["iso_time", "time", "decoded_value", "value"]
+        )
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "fields, expected_data",
+        [
+            (["value"], [ProjectedData(value=1.0)]),
+            (["time"], [ProjectedData(time=datetime.fromtimestamp(1711644891).isoformat())]),
+        ],
+    )
+    def test_get_data_with_fields_decodes_legacy_documents(
+            business_logic: BusinessLogic,
+            fields: list[str],
+            expected_data: list[ProjectedData]
+    ):
+        # Arrange
+        legacy_document = {"time": 1711644891, "value": [0, 0, 128, 63]}
+        business_logic.data_storage.get_data.return_value = [
+            {f: legacy_document[f] for f in ("time", "value") if f in fields}
+        ]
+
+        # Act
+        data = to_projected_data(asyncio.run(business_logic.get_data_json(fields=fields)))
+
+        # Assert
+        assert data == expected_data
+
+    @staticmethod
+    def test_get_data_json(business_logic: BusinessLogic):
+        # Arrange
+        business_logic.data_storage.get_data.return_value = [
+            {"tags": [SUSPECT_TAG], "decoded_value": 1.0, "time": 1711644891, "iso_time": "2024-03-28T16:54:51"},
+            {"iso_time": "2024-03-28T16:54:52", "decoded_value": None},
+        ]
+
+        # Act
+        data = asyncio.run(business_logic.get_data_json())
+
+        # Assert
+        assert data == (
+            b'[{"time":"2024-03-28T16:54:51","value":1.0,"tags":["suspect"]},'
+            b'{"time":"2024-03-28T16:54:52"}]'
+        )
+
+    @staticmethod
+    def test_get_reasons_for_invalid_data_json(business_logic: BusinessLogic):
+        # Arrange
+        business_logic.data_storage.get_reasons_for_invalid_data.return_value = [
+            {
+                "reasons": [REASON_DATA_IS_TOO_OLD],
+                "tags": [],
+                "decoded_value": 1.0,
+                "time": 1711644891,
+                "iso_time": "2024-03-28T16:54:51",
+            },
+        ]
+
+        # Act
+        data = asyncio.run(business_logic.get_reasons_for_invalid_data_json())
+
+        # Assert
+        assert data == (
+            b'[{"time":"2024-03-28T16:54:51","value":1.0,"tags":[],"reasons":["Data is too old"]}]'
+        )
+
+    @staticmethod
+    def test_stream_data_columns(business_logic: BusinessLogic):
+        # Arrange
+        stored_data = [
+            {"time": 1711644891, "decoded_value": 1.5},
+            {"time": 1711644892, "decoded_value": -2.0},
+            {"time": 1711644893, "value": [0, 0, 128, 63]},
+        ]
+        stream_data_mock = MagicMock()
+        stream_data_mock.return_value.__aiter__.return_value = stored_data
+        business_logic.data_storage.stream_data = stream_data_mock
+
+        async def collect():
+            return [columns async for columns in business_logic.stream_data_columns(chunk_size=2)]
+
+        # Act
+        columns = asyncio.run(collect())
+
+        # Assert
+        assert columns == [
+            (array('q', [1711644891, 1711644892]), array('f', [1.5, -2.0])),
+            (array('q', [1711644893]), array('f', [1.0])),
+        ]
+        stream_data_mock.assert_called_once_with(
+            start_time=None, end_time=None, fields=["time", "decoded_value", "value"]
+        )
+
+    @staticmethod
+    def test_get_data_is_served_from_hot_data():
+        # Arrange
+        business_logic = BusinessLogic(data_storage=AsyncMock(), hot_data=HotDataRingBuffer(capacity=10))
+        business_logic.data_storage.get_data.return_value = []
+        now = datetime.now()
+        sample = to_document({"time": now.timestamp(), "value": [0, 0, 128, 63], "tags": []})
+        asyncio.run(business_logic.save_samples([sample]))
+
+        # Act
+        data = to_projected_data(asyncio.run(business_logic.get_data_json(start_time=now - timedelta(microseconds=1))))
+        older_data = to_projected_data(asyncio.run(business_logic.get_data_json(start_time=now - timedelta(hours=1))))
+
+        # Assert
+        assert data == [ProjectedData(time=now.isoformat(), value=1.0, tags=[])]
+        assert older_data == []
+        business_logic.data_storage.get_data.assert_called_once()
+
+    @staticmethod
+    def test_get_data_is_served_from_query_cache(
+            server_data: list[dict[str, Any]],
+            data_with_time_in_iso_format: list[ProjectedData]
+    ):
+        # Arrange
+        business_logic = BusinessLogic(data_storage=MagicMock(), query_cache=InMemoryQueryCache())
+        business_logic.data_storage.get_data = AsyncMock(return_value=[to_document(d) for d in server_data])
+
+        # Act
+        first_data = to_projected_data(asyncio.run(business_logic.get_data_json()))
+        second_data = to_projected_data(asyncio.run(business_logic.get_data_json()))
+
+        # Assert
+        assert first_data == data_with_time_in_iso_format
+        assert second_data == data_with_time_in_iso_format
+        business_logic.data_storage.get_data.assert_called_once()
+        business_logic.data_storage.add_write_listener.assert_called_once_with(business_logic.query_cache.invalidate)
+
+    @staticmethod
+    def test_get_data_is_queried_again_after_query_cache_is_invalidated(server_data: list[dict[str, Any]]):
+        # Arrange
+        business_logic = BusinessLogic(data_storage=MagicMock(), query_cache=InMemoryQueryCache())
+        business_logic.data_storage.get_data = AsyncMock(return_value=[to_document(d) for d in server_data])
+        asyncio.run(business_logic.get_data_json())
+
+        # Act
+        asyncio.run(business_logic.query_cache.invalidate([server_data[0]["time"]]))
+        asyncio.run(business_logic.get_data_json())
+
+        # Assert
+        assert business_logic.data_storage.get_data.call_count == 2
+
+    @staticmethod
+    @patch('business_logic.business_logic.logging.getLogger')
+    def test_get_data_when_value_is_malformed(
+            get_logger_mock: MagicMock,
+            business_logic: BusinessLogic
+    ):
+        # Arrange
+        business_logic.logger = get_logger_mock
+        business_logic.data_storage.get_data.return_value = [
+            {"time": 1711644891, "value": [68, 51, 127, 191], "tags": []},
+            {"time": 1711644891, "value": [68, 51, 127], "tags": []},
+        ]
+
+        # Act
+        with pytest.raises(FailureRetrievingData):
+            asyncio.run(business_logic.get_data_json())
+
+        # Assert
+        business_logic.logger.error.assert_called_once()
+
     @staticmethod
     @patch('business_logic.business_logic.logging.getLogger')
     def test_get_reasons_for_invalid_data_when_exception_occurs(
@@ -303,7 +651,7 @@ class TestBusinessLogic:
 
         # Act
         with pytest.raises(FailureRetrievingInvalidDataReasonsException):
-            business_logic.get_reasons_for_invalid_data()
+            asyncio.run(business_logic.get_reasons_for_invalid_data_json())
 
         # Assert
         business_logic.data_storage.get_reasons_for_invalid_data.assert_called_once()
@@ -352,10 +700,14 @@ class TestBusinessLogic:
     ):
         # Arrange
         business_logic.logger = get_logger_mock
-        business_logic.data_storage.get_reasons_for_invalid_data = MagicMock(return_value=invalidation_reasons_input)
+        business_logic.data_storage.get_reasons_for_invalid_data = AsyncMock(
+            return_value=invalidation_reasons_input
+        )
 
         # Act
-        data = business_logic.get_reasons_for_invalid_data(start_time=start_time, end_time=end_time)
+        data = to_data_invalidation_reasons(
+            asyncio.run(business_logic.get_reasons_for_invalid_data_json(start_time=start_time, end_time=end_time))
+        )
 
         # Assert
         assert data == return_data
@@ -367,3 +719,222 @@ class TestBusinessLogic:
             ]
         )
         business_logic.logger.error.assert_not_called()
+
+    @staticmethod
+    @patch('business_logic.business_logic.logging.getLogger')
+    def test_ensure_data_storage_indexes_when_exception_occurs(
+            get_logger_mock: MagicMock,
+            business_logic: BusinessLogic
+    ):
+        # Arrange
+        business_logic.logger = get_logger_mock
+        business_logic.data_storage.ensure_indexes.side_effect = Exception("An error occurred")
+
+        # Act
+        asyncio.run(business_logic.ensure_data_storage_indexes())
+
+        # Assert
+        business_logic.data_storage.ensure_indexes.assert_called_once()
+        business_logic.logger.error.assert_called_once_with(
+            "Error ensuring data storage indexes: An error occurred"
+        )
+
+    @staticmethod
+    def test_archive_data_archives_whole_hours(business_logic: BusinessLogic):
+        # Arrange
+        business_logic.data_storage.archive_data.return_value = 3
+
+        # Act
+        archived_documents = asyncio.run(business_logic.archive_data(archive_after_seconds=86400))
+
+        # Assert
+        before = business_logic.data_storage.archive_data.call_args.kwargs["before"]
+        assert archived_documents == 3
+        assert (before.minute, before.second, before.microsecond) == (0, 0, 0)
+        assert before <= datetime.now(tz=timezone.utc) - timedelta(seconds=86400)
+
+    @staticmethod
+    @patch('business_logic.business_logic.logging.getLogger')
+    def test_archive_data_when_exception_occurs(get_logger_mock: MagicMock, business_logic: BusinessLogic):
+        # Arrange
+        business_logic.logger = get_logger_mock
+        business_logic.data_storage.archive_data.side_effect = Exception("An error occurred")
+
+        # Act
+        archived_documents = asyncio.run(business_logic.archive_data(archive_after_seconds=86400))
+
+        # Assert
+        assert archived_documents == 0
+        business_logic.logger.error.assert_called_once_with("Error archiving data: An error occurred")
+
+    @staticmethod
+    @patch('business_logic.business_logic.logging.getLogger')
+    def test_get_index_stats_on_success(
+            get_logger_mock: MagicMock,
+            business_logic: BusinessLogic
+    ):
+        # Arrange
+        business_logic.logger = get_logger_mock
+        since = datetime(2024, 3, 28, 16, 54, 31)
+        business_logic.data_storage.get_index_stats.return_value = [
+            {"collection": "data_collection", "name": "time_1", "key": {"time": 1}, "accesses": {"ops": 3, "since": since}}
+        ]
+
+        # Act
+        index_stats = asyncio.run(business_logic.get_index_stats())
+
+        # Assert
+        assert index_stats == [
+            IndexStats(collection="data_collection", name="time_1", key={"time": 1}, accesses=3, since=since.isoformat())
+        ]
+        business_logic.logger.error.assert_not_called()
+
+    @staticmethod
+    @patch('business_logic.business_logic.logging.getLogger')
+    def test_get_index_stats_when_exception_occurs(
+            get_logger_mock: MagicMock,
+            business_logic: BusinessLogic
+    ):
+        # Arrange
+        business_logic.logger = get_logger_mock
+        business_logic.data_storage.get_index_stats.side_effect = Exception("An error occurred")
+
+        # Act
+        with pytest.raises(FailureRetrievingIndexStats):
+            asyncio.run(business_logic.get_index_stats())
+
+        # Assert
+        business_logic.logger.error.assert_called_once_with("Error retrieving index stats: An error occurred")
+
+    @staticmethod
+    @patch('business_logic.business_logic.logging.getLogger')
+    def test_get_data_page_on_success(
+            get_logger_mock: MagicMock,
+            business_logic: BusinessLogic,
+            server_data: list[dict[str, Any]],
+            data_with_time_in_iso_format: list[ProjectedData]
+    ):
+        # Arrange
+        business_logic.logger = get_logger_mock
+        business_logic.data_storage.get_data_page.side_effect = [
+            (server_data[:2], (1711644891, "fake_id")),
+            (server_data[2:], None),
+        ]
+
+        # Act
+        first_page = asyncio.run(business_logic.get_data_page(limit=2))
+        second_page = asyncio.run(business_logic.get_data_page(limit=2, cursor=first_page.next_cursor))
+
+        # Assert
+        assert first_page.data == data_with_time_in_iso_format[:2]
+        assert first_page.next_cursor is not None
+        assert second_page == DataPage(data=data_with_time_in_iso_format[2:], next_cursor=None)
+        business_logic.data_storage.get_data_page.assert_has_calls([
+            call(limit=2, start_time=None, end_time=None, after=None, fields=None),
+            call(limit=2, start_time=None, end_time=None, after=(1711644891.0, "fake_id"), fields=None),
+        ])
+        business_logic.logger.error.assert_not_called()
+
+    @staticmethod
+    def test_get_data_page_when_cursor_is_invalid(business_logic: BusinessLogic):
+        # Arrange
+
+        # Act
+        with pytest.raises(InvalidCursor):
+            asyncio.run(business_logic.get_data_page(limit=2, cursor="invalid_cursor"))
+
+        # Assert
+        business_logic.data_storage.get_data_page.assert_not_called()
+
+    @staticmethod
+    @patch('business_logic.business_logic.logging.getLogger')
+    def test_get_data_page_when_cursor_is_from_another_storage(
+            get_logger_mock: MagicMock,
+            business_logic: BusinessLogic
+    ):
+        # Arrange
+        business_logic.logger = get_logger_mock
+        business_logic.data_storage.get_data_page.side_effect = InvalidCursor("Invalid cursor id: 42")
+        cursor = base64.urlsafe_b64encode(json.dumps([1711644891, "42"]).encode()).decode()
+
+        # Act
+        with pytest.raises(InvalidCursor):
+            asyncio.run(business_logic.get_data_page(limit=2, cursor=cursor))
+
+        # Assert
+        business_logic.logger.error.assert_not_called()
+
+    @staticmethod
+    @patch('business_logic.business_logic.logging.getLogger')
+    def test_get_data_page_when_exception_occurs(
+            get_logger_mock: MagicMock,
+            business_logic: BusinessLogic
+    ):
+        # Arrange
+        business_logic.logger = get_logger_mock
+        business_logic.data_storage.get_data_page.side_effect = Exception("An error occurred")
+
+        # Act
+        with pytest.raises(FailureRetrievingData):
+            asyncio.run(business_logic.get_data_page(limit=2))
+
+        # Assert
+        business_logic.logger.error.assert_called_once_with("Error retrieving data page: An error occurred")
+
+    @staticmethod
+    def test_stream_data(
+            business_logic: BusinessLogic,
+            server_data: list[dict[str, Any]],
+            data_with_time_in_iso_format: list[ProjectedData]
+    ):
+        # Arrange
+        async def stream_server_data(**_):
+            for d in server_data:
+                yield d
+
+        async def collect():
+            return [d async for d in business_logic.stream_data()]
+
+        business_logic.data_storage.stream_data = stream_server_data
+
+        # Act
+        data = asyncio.run(collect())
+
+        # Assert
+        assert data == data_with_time_in_iso_format
+
+    @staticmethod
+    @patch('business_logic.business_logic.logging.getLogger')
+    def test_get_data_aggregates_on_success(
+            get_logger_mock: MagicMock,
+            business_logic: BusinessLogic
+    ):
+        # Arrange
+        business_logic.logger = get_logger_mock
+        business_logic.data_storage.aggregate_data.return_value = [
+            {"bucket": 1711644840, "count": 2, "min": 1.0, "max": 3.0, "mean": 2.0, "last": 3.0}
+        ]
+
+        # Act
+        data_aggregates = asyncio.run(business_logic.get_data_aggregates(bucket="5m", aggregates=["count", "mean"]))
+
+        # Assert
+        assert data_aggregates == [
+            DataAggregate(time=datetime.fromtimestamp(1711644840).isoformat(), count=2, mean=2.0)
+        ]
+        business_logic.data_storage.aggregate_data.assert_called_once_with(
+            bucket_seconds=300, start_time=None, end_time=None, aggregates=["count", "mean"]
+        )
+        business_logic.logger.error.assert_not_called()
+
+    @staticmethod
+    @pytest.mark.parametrize("bucket", ["0s", "1w", "m", "1.5h"])
+    def test_get_data_aggregates_when_bucket_is_invalid(business_logic: BusinessLogic, bucket: str):
+        # Arrange
+
+        # Act
+        with pytest.raises(InvalidBucket):
+            asyncio.run(business_logic.get_data_aggregates(bucket=bucket))
+
+        # Assert
+        business_logic.data_storage.aggregate_data.assert_not_called()
@@ -1,7 +1,10 @@
+import pytest
 from unittest.mock import patch, MagicMock
 
 from business_logic.business_logic import BusinessLogic
 from business_logic.business_logic_factory import BusinessLogicFactory
+from infrastructure.cache.in_memory_query_cache import InMemoryQueryCache
+from infrastructure.data.storage.memory.in_memory_data_storage import InMemoryDataStorage
 
 
 class TestBusinessLogicFactory:
@@ -16,3 +19,33 @@ class TestBusinessLogicFactory:
         # Assert
         assert isinstance(business_logic, BusinessLogic)
         assert business_logic.data_storage == mongodb_data_storage_mock()
+
+    @staticmethod
+    @patch("business_logic.business_logic_factory.SQLiteDataStorage")
+    @patch("business_logic.business_logic_factory.MongoDBDataStorage")
+    def test_instantiate_data_storage(mongodb_data_storage_mock: MagicMock, sqlite_data_storage_mock: MagicMock):
+        # Arrange
+
+        # Act
+        mongodb_data_storage = BusinessLogicFactory.instantiate_data_storage(backend="mongodb")
+        sqlite_data_storage = BusinessLogicFactory.instantiate_data_storage(backend="sqlite")
+        in_memory_data_storage = BusinessLogicFactory.instantiate_data_storage(backend="memory")
+
+        # Assert
+        assert mongodb_data_storage == mongodb_data_storage_mock()
+        assert sqlite_data_storage == sqlite_data_storage_mock()
+        assert isinstance(in_memory_data_storage, InMemoryDataStorage)
+
+    @staticmethod
+    @pytest.mark.parametrize("backend, expected_type", [
+        ("memory", InMemoryQueryCache),
+        ("none", type(None)),
+    ])
+    def test_instantiate_query_cache(backend: str, expected_type: type):
+        # Arrange
+
+        # Act
+        query_cache = BusinessLogicFactory.instantiate_query_cache(backend=backend)
+
+        # Assert
+        assert isinstance(query_cache, expected_type)
@@ -0,0 +1,259 @@
+import asyncio
+import pytest
+from datetime import datetime
+from typing import Any
+from unittest.mock import AsyncMock
+from bson import ObjectId
+from pymongo.errors import AutoReconnect, BulkWriteError
+
+from business_logic.business_logic import BusinessLogic
+from business_logic.exceptions.failure_fetching_data import FailureFetchingData
+from business_logic.ingestion_scheduler import IngestionScheduler
+from infrastructure.data.storage.mongodb.mongodb_data_storage import MongoDBDataStorage
+
+
+@pytest.fixture
+def ingestion_scheduler() -> IngestionScheduler:
+    return IngestionScheduler(business_logic=AsyncMock(), interval_seconds=1, max_backoff_seconds=5)
+
+
+class TestIngestionScheduler:
+    @staticmethod
+    def test_run_once_on_success(ingestion_scheduler: IngestionScheduler):
+        # Arrange
+        ingestion_scheduler.business_logic.fetch_data_from_server.return_value = True
+        ingestion_scheduler.consecutive_failures = 3
+
+        # Act
+        succeeded = asyncio.run(ingestion_scheduler.run_once())
+
+        # Assert
+        assert succeeded
+        assert ingestion_scheduler.consecutive_failures == 0
+        assert ingestion_scheduler.last_success_time is not None
+        assert ingestion_scheduler.next_delay() == 1
+        ingestion_scheduler.business_logic.fetch_data_from_server.assert_called_once()
+
+    @staticmethod
+    def test_run_once_on_failure_backs_off(ingestion_scheduler: IngestionScheduler):
+        # Arrange
+        ingestion_scheduler.business_logic.fetch_data_from_server.return_value = False
+
+        # Act
+        succeeded = asyncio.run(ingestion_scheduler.run_once())
+
+        # Assert
+        assert not succeeded
+        assert ingestion_scheduler.consecutive_failures == 1
+        assert ingestion_scheduler.last_success_time is None
+        assert ingestion_scheduler.next_delay() == 2
+
+    @staticmethod
+    def test_next_delay_is_capped_by_max_backoff(ingestion_scheduler: IngestionScheduler):
+        # Arrange
+        ingestion_scheduler.consecutive_failures = 10
+
+        # Act
+        delay = ingestion_scheduler.next_delay()
+
+        # Assert
+        assert delay == 5
+
+    @staticmethod
+    def test_get_status(ingestion_scheduler: IngestionScheduler):
+        # Arrange
+        ingestion_scheduler.business_logic.fetch_data_from_server.return_value = True
+        asyncio.run(ingestion_scheduler.run_once())
+
+        # Act
+        status = ingestion_scheduler.get_status()
+
+        # Assert
+        assert not status.running
+        assert status.last_success_time == ingestion_scheduler.last_success_time.isoformat()
+        assert status.lag_seconds >= 0
+        assert status.consecutive_failures == 0
+
+    @staticmethod
+    def test_start_and_stop(ingestion_scheduler: IngestionScheduler):
+        # Arrange
+        ingestion_scheduler.business_logic.fetch_data_from_server.return_value = True
+
+        async def start_and_stop():
+            ingestion_scheduler.start()
+            await asyncio.sleep(0.05)
+            running = ingestion_scheduler.running
+            await ingestion_scheduler.stop()
+            return running
+
+        # Act
+        was_running = asyncio.run(start_and_stop())
+
+        # Assert
+        assert was_running
+        assert not ingestion_scheduler.running
+        ingestion_scheduler.business_logic.fetch_data_from_server.assert_called_once()
+
+    @staticmethod
+    def test_fetch_sample_once_skips_duplicated_samples(ingestion_scheduler: IngestionScheduler):
+        # Arrange
+        sample = {"time": 1711644891, "value": [68, 51, 127, 191], "tags": []}
+        ingestion_scheduler.business_logic.fetch_sample.side_effect = [
+            sample,
+            dict(sample),
+            {**sample, "value": [0, 0, 128, 63]},
+        ]
+
+        # Act
+        for _ in range(3):
+            asyncio.run(ingestion_scheduler.fetch_sample_once())
+
+        # Assert
+        assert ingestion_scheduler.queue.qsize() == 2
+        assert ingestion_scheduler.get_status().queued_samples == 2
+
+    @staticmethod
+    def test_fetch_sample_once_on_failure_backs_off(ingestion_scheduler: IngestionScheduler):
+        # Arrange
+        ingestion_scheduler.business_logic.fetch_sample.side_effect = FailureFetchingData("An error occurred")
+
+        # Act
+        succeeded = asyncio.run(ingestion_scheduler.fetch_sample_once())
+
+        # Assert
+        assert not succeeded
+        assert ingestion_scheduler.consecutive_failures == 1
+        assert ingestion_scheduler.queue.empty()
+
+    @staticmethod
+    def test_save_queued_samples_in_batches():
+        # Arrange
+        ingestion_scheduler = IngestionScheduler(business_logic=AsyncMock(), batch_size=2)
+        for time in range(3):
+            ingestion_scheduler.queue.put_nowait({"time": time, "value": [0, 0, 0, 0], "tags": []})
+
+        # Act
+        first_batch_size = asyncio.run(ingestion_scheduler.save_queued_samples())
+        second_batch_size = asyncio.run(ingestion_scheduler.save_queued_samples())
+
+        # Assert
+        assert (first_batch_size, second_batch_size) == (2, 1)
+        assert ingestion_scheduler.business_logic.save_samples.call_count == 2
+
+    @staticmethod
+    def test_start_and_stop_with_concurrent_fetches():
+        # Arrange
+        ingestion_scheduler = IngestionScheduler(business_logic=AsyncMock(), interval_seconds=0.01, concurrency=3)
+        samples = iter(range(1000))
+
+        ingestion_scheduler.business_logic.fetch_sample.side_effect = \
+            lambda: {"time": next(samples), "value": [0, 0, 0, 0], "tags": []}
+
+        async def start_and_stop():
+            ingestion_scheduler.start()
+            await asyncio.sleep(0.05)
+            await ingestion_scheduler.stop()
+
+        # Act
+        asyncio.run(start_and_stop())
+
+        # Assert
+        saved_samples = [
+            d["time"] for c in ingestion_scheduler.business_logic.save_samples.call_args_list for d in c.args[0]
+        ]
+        assert not ingestion_scheduler.running
+        assert ingestion_scheduler.business_logic.fetch_sample.call_count > 3
+        assert sorted(saved_samples) == list(range(ingestion_scheduler.business_logic.fetch_sample.call_count))
+        assert ingestion_scheduler.queue.empty()
+
+    @staticmethod
+    def test_save_queued_samples_retries_failed_batch():
+        # Arrange
+        ingestion_scheduler = IngestionScheduler(business_logic=AsyncMock(), batch_size=2)
+        ingestion_scheduler.business_logic.save_samples.side_effect = [False, True]
+        ingestion_scheduler.business_logic.fetch_sample.return_value = None
+        for time in range(3):
+            ingestion_scheduler.queue.put_nowait({"time": time, "value": [0, 0, 0, 0], "tags": []})
+
+        # Act
+        first_batch_size = asyncio.run(ingestion_scheduler.save_queued_samples())
+        asyncio.run(ingestion_scheduler.fetch_sample_once())
+        consecutive_failures = ingestion_scheduler.consecutive_failures
+        second_batch_size = asyncio.run(ingestion_scheduler.save_queued_samples())
+
+        # Assert
+        assert (first_batch_size, second_batch_size) == (0, 2)
+        assert consecutive_failures == 1
+        assert [d["time"] for d in ingestion_scheduler.business_logic.save_samples.call_args.args[0]] == [0, 1]
+        assert ingestion_scheduler.queue.qsize() == 1
+
+    @staticmethod
+    def test_stop_waits_for_the_batch_being_saved():
+        # Arrange
+        ingestion_scheduler = IngestionScheduler(business_logic=AsyncMock(), interval_seconds=10, concurrency=2)
+        ingestion_scheduler.business_logic.fetch_sample.return_value = None
+        saved_samples = []
+
+        async def save_samples(batch):
+            await asyncio.sleep(0.05)
+            saved_samples.extend(batch)
+            return True
+
+        ingestion_scheduler.business_logic.save_samples.side_effect = save_samples
+
+        async def start_and_stop():
+            ingestion_scheduler.queue.put_nowait({"time": 0, "value": [0, 0, 0, 0], "tags": []})
+            ingestion_scheduler.start()
+            await asyncio.sleep(0.01)
+            await ingestion_scheduler.stop()
+
+        # Act
+        asyncio.run(start_and_stop())
+
+        # Assert
+        assert [d["time"] for d in saved_samples] == [0]
+        assert ingestion_scheduler.business_logic.save_samples.call_count == 1
+
+    @staticmethod
+    def test_save_queued_samples_when_a_storage_flush_fails_once():
+        # Arrange
+        data_storage = MongoDBDataStorage(write_buffer_max_size=2, write_buffer_max_age_seconds=60)
+        for name in ("data_collection", "discard_collection", "minute_rollup_collection", "hour_rollup_collection"):
+            setattr(data_storage, name, AsyncMock())
+        stored_keys = set()
+        failures = [AutoReconnect("connection lost")]
+
+        async def insert_many(documents: list[dict[str, Any]], ordered: bool):
+            if failures:
+                raise failures.pop()
+            write_errors = []
+            for i, d in enumerate(documents):
+                d.setdefault("_id", ObjectId())
+                if d["key"] in stored_keys:
+                    write_errors.append({"index": i, "code": 11000, "errmsg": "duplicate key error"})
+                stored_keys.add(d["key"])
+            if write_errors:
+                raise BulkWriteError({"writeErrors": write_errors})
+
+        data_storage.data_collection.insert_many.side_effect = insert_many
+        ingestion_scheduler = IngestionScheduler(business_logic=BusinessLogic(data_storage=data_storage))
+        now = int(datetime.now().timestamp())
+        for t in range(now, now + 3):
+            ingestion_scheduler.queue.put_nowait(BusinessLogic.build_document({"time": t, "value": [0, 0, 128, 63], "tags": []}))
+
+        async def save_and_flush():
+            while await ingestion_scheduler.save_queued_samples():
+                pass
+            await data_storage.flush()
+
+        # Act
+        asyncio.run(save_and_flush())
+
+        # Assert
+        rollup_count = sum(
+            operation._doc["$inc"].get("count", 0)
+            for c in data_storage.minute_rollup_collection.bulk_write.call_args_list
+            for operation in c.args[0]
+        )
+        assert len(stored_keys) == 3
+        assert rollup_count == 3
@@ -0,0 +1,97 @@
+import pytest
+
+from business_logic.constants import (
+    REASON_DATA_IS_TOO_OLD,
+    REASON_DATA_IS_INTERNAL_TO_SYSTEM,
+    REASON_DATA_IS_INACCURATE,
+    SUSPECT_TAG,
+    SYSTEM_TAG,
+)
+from business_logic.exceptions.invalid_validation_rule import InvalidValidationRule
+from business_logic.rule_engine import RuleEngine
+
+
+class TestRuleEngine:
+    @staticmethod
+    def test_validate_with_default_rules():
+        # Arrange
+        rule_engine = RuleEngine()
+        data = [
+            {"time": 10000, "tags": []},
+            {"time": 5000, "tags": [SYSTEM_TAG, SUSPECT_TAG]},
+            {"time": 6400, "tags": ["other"]},
+        ]
+
+        # Act
+        reasons = rule_engine.validate(data, now=10000)
+
+        # Assert
+        assert reasons == [
+            [],
+            [REASON_DATA_IS_TOO_OLD, REASON_DATA_IS_INTERNAL_TO_SYSTEM, REASON_DATA_IS_INACCURATE],
+            [],
+        ]
+
+    @staticmethod
+    def test_validate_with_value_range_rule():
+        # Arrange
+        rule_engine = RuleEngine(rules=[{"reason": "Out of range", "type": "value_range", "min": 0, "max": 10}])
+        data = [
+            {"time": 0, "tags": [], "decoded_value": 5.0},
+            {"time": 0, "tags": [], "decoded_value": 11.0},
+            {"time": 0, "tags": [], "decoded_value": None},
+        ]
+
+        # Act
+        reasons = rule_engine.validate(data, now=0)
+
+        # Assert
+        assert reasons == [[], ["Out of range"], ["Out of range"]]
+
+    @staticmethod
+    def test_from_file(tmp_path):
+        # Arrange
+        path = tmp_path / "rules.yaml"
+        path.write_text(
+            "rules:\n"
+            "  - reason: Data is from a test\n"
+            "    type: tags\n"
+            "    tags: [test, staging]\n"
+        )
+
+        # Act
+        rule_engine = RuleEngine.from_file(str(path))
+
+        # Assert
+        assert rule_engine.validate([{"time": 0, "tags": ["staging"]}], now=0) == [["Data is from a test"]]
+
+    @staticmethod
+    @pytest.mark.parametrize("rule", [
+        {"type": "tags", "tags": [SYSTEM_TAG]},
+        {"reason": "Unknown", "type": "unknown"},
+        {"reason": "Missing max age", "type": "max_age"},
+        {"reason": "Scalar tags", "type": "tags", "tags": SYSTEM_TAG},
+        "Not a rule",
+    ])
+    def test_invalid_rules(rule: dict):
+        # Arrange
+
+        # Act / Assert
+        with pytest.raises(InvalidValidationRule):
+            RuleEngine(rules=[rule])
+
+    @staticmethod
+    @pytest.mark.parametrize("content", [
+        "",
+        "rules: []\n",
+        "rule:\n  - reason: Data is from a test\n    type: tags\n    tags: [test]\n",
+        "rules: Data is from a test\n",
+    ])
+    def test_from_file_without_rules(tmp_path, content: str):
+        # Arrange
+        path = tmp_path / "rules.yaml"
+        path.write_text(content)
+
+        # Act / Assert
+        with pytest.raises(InvalidValidationRule):
+            RuleEngine.from_file(str(path))
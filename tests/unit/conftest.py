@@ -0,0 +1,20 @@
+import pytest
+
+
+class MockCursor:
+    # Stands in for a Motor cursor, which is iterated with async for
+    def __init__(self, documents: list):
+        self.documents = list(documents)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self.documents:
+            raise StopAsyncIteration
+        return self.documents.pop(0)
+
+
+@pytest.fixture
+def mock_cursor() -> type[MockCursor]:
+    return MockCursor
@@ -0,0 +1,94 @@
+import asyncio
+from unittest.mock import patch, MagicMock
+
+from infrastructure.cache.in_memory_query_cache import InMemoryQueryCache
+
+
+class TestInMemoryQueryCache:
+    @staticmethod
+    def test_get_returns_value_that_was_set():
+        # Arrange
+        query_cache = InMemoryQueryCache()
+
+        # Act
+        asyncio.run(query_cache.set(key="key", value=b"[]", start=0, end=10, version=query_cache.version))
+        value = asyncio.run(query_cache.get("key"))
+
+        # Assert
+        assert value == b"[]"
+        assert asyncio.run(query_cache.get_stats()) == {"hits": 1, "misses": 0, "entries": 1}
+
+    @staticmethod
+    def test_get_counts_misses():
+        # Arrange
+        query_cache = InMemoryQueryCache()
+
+        # Act
+        value = asyncio.run(query_cache.get("key"))
+
+        # Assert
+        assert value is None
+        assert asyncio.run(query_cache.get_stats()) == {"hits": 0, "misses": 1, "entries": 0}
+
+    @staticmethod
+    def test_set_evicts_least_recently_used_entry():
+        # Arrange
+        query_cache = InMemoryQueryCache(max_entries=2)
+        asyncio.run(query_cache.set(key="a", value=b"a", start=None, end=None, version=0))
+        asyncio.run(query_cache.set(key="b", value=b"b", start=None, end=None, version=0))
+        asyncio.run(query_cache.get("a"))
+
+        # Act
+        asyncio.run(query_cache.set(key="c", value=b"c", start=None, end=None, version=0))
+
+        # Assert
+        assert asyncio.run(query_cache.get("a")) == b"a"
+        assert asyncio.run(query_cache.get("b")) is None
+        assert asyncio.run(query_cache.get("c")) == b"c"
+
+    @staticmethod
+    def test_invalidate_only_evicts_overlapping_entries():
+        # Arrange
+        query_cache = InMemoryQueryCache()
+        asyncio.run(query_cache.set(key="before", value=b"1", start=0, end=10, version=0))
+        asyncio.run(query_cache.set(key="overlapping", value=b"2", start=10, end=20, version=0))
+        asyncio.run(query_cache.set(key="open", value=b"3", start=15, end=None, version=0))
+        asyncio.run(query_cache.set(key="after", value=b"4", start=30, end=40, version=0))
+
+        # Act
+        asyncio.run(query_cache.invalidate([12, 25]))
+
+        # Assert
+        assert asyncio.run(query_cache.get("before")) == b"1"
+        assert asyncio.run(query_cache.get("overlapping")) is None
+        assert asyncio.run(query_cache.get("open")) is None
+        assert asyncio.run(query_cache.get("after")) == b"4"
+
+    @staticmethod
+    def test_set_ignores_results_computed_before_an_invalidation():
+        # Arrange
+        query_cache = InMemoryQueryCache()
+        version = query_cache.version
+        asyncio.run(query_cache.invalidate([5]))
+
+        # Act
+        asyncio.run(query_cache.set(key="key", value=b"[]", start=0, end=10, version=version))
+
+        # Assert
+        assert asyncio.run(query_cache.get("key")) is None
+
+    @staticmethod
+    @patch("infrastructure.cache.in_memory_query_cache.time.monotonic")
+    def test_get_does_not_return_expired_entries(monotonic_mock: MagicMock):
+        # Arrange
+        query_cache = InMemoryQueryCache(ttl_seconds=10)
+        monotonic_mock.return_value = 100
+        asyncio.run(query_cache.set(key="key", value=b"[]", start=0, end=10, version=query_cache.version))
+
+        # Act
+        monotonic_mock.return_value = 110
+        value = asyncio.run(query_cache.get("key"))
+
+        # Assert
+        assert value is None
+        assert asyncio.run(query_cache.get_stats()) == {"hits": 0, "misses": 1, "entries": 0}
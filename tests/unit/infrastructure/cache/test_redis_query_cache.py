@@ -0,0 +1,113 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from infrastructure.cache.constants import REDIS_SET_IF_CURRENT_SCRIPT
+from infrastructure.cache.redis_query_cache import RedisQueryCache
+
+
+def create_query_cache() -> RedisQueryCache:
+    client = AsyncMock()
+    pipeline = AsyncMock()
+    client.pipeline = MagicMock(return_value=pipeline)
+    pipeline.__aenter__.return_value = pipeline
+    pipeline.delete = MagicMock()
+    pipeline.zrem = MagicMock()
+    return RedisQueryCache(prefix="cache", ttl_seconds=60, client=client)
+
+
+class TestRedisQueryCache:
+    @staticmethod
+    def test_get_version_is_read_from_redis():
+        # Arrange
+        query_cache = create_query_cache()
+        query_cache.client.get.return_value = b"7"
+
+        # Act
+        version = asyncio.run(query_cache.get_version())
+
+        # Assert
+        assert version == 7
+        query_cache.client.get.assert_awaited_once_with("cache:version")
+
+    @staticmethod
+    @patch("infrastructure.cache.redis_query_cache.time.time")
+    def test_set_stores_the_entry_only_if_the_version_is_current(time_mock: MagicMock):
+        # Arrange
+        query_cache = create_query_cache()
+        time_mock.return_value = 1000
+
+        # Act
+        asyncio.run(query_cache.set(key="key", value=b"[]", start=0, end=10, version=7))
+
+        # Assert
+        query_cache.client.eval.assert_awaited_once_with(
+            REDIS_SET_IF_CURRENT_SCRIPT,
+            3,
+            "cache:version",
+            "cache:entry:key",
+            "cache:windows",
+            "7",
+            b"[]",
+            60,
+            1060,
+            json.dumps(["key", 0, 10]),
+            1000,
+            1024,
+            "cache:entry:",
+        )
+
+    @staticmethod
+    def test_set_without_a_version_is_ignored():
+        # Arrange
+        query_cache = create_query_cache()
+
+        # Act
+        asyncio.run(query_cache.set(key="key", value=b"[]", start=0, end=10, version=None))
+
+        # Assert
+        query_cache.client.eval.assert_not_awaited()
+
+    @staticmethod
+    def test_invalidate_bumps_the_version_and_deletes_overlapping_entries():
+        # Arrange
+        query_cache = create_query_cache()
+        overlapping_window = json.dumps(["overlapping", 10, 20]).encode()
+        query_cache.client.zrangebyscore.return_value = [json.dumps(["before", 0, 5]).encode(), overlapping_window]
+
+        # Act
+        asyncio.run(query_cache.invalidate([12]))
+
+        # Assert
+        query_cache.client.incr.assert_awaited_once_with("cache:version")
+        pipeline = query_cache.client.pipeline.return_value
+        pipeline.delete.assert_called_once_with("cache:entry:overlapping")
+        pipeline.zrem.assert_called_once_with("cache:windows", overlapping_window)
+
+    @staticmethod
+    @patch("infrastructure.cache.redis_query_cache.time.time")
+    def test_get_stats_only_counts_unexpired_entries(time_mock: MagicMock):
+        # Arrange
+        query_cache = create_query_cache()
+        time_mock.return_value = 1000
+        query_cache.client.mget.return_value = [b"3", None]
+        query_cache.client.zcount.return_value = 2
+
+        # Act
+        stats = asyncio.run(query_cache.get_stats())
+
+        # Assert
+        assert stats == {"hits": 3, "misses": 0, "entries": 2}
+        query_cache.client.zcount.assert_awaited_once_with("cache:windows", 1000, "+inf")
+
+    @staticmethod
+    def test_get_stats_when_redis_is_unavailable():
+        # Arrange
+        query_cache = create_query_cache()
+        query_cache.client.mget.side_effect = ConnectionError("Connection refused")
+
+        # Act
+        stats = asyncio.run(query_cache.get_stats())
+
+        # Assert
+        assert stats == {"available": False}
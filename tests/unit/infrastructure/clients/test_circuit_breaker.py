@@ -0,0 +1,51 @@
+from unittest.mock import patch, MagicMock
+
+from infrastructure.clients.circuit_breaker import CircuitBreaker
+
+
+class TestCircuitBreaker:
+    @staticmethod
+    def test_opens_after_failure_threshold():
+        # Arrange
+        circuit_breaker = CircuitBreaker(failure_threshold=2, reset_seconds=30)
+
+        # Act
+        circuit_breaker.record_failure()
+        allowed_before_threshold = circuit_breaker.allow_request()
+        circuit_breaker.record_failure()
+
+        # Assert
+        assert allowed_before_threshold
+        assert circuit_breaker.open
+        assert not circuit_breaker.allow_request()
+
+    @staticmethod
+    def test_success_resets_failures():
+        # Arrange
+        circuit_breaker = CircuitBreaker(failure_threshold=2, reset_seconds=30)
+        circuit_breaker.record_failure()
+
+        # Act
+        circuit_breaker.record_success()
+        circuit_breaker.record_failure()
+
+        # Assert
+        assert not circuit_breaker.open
+        assert circuit_breaker.allow_request()
+
+    @staticmethod
+    @patch("infrastructure.clients.circuit_breaker.time.monotonic")
+    def test_allows_a_single_trial_request_after_reset_seconds(monotonic_mock: MagicMock):
+        # Arrange
+        circuit_breaker = CircuitBreaker(failure_threshold=1, reset_seconds=30)
+        monotonic_mock.return_value = 100
+        circuit_breaker.record_failure()
+
+        # Act
+        monotonic_mock.return_value = 130
+        first_allowed = circuit_breaker.allow_request()
+        second_allowed = circuit_breaker.allow_request()
+
+        # Assert
+        assert first_allowed
+        assert not second_allowed
@@ -0,0 +1,101 @@
+import asyncio
+from typing import Callable
+from unittest.mock import patch, AsyncMock
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from infrastructure.clients.circuit_breaker import CircuitBreaker
+from infrastructure.clients.external_data_service import ExternalDataService
+
+
+@pytest.fixture(autouse=True)
+def circuit_breaker() -> CircuitBreaker:
+    ExternalDataService.circuit_breaker = CircuitBreaker(failure_threshold=2, reset_seconds=30)
+    return ExternalDataService.circuit_breaker
+
+
+def fetch_data_from_server(handler: Callable[[httpx.Request], httpx.Response]):
+    async def fetch():
+        ExternalDataService.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            return await ExternalDataService.fetch_data_from_server()
+        finally:
+            await ExternalDataService.close()
+
+    with patch("infrastructure.clients.external_data_service.asyncio.sleep", AsyncMock()):
+        return asyncio.run(fetch())
+
+
+class TestExternalDataService:
+    @staticmethod
+    def test_fetch_data_from_server_on_success():
+        # Arrange
+        data = {"time": 1711644891, "value": [68, 51, 127, 191], "tags": []}
+
+        # Act
+        result = fetch_data_from_server(lambda request: httpx.Response(200, json=data))
+
+        # Assert
+        assert result == data
+
+    @staticmethod
+    def test_fetch_data_from_server_when_there_is_no_data():
+        # Arrange
+
+        # Act
+        result = fetch_data_from_server(lambda request: httpx.Response(404))
+
+        # Assert
+        assert result is None
+
+    @staticmethod
+    def test_fetch_data_from_server_retries_transient_failures():
+        # Arrange
+        responses = [httpx.ConnectError("Connection refused"), httpx.Response(503), httpx.Response(200, json={})]
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            response = responses.pop(0)
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+        # Act
+        result = fetch_data_from_server(handler)
+
+        # Assert
+        assert result == {}
+        assert responses == []
+
+    @staticmethod
+    def test_fetch_data_from_server_opens_circuit_breaker_after_failures(circuit_breaker: CircuitBreaker):
+        # Arrange
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(500)
+
+        # Act
+        for _ in range(2):
+            with pytest.raises(HTTPException):
+                fetch_data_from_server(handler)
+        requests_before_open = len(requests)
+        with pytest.raises(HTTPException) as e:
+            fetch_data_from_server(handler)
+
+        # Assert
+        assert circuit_breaker.open
+        assert e.value.status_code == 503
+        assert len(requests) == requests_before_open
+
+    @staticmethod
+    def test_get_retry_delay_is_bounded():
+        # Arrange
+
+        # Act
+        delays = [ExternalDataService.get_retry_delay(attempt) for attempt in range(1, 20)]
+
+        # Assert
+        assert all(0 <= delay <= 2 for delay in delays)
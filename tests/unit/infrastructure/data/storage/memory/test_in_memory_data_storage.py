@@ -0,0 +1,197 @@
+import asyncio
+import os
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from business_logic.exceptions.invalid_cursor import InvalidCursor
+from infrastructure.data.storage.memory.in_memory_data_storage import InMemoryDataStorage
+from infrastructure.metrics.metrics import STORAGE_OPERATION_SECONDS
+
+
+def to_document(time: float, value: int = 0, tags: list[str] = None) -> dict:
+    return {"time": time, "value": [value, 0, 0, 0], "decoded_value": float(value), "tags": tags or []}
+
+
+class TestInMemoryDataStorage:
+    @staticmethod
+    def test_get_data():
+        # Arrange
+        data_storage = InMemoryDataStorage()
+        asyncio.run(data_storage.save_many_data([to_document(3, 3), to_document(1, 1), to_document(2, 2)]))
+
+        # Act
+        data = asyncio.run(data_storage.get_data(
+            start_time=datetime.fromtimestamp(2),
+            end_time=datetime.fromtimestamp(3),
+            fields=["time", "decoded_value"],
+        ))
+
+        # Assert
+        assert data == [{"time": 2, "decoded_value": 2.0}, {"time": 3, "decoded_value": 3.0}]
+
+    @staticmethod
+    def test_save_data_ignores_duplicates_and_notifies_write_listeners():
+        # Arrange
+        data_storage = InMemoryDataStorage()
+        listener = AsyncMock()
+        data_storage.add_write_listener(listener)
+
+        # Act
+        asyncio.run(data_storage.save_data(to_document(1, 1)))
+        asyncio.run(data_storage.save_data(to_document(1, 1)))
+
+        # Assert
+        assert len(asyncio.run(data_storage.get_data())) == 1
+        assert listener.await_args_list[0].args == ([1],)
+        assert listener.await_args_list[1].args == ([],)
+
+    @staticmethod
+    def test_get_data_page():
+        # Arrange
+        data_storage = InMemoryDataStorage()
+        asyncio.run(data_storage.save_many_data([to_document(1, 1), to_document(2, 2), to_document(2, 3)]))
+
+        # Act
+        first_page, after = asyncio.run(data_storage.get_data_page(limit=2, fields=["decoded_value"]))
+        second_page, last_after = asyncio.run(data_storage.get_data_page(limit=2, after=after, fields=["decoded_value"]))
+
+        # Assert
+        assert first_page == [{"decoded_value": 1.0}, {"decoded_value": 2.0}]
+        assert after == (2, "1")
+        assert second_page == [{"decoded_value": 3.0}]
+        assert last_after is None
+
+    @staticmethod
+    def test_get_data_page_when_cursor_id_is_not_from_this_storage():
+        # Arrange
+        data_storage = InMemoryDataStorage()
+
+        # Act
+        with pytest.raises(InvalidCursor) as e:
+            asyncio.run(data_storage.get_data_page(limit=2, after=(1, "6605a2db4f1d2c3a4b5c6d7e")))
+
+        # Assert
+        assert "6605a2db4f1d2c3a4b5c6d7e" in str(e.value)
+
+    @staticmethod
+    def test_stream_data():
+        # Arrange
+        data_storage = InMemoryDataStorage()
+        asyncio.run(data_storage.save_many_data([to_document(2, 2), to_document(1, 1)]))
+
+        async def stream() -> list[dict]:
+            return [d async for d in data_storage.stream_data(fields=["time"])]
+
+        # Act
+        data = asyncio.run(stream())
+
+        # Assert
+        assert data == [{"time": 1}, {"time": 2}]
+
+    @staticmethod
+    def test_get_reasons_for_invalid_data():
+        # Arrange
+        data_storage = InMemoryDataStorage()
+        asyncio.run(data_storage.save_many_reasons_for_invalid_data([
+            {**to_document(1, 1, ["system"]), "reasons": ["tags"]},
+            {**to_document(2, 2), "reasons": ["max_age"]},
+        ]))
+
+        # Act
+        by_reason = asyncio.run(data_storage.get_reasons_for_invalid_data(reason="max_age"))
+        by_tag = asyncio.run(data_storage.get_reasons_for_invalid_data(tag="system"))
+
+        # Assert
+        assert [d["time"] for d in by_reason] == [2]
+        assert [d["time"] for d in by_tag] == [1]
+
+    @staticmethod
+    def test_aggregate_data():
+        # Arrange
+        data_storage = InMemoryDataStorage()
+        asyncio.run(data_storage.save_many_data([to_document(0, 1), to_document(30, 3), to_document(60, 5)]))
+
+        # Act
+        aggregates = asyncio.run(data_storage.aggregate_data(bucket_seconds=60))
+
+        # Assert
+        assert [(a["bucket"], a["count"], a["mean"]) for a in aggregates] == [(0, 2, 2.0), (60, 1, 5.0)]
+
+    @staticmethod
+    def test_aggregate_data_excludes_the_end_time():
+        # Arrange
+        data_storage = InMemoryDataStorage()
+        asyncio.run(data_storage.save_many_data([to_document(0, 1), to_document(30, 3), to_document(60, 5)]))
+
+        # Act
+        aggregates = asyncio.run(data_storage.aggregate_data(bucket_seconds=60, end_time=datetime.fromtimestamp(60)))
+
+        # Assert
+        assert [(a["bucket"], a["count"], a["last"]) for a in aggregates] == [(0, 2, 3.0)]
+
+    @staticmethod
+    def test_archive_data():
+        # Arrange
+        archive = MagicMock()
+        data_storage = InMemoryDataStorage(archive=archive)
+        asyncio.run(data_storage.save_many_data([to_document(1, 1), to_document(7200, 2)]))
+
+        # Act
+        archived_documents = asyncio.run(data_storage.archive_data(before=datetime.fromtimestamp(3600, tz=timezone.utc)))
+
+        # Assert
+        assert archived_documents == 1
+        assert archive.write.call_args.args[0] == "data"
+        assert [d["time"] for d in asyncio.run(data_storage.get_data())] == [7200]
+
+    @staticmethod
+    def test_snapshot_is_restored(tmp_path):
+        # Arrange
+        snapshot_path = os.path.join(tmp_path, "snapshot.pickle")
+        data_storage = InMemoryDataStorage(snapshot_path=snapshot_path)
+        asyncio.run(data_storage.save_many_data([to_document(1, 1)]))
+        asyncio.run(data_storage.save_reasons_for_invalid_data({**to_document(2, 2), "reasons": ["max_age"]}))
+
+        # Act
+        asyncio.run(data_storage.close())
+        restored_data_storage = InMemoryDataStorage(snapshot_path=snapshot_path)
+
+        # Assert
+        assert asyncio.run(restored_data_storage.get_data(fields=["time"])) == [{"time": 1}]
+        assert len(asyncio.run(restored_data_storage.get_reasons_for_invalid_data())) == 1
+        assert not os.path.exists(f"{snapshot_path}.tmp")
+
+    @staticmethod
+    def test_snapshot_is_taken_periodically(tmp_path):
+        # Arrange
+        snapshot_path = os.path.join(tmp_path, "snapshot.pickle")
+        data_storage = InMemoryDataStorage(snapshot_path=snapshot_path, snapshot_interval_seconds=0)
+
+        async def save_and_wait():
+            await data_storage.save_data(to_document(1, 1))
+            await asyncio.sleep(0.1)
+
+        # Act
+        asyncio.run(save_and_wait())
+
+        # Assert
+        assert os.path.exists(snapshot_path)
+
+    @staticmethod
+    def test_storage_operations_are_timed(monkeypatch):
+        # Arrange
+        monkeypatch.setattr(STORAGE_OPERATION_SECONDS, "enabled", True)
+        monkeypatch.setattr(STORAGE_OPERATION_SECONDS, "series", {})
+        data_storage = InMemoryDataStorage()
+
+        # Act
+        asyncio.run(data_storage.save_many_data([to_document(1, 1)]))
+        asyncio.run(data_storage.get_data())
+
+        # Assert
+        assert set(STORAGE_OPERATION_SECONDS.series) == {
+            ("memory", "insert", "data"),
+            ("memory", "query", "data"),
+        }
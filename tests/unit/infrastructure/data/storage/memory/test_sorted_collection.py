@@ -0,0 +1,69 @@
+from infrastructure.data.storage.memory.sorted_collection import SortedCollection
+
+
+class TestSortedCollection:
+    @staticmethod
+    def test_insert_keeps_time_order():
+        # Arrange
+        collection = SortedCollection()
+
+        # Act
+        collection.insert([{"time": 3}, {"time": 1}, {"time": 2}, {"time": 1, "late": True}])
+
+        # Assert
+        assert collection.times == [1, 1, 2, 3]
+        assert collection.documents[1] == {"time": 1, "late": True}
+        assert collection.ids == [1, 3, 2, 0]
+
+    @staticmethod
+    def test_insert_ignores_duplicate_keys():
+        # Arrange
+        collection = SortedCollection()
+        collection.insert([{"time": 1, "key": "a"}])
+
+        # Act
+        inserted = collection.insert([{"time": 1, "key": "a"}, {"time": 2, "key": "b"}, {"time": 3}])
+
+        # Assert
+        assert inserted == [{"time": 2, "key": "b"}, {"time": 3}]
+        assert len(collection) == 3
+
+    @staticmethod
+    def test_get_range():
+        # Arrange
+        collection = SortedCollection()
+        collection.insert([{"time": t} for t in (1, 2, 2, 3, 4)])
+
+        # Act
+        inclusive_range = collection.get_range(start_time=2, end_time=3)
+        open_range = collection.get_range()
+
+        # Assert
+        assert inclusive_range == (1, 4)
+        assert open_range == (0, 5)
+
+    @staticmethod
+    def test_get_position_after():
+        # Arrange
+        collection = SortedCollection()
+        collection.insert([{"time": t} for t in (1, 2, 2, 3)])
+
+        # Act
+        position = collection.get_position_after(after_time=2, after_id=1)
+
+        # Assert
+        assert position == 2
+
+    @staticmethod
+    def test_remove_before():
+        # Arrange
+        collection = SortedCollection()
+        collection.insert([{"time": 1, "key": "a"}, {"time": 2, "key": "b"}, {"time": 3, "key": "c"}])
+
+        # Act
+        removed = collection.remove_before(3)
+
+        # Assert
+        assert removed == [{"time": 1, "key": "a"}, {"time": 2, "key": "b"}]
+        assert collection.times == [3]
+        assert collection.keys == {"c"}
@@ -1,7 +1,12 @@
+import asyncio
 import pytest
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock, call, patch
 from typing import Any
-from pymongo.cursor import Cursor
+from bson import ObjectId
+from pymongo import ASCENDING, UpdateOne
+from pymongo.errors import AutoReconnect, BulkWriteError, OperationFailure
+from datetime import datetime
+from business_logic.exceptions.invalid_cursor import InvalidCursor
 from infrastructure.data.storage.mongodb.mongodb_data_storage import MongoDBDataStorage
 
 
@@ -17,9 +22,17 @@ def invalidation_reasons() -> dict[str, Any]:
 
 @pytest.fixture
 def mongodb_data_storage_client() -> MongoDBDataStorage:
-    mongodb_client = MongoDBDataStorage()
-    mongodb_client.data_collection = MagicMock()
-    mongodb_client.discard_collection = MagicMock()
+    mongodb_client = MongoDBDataStorage(write_buffer_max_size=2, write_buffer_max_age_seconds=60)
+    mongodb_client.data_collection = AsyncMock()
+    mongodb_client.data_collection.find = MagicMock()
+    mongodb_client.discard_collection = AsyncMock()
+    mongodb_client.discard_collection.find = MagicMock()
+    mongodb_client.discard_collection.aggregate = MagicMock()
+    mongodb_client.data_collection.aggregate = MagicMock()
+    mongodb_client.minute_rollup_collection = AsyncMock()
+    mongodb_client.minute_rollup_collection.aggregate = MagicMock()
+    mongodb_client.hour_rollup_collection = AsyncMock()
+    mongodb_client.hour_rollup_collection.aggregate = MagicMock()
     return mongodb_client
 
 
@@ -29,44 +42,588 @@ class TestMongoDBDataStorage:
         # Arrange
 
         # Act
-        mongodb_data_storage_client.save_data(data)
+        asyncio.run(mongodb_data_storage_client.save_data(data))
 
         # Assert
-        mongodb_data_storage_client.data_collection.insert_one.assert_called_once_with(data)
+        mongodb_data_storage_client.data_collection.insert_many.assert_not_called()
+        assert len(mongodb_data_storage_client.data_buffer) == 1
 
     @staticmethod
-    def test_get_data(mongodb_data_storage_client: MongoDBDataStorage):
+    def test_save_data_flushes_when_buffer_is_full(
+            mongodb_data_storage_client: MongoDBDataStorage,
+            data: dict[str, Any]
+    ):
         # Arrange
-        mock_cursor = MagicMock(spec=Cursor)
+        asyncio.run(mongodb_data_storage_client.save_data(data))
+
+        # Act
+        asyncio.run(mongodb_data_storage_client.save_data(data))
+
+        # Assert
+        mongodb_data_storage_client.data_collection.insert_many.assert_called_once_with([data, data], ordered=False)
+        assert len(mongodb_data_storage_client.data_buffer) == 0
+
+    @staticmethod
+    def test_save_many_data(mongodb_data_storage_client: MongoDBDataStorage, data: dict[str, Any]):
+        # Arrange
+
+        # Act
+        asyncio.run(mongodb_data_storage_client.save_many_data([data, data, data]))
+
+        # Assert
+        mongodb_data_storage_client.data_collection.insert_many.assert_called_once_with(
+            [data, data, data], ordered=False
+        )
+
+    @staticmethod
+    def test_get_data(mongodb_data_storage_client: MongoDBDataStorage, data: dict[str, Any]):
+        # Arrange
+        mock_cursor = MagicMock()
+        mock_cursor.to_list = AsyncMock(return_value=[data])
+        mongodb_data_storage_client.data_collection.find.return_value = mock_cursor
+
+        # Act
+        returned_data = asyncio.run(mongodb_data_storage_client.get_data())
+
+        # Assert
+        assert returned_data == [data]
+        mongodb_data_storage_client.data_collection.find.assert_called_once_with({}, {"_id": 0})
+
+    @staticmethod
+    def test_get_data_page(mongodb_data_storage_client: MongoDBDataStorage, data: dict[str, Any]):
+        # Arrange
+        last_id = ObjectId()
+        mock_cursor = MagicMock()
+        mock_cursor.sort.return_value.limit.return_value.to_list = AsyncMock(
+            return_value=[{**data, "_id": ObjectId()}, {**data, "_id": last_id}]
+        )
         mongodb_data_storage_client.data_collection.find.return_value = mock_cursor
 
         # Act
-        returned_data = mongodb_data_storage_client.get_data()
+        returned_data, next_after = asyncio.run(mongodb_data_storage_client.get_data_page(limit=2))
+
+        # Assert
+        assert returned_data == [data, data]
+        assert next_after == (data["time"], str(last_id))
+        mongodb_data_storage_client.data_collection.find.assert_called_once_with({}, None)
+        mock_cursor.sort.return_value.limit.assert_called_once_with(2)
+
+    @staticmethod
+    def test_get_data_page_with_fields(mongodb_data_storage_client: MongoDBDataStorage):
+        # Arrange
+        mock_cursor = MagicMock()
+        mock_cursor.sort.return_value.limit.return_value.to_list = AsyncMock(
+            return_value=[{"_id": ObjectId(), "time": 1711644891, "decoded_value": 1.0}]
+        )
+        mongodb_data_storage_client.data_collection.find.return_value = mock_cursor
+
+        # Act
+        returned_data, next_after = asyncio.run(
+            mongodb_data_storage_client.get_data_page(limit=1, fields=["decoded_value"])
+        )
+
+        # Assert
+        assert returned_data == [{"decoded_value": 1.0}]
+        assert next_after is not None
+        mongodb_data_storage_client.data_collection.find.assert_called_once_with({}, {"decoded_value": 1, "time": 1})
+
+    @staticmethod
+    def test_get_data_with_fields(mongodb_data_storage_client: MongoDBDataStorage):
+        # Arrange
+        mock_cursor = MagicMock()
+        mock_cursor.to_list = AsyncMock(return_value=[])
+        mongodb_data_storage_client.data_collection.find.return_value = mock_cursor
+
+        # Act
+        asyncio.run(mongodb_data_storage_client.get_data(fields=["iso_time", "decoded_value"]))
+
+        # Assert
+        mongodb_data_storage_client.data_collection.find.assert_called_once_with(
+            {}, {"iso_time": 1, "decoded_value": 1, "_id": 0}
+        )
+
+    @staticmethod
+    def test_get_data_page_after_cursor(mongodb_data_storage_client: MongoDBDataStorage, data: dict[str, Any]):
+        # Arrange
+        after_id = ObjectId()
+        mock_cursor = MagicMock()
+        mock_cursor.sort.return_value.limit.return_value.to_list = AsyncMock(
+            return_value=[{**data, "_id": ObjectId()}]
+        )
+        mongodb_data_storage_client.data_collection.find.return_value = mock_cursor
+
+        # Act
+        returned_data, next_after = asyncio.run(
+            mongodb_data_storage_client.get_data_page(limit=2, after=(1711644891, str(after_id)))
+        )
+
+        # Assert
+        assert returned_data == [data]
+        assert next_after is None
+        mongodb_data_storage_client.data_collection.find.assert_called_once_with({
+            "$and": [
+                {},
+                {"$or": [{"time": {"$gt": 1711644891}}, {"time": 1711644891, "_id": {"$gt": after_id}}]},
+            ]
+        }, None)
+
+    @staticmethod
+    def test_get_data_page_when_cursor_id_is_not_an_object_id(mongodb_data_storage_client: MongoDBDataStorage):
+        # Arrange
+
+        # Act
+        with pytest.raises(InvalidCursor):
+            asyncio.run(mongodb_data_storage_client.get_data_page(limit=2, after=(1711644891, "42")))
 
         # Assert
-        assert returned_data == list(mock_cursor)
-        mongodb_data_storage_client.data_collection.find.assert_called_once_with({})
+        mongodb_data_storage_client.data_collection.find.assert_not_called()
+
+    @staticmethod
+    def test_stream_data(mongodb_data_storage_client: MongoDBDataStorage, data: dict[str, Any], mock_cursor: type):
+        # Arrange
+        mongodb_data_storage_client.data_collection.find.return_value.sort.return_value = mock_cursor([data, data])
+
+        async def collect():
+            return [d async for d in mongodb_data_storage_client.stream_data()]
+
+        # Act
+        returned_data = asyncio.run(collect())
+
+        # Assert
+        assert returned_data == [data, data]
+
+    @staticmethod
+    def test_aggregate_data(mongodb_data_storage_client: MongoDBDataStorage):
+        # Arrange
+        aggregate = {"bucket": 1711644840, "count": 1, "min": 1.0, "max": 1.0, "mean": 1.0, "last": 1.0}
+        mock_cursor = MagicMock()
+        mock_cursor.to_list = AsyncMock(return_value=[aggregate])
+        mongodb_data_storage_client.data_collection.aggregate.return_value = mock_cursor
+
+        # Act
+        aggregates = asyncio.run(mongodb_data_storage_client.aggregate_data(bucket_seconds=60))
+
+        # Assert
+        assert aggregates == [aggregate]
+        pipeline = mongodb_data_storage_client.data_collection.aggregate.call_args.args[0]
+        assert pipeline[0] == {"$match": {"decoded_value": {"$exists": True}}}
+        assert pipeline[2]["$group"]["_id"] == {"$subtract": ["$time", {"$mod": ["$time", 60]}]}
+
+    @staticmethod
+    def test_aggregate_data_from_rollups(mongodb_data_storage_client: MongoDBDataStorage):
+        # Arrange
+        mock_cursor = MagicMock()
+        mock_cursor.to_list = AsyncMock(return_value=[])
+        mongodb_data_storage_client.hour_rollup_collection.aggregate.return_value = mock_cursor
+
+        # Act
+        asyncio.run(mongodb_data_storage_client.aggregate_data(
+            bucket_seconds=7200,
+            start_time=datetime.fromtimestamp(1711641600),
+            aggregates=["count", "mean"],
+        ))
+
+        # Assert
+        mongodb_data_storage_client.data_collection.aggregate.assert_not_called()
+        mongodb_data_storage_client.minute_rollup_collection.aggregate.assert_not_called()
+        pipeline = mongodb_data_storage_client.hour_rollup_collection.aggregate.call_args.args[0]
+        assert pipeline[0] == {"$match": {"count": {"$gt": 0}, "_id": {"$gte": 1711641600}}}
+
+    @staticmethod
+    def test_aggregate_data_from_rollups_with_default_aggregates(mongodb_data_storage_client: MongoDBDataStorage):
+        # Arrange
+        mock_cursor = MagicMock()
+        mock_cursor.to_list = AsyncMock(return_value=[])
+        mongodb_data_storage_client.hour_rollup_collection.aggregate.return_value = mock_cursor
+
+        # Act
+        asyncio.run(mongodb_data_storage_client.aggregate_data(
+            bucket_seconds=3600,
+            end_time=datetime.fromtimestamp(1711645200),
+            aggregates=["count", "min", "max", "mean", "last"],
+        ))
+
+        # Assert
+        mongodb_data_storage_client.data_collection.aggregate.assert_not_called()
+        pipeline = mongodb_data_storage_client.hour_rollup_collection.aggregate.call_args.args[0]
+        assert pipeline[0] == {"$match": {"count": {"$gt": 0}, "_id": {"$lt": 1711645200}}}
+        assert pipeline[1]["$group"]["last"] == {"$max": "$last"}
+        assert pipeline[-1]["$project"]["last"] == "$last.value"
+
+    @staticmethod
+    def test_aggregate_data_without_rollups_excludes_the_end_time(mongodb_data_storage_client: MongoDBDataStorage):
+        # Arrange
+        mock_cursor = MagicMock()
+        mock_cursor.to_list = AsyncMock(return_value=[])
+        mongodb_data_storage_client.data_collection.aggregate.return_value = mock_cursor
+
+        # Act
+        asyncio.run(mongodb_data_storage_client.aggregate_data(
+            bucket_seconds=90,
+            start_time=datetime.fromtimestamp(1711641600),
+            end_time=datetime.fromtimestamp(1711645200),
+        ))
+
+        # Assert
+        pipeline = mongodb_data_storage_client.data_collection.aggregate.call_args.args[0]
+        assert pipeline[0] == {"$match": {
+            "time": {"$gte": 1711641600, "$lt": 1711645200},
+            "decoded_value": {"$exists": True},
+        }}
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "bucket_seconds, start_time, aggregates",
+        [
+            (60, None, None),
+            (90, None, ["count"]),
+            (60, datetime.fromtimestamp(1711641601), ["count"]),
+        ],
+    )
+    def test_aggregate_data_when_rollups_cannot_be_used(
+            mongodb_data_storage_client: MongoDBDataStorage,
+            bucket_seconds: int,
+            start_time: datetime,
+            aggregates: list[str]
+    ):
+        # Arrange
+        mock_cursor = MagicMock()
+        mock_cursor.to_list = AsyncMock(return_value=[])
+        mongodb_data_storage_client.data_collection.aggregate.return_value = mock_cursor
+
+        # Act
+        asyncio.run(mongodb_data_storage_client.aggregate_data(
+            bucket_seconds=bucket_seconds,
+            start_time=start_time,
+            aggregates=aggregates,
+        ))
+
+        # Assert
+        mongodb_data_storage_client.data_collection.aggregate.assert_called_once()
+        mongodb_data_storage_client.minute_rollup_collection.aggregate.assert_not_called()
+        mongodb_data_storage_client.hour_rollup_collection.aggregate.assert_not_called()
+
+    @staticmethod
+    def test_update_rollups(mongodb_data_storage_client: MongoDBDataStorage):
+        # Arrange
+        data = [
+            {"time": 1711644891, "decoded_value": 1.0},
+            {"time": 1711644895, "decoded_value": 3.0},
+        ]
+        discard_reasons = [{"time": 1711644895, "reasons": ["fake_reason"]}]
+
+        async def update_and_flush():
+            await mongodb_data_storage_client.update_rollups(data=data, discard_reasons=discard_reasons)
+            await mongodb_data_storage_client.flush()
+
+        # Act
+        asyncio.run(update_and_flush())
+
+        # Assert
+        mongodb_data_storage_client.minute_rollup_collection.bulk_write.assert_called_once_with(
+            [
+                UpdateOne(
+                    {"_id": 1711644840},
+                    {
+                        "$inc": {"count": 2, "sum": 4.0, "discarded.fake_reason": 1},
+                        "$min": {"min": 1.0},
+                        "$max": {"max": 3.0, "last": {"time": 1711644895, "value": 3.0}},
+                    },
+                    upsert=True,
+                )
+            ],
+            ordered=False,
+        )
+        mongodb_data_storage_client.hour_rollup_collection.bulk_write.assert_called_once()
+
+    @staticmethod
+    def test_save_many_data_ignores_duplicated_samples(mongodb_data_storage_client: MongoDBDataStorage):
+        # Arrange
+        data = [
+            {"time": 1711644891, "value": [68, 51, 127, 191], "decoded_value": 1.0, "tags": []},
+            {"time": 1711644891, "value": [68, 51, 127, 191], "decoded_value": 1.0, "tags": []},
+        ]
+        listener = AsyncMock()
+        mongodb_data_storage_client.add_write_listener(listener)
+        mongodb_data_storage_client.data_collection.insert_many.side_effect = BulkWriteError(
+            {"writeErrors": [{"index": 1, "code": 11000, "errmsg": "duplicate key error"}]}
+        )
+
+        async def save_and_flush():
+            await mongodb_data_storage_client.save_many_data(data)
+            await mongodb_data_storage_client.update_rollups(data=data, discard_reasons=[])
+            await mongodb_data_storage_client.flush()
+
+        # Act
+        asyncio.run(save_and_flush())
+
+        # Assert
+        assert data[0]["key"] == "1711644891:44337fbf"
+        listener.assert_called_once_with([1711644891])
+        mongodb_data_storage_client.minute_rollup_collection.bulk_write.assert_called_once_with(
+            [
+                UpdateOne(
+                    {"_id": 1711644840},
+                    {
+                        "$inc": {"count": 1, "sum": 1.0},
+                        "$min": {"min": 1.0},
+                        "$max": {"max": 1.0, "last": {"time": 1711644891, "value": 1.0}},
+                    },
+                    upsert=True,
+                )
+            ],
+            ordered=False,
+        )
+
+    @staticmethod
+    def test_save_many_data_when_insert_fails(mongodb_data_storage_client: MongoDBDataStorage, data: dict[str, Any]):
+        # Arrange
+        failed_data, inserted_data = {**data, "_id": ObjectId()}, {**data, "time": 1711644892, "_id": ObjectId()}
+        listener = AsyncMock()
+        mongodb_data_storage_client.add_write_listener(listener)
+        mongodb_data_storage_client.data_collection.insert_many.side_effect = BulkWriteError(
+            {"writeErrors": [{"index": 0, "code": 121, "errmsg": "document failed validation"}]}
+        )
+
+        # Act
+        asyncio.run(mongodb_data_storage_client.save_many_data([failed_data, inserted_data]))
+
+        # Assert
+        assert len(mongodb_data_storage_client.data_buffer) == 1
+        assert "_id" not in failed_data
+        listener.assert_called_once_with([1711644892])
+
+    @staticmethod
+    def test_save_many_data_when_failed_insert_landed(mongodb_data_storage_client: MongoDBDataStorage):
+        # Arrange
+        data = [{"time": 1711644891, "value": [68, 51, 127, 191], "decoded_value": 1.0, "tags": []}]
+
+        async def insert_many(documents: list[dict[str, Any]], ordered: bool):
+            # The first write lands but its reply is lost, the retry then finds it already stored
+            if mongodb_data_storage_client.data_collection.insert_many.call_count == 1:
+                for d in documents:
+                    d.setdefault("_id", ObjectId())
+                raise AutoReconnect("connection lost")
+            raise BulkWriteError({"writeErrors": [{"index": 0, "code": 11000, "errmsg": "duplicate key error"}]})
+
+        mongodb_data_storage_client.data_collection.insert_many.side_effect = insert_many
+
+        async def save_and_flush():
+            await mongodb_data_storage_client.save_many_data(data)
+            with pytest.raises(AutoReconnect):
+                await mongodb_data_storage_client.flush()
+            ids_after_failure = [d.get("_id") for d in data]
+            await mongodb_data_storage_client.update_rollups(data=data, discard_reasons=[])
+            await mongodb_data_storage_client.flush()
+            return ids_after_failure
+
+        # Act
+        ids_after_failure = asyncio.run(save_and_flush())
+
+        # Assert
+        assert ids_after_failure == [None]
+        assert mongodb_data_storage_client.data_collection.insert_many.call_count == 2
+        mongodb_data_storage_client.minute_rollup_collection.bulk_write.assert_called_once()
 
     @staticmethod
     def test_save_reasons_for_invalid_data(mongodb_data_storage_client: MongoDBDataStorage, invalidation_reasons: dict[str, Any]):
         # Arrange
 
         # Act
-        mongodb_data_storage_client.save_reasons_for_invalid_data(invalidation_reasons)
+        asyncio.run(mongodb_data_storage_client.save_reasons_for_invalid_data(invalidation_reasons))
+
+        # Assert
+        mongodb_data_storage_client.discard_collection.insert_many.assert_not_called()
+        assert len(mongodb_data_storage_client.discard_buffer) == 1
+
+    @staticmethod
+    def test_save_many_reasons_for_invalid_data(
+            mongodb_data_storage_client: MongoDBDataStorage,
+            invalidation_reasons: dict[str, Any]
+    ):
+        # Arrange
+
+        # Act
+        asyncio.run(mongodb_data_storage_client.save_many_reasons_for_invalid_data(
+            [invalidation_reasons, invalidation_reasons]
+        ))
+
+        # Assert
+        mongodb_data_storage_client.discard_collection.insert_many.assert_called_once_with(
+            [invalidation_reasons, invalidation_reasons], ordered=False
+        )
+
+    @staticmethod
+    def test_close_flushes_buffers(
+            mongodb_data_storage_client: MongoDBDataStorage,
+            data: dict[str, Any],
+            invalidation_reasons: dict[str, Any]
+    ):
+        # Arrange
+        mongodb_data_storage_client.client = MagicMock()
+
+        async def save_and_close():
+            await mongodb_data_storage_client.save_data(data)
+            await mongodb_data_storage_client.save_reasons_for_invalid_data(invalidation_reasons)
+            await mongodb_data_storage_client.close()
+
+        # Act
+        asyncio.run(save_and_close())
 
         # Assert
-        mongodb_data_storage_client.discard_collection.insert_one.assert_called_once_with(invalidation_reasons)
+        mongodb_data_storage_client.data_collection.insert_many.assert_called_once_with([data], ordered=False)
+        mongodb_data_storage_client.discard_collection.insert_many.assert_called_once_with(
+            [invalidation_reasons], ordered=False
+        )
+        mongodb_data_storage_client.client.close.assert_called_once()
 
     @staticmethod
-    def test_get_reasons_for_invalid_data(mongodb_data_storage_client: MongoDBDataStorage):
+    def test_get_reasons_for_invalid_data(
+            mongodb_data_storage_client: MongoDBDataStorage,
+            invalidation_reasons: dict[str, Any]
+    ):
         # Arrange
-        mock_cursor = MagicMock(spec=Cursor)
+        mock_cursor = MagicMock()
+        mock_cursor.to_list = AsyncMock(return_value=[invalidation_reasons])
         mongodb_data_storage_client.discard_collection.find.return_value = mock_cursor
 
         # Act
-        returned_data = mongodb_data_storage_client.get_reasons_for_invalid_data()
+        returned_data = asyncio.run(mongodb_data_storage_client.get_reasons_for_invalid_data())
 
         # Assert
-        assert returned_data == list(mock_cursor)
-        mongodb_data_storage_client.discard_collection.find.assert_called_once_with({})
+        assert returned_data == [invalidation_reasons]
+        mongodb_data_storage_client.discard_collection.find.assert_called_once_with({}, {"_id": 0})
 
+    @staticmethod
+    def test_get_reasons_for_invalid_data_with_reason_and_tag_filters(
+            mongodb_data_storage_client: MongoDBDataStorage
+    ):
+        # Arrange
+        mock_cursor = MagicMock()
+        mock_cursor.to_list = AsyncMock(return_value=[])
+        mongodb_data_storage_client.discard_collection.find.return_value = mock_cursor
+
+        # Act
+        asyncio.run(mongodb_data_storage_client.get_reasons_for_invalid_data(reason="fake_reason", tag="fake_tag"))
+
+        # Assert
+        mongodb_data_storage_client.discard_collection.find.assert_called_once_with(
+            {"reasons": "fake_reason", "tags": "fake_tag"}, {"_id": 0}
+        )
+
+    @staticmethod
+    def test_ensure_indexes(mongodb_data_storage_client: MongoDBDataStorage):
+        # Arrange
+
+        # Act
+        asyncio.run(mongodb_data_storage_client.ensure_indexes())
+
+        # Assert
+        key_index_call = call(
+            [("key", ASCENDING)], unique=True, partialFilterExpression={"key": {"$exists": True}}
+        )
+        mongodb_data_storage_client.data_collection.create_index.assert_has_calls([
+            call([("time", ASCENDING), ("_id", ASCENDING)]),
+            key_index_call,
+        ])
+        mongodb_data_storage_client.discard_collection.create_index.assert_has_calls([
+            call([("time", ASCENDING)]),
+            key_index_call,
+            call([("reasons", ASCENDING), ("time", ASCENDING)]),
+            call([("tags", ASCENDING), ("time", ASCENDING)]),
+        ])
+
+    @staticmethod
+    def test_ensure_indexes_with_retention(mongodb_data_storage_client: MongoDBDataStorage):
+        # Arrange
+        mongodb_data_storage_client.retention_seconds = 86400
+
+        # Act
+        asyncio.run(mongodb_data_storage_client.ensure_indexes())
+
+        # Assert
+        for collection in (mongodb_data_storage_client.data_collection, mongodb_data_storage_client.discard_collection):
+            collection.create_index.assert_called_with([("date", ASCENDING)], expireAfterSeconds=86400)
+
+    @staticmethod
+    @patch('infrastructure.data.storage.mongodb.mongodb_data_storage.time.time', return_value=10000)
+    def test_notify_expired_data(_: MagicMock, mongodb_data_storage_client: MongoDBDataStorage):
+        # Arrange
+        mongodb_data_storage_client.retention_seconds = 3600
+        listener = AsyncMock()
+        mongodb_data_storage_client.add_write_listener(listener)
+
+        # Act
+        asyncio.run(mongodb_data_storage_client.notify_expired_data())
+        asyncio.run(mongodb_data_storage_client.notify_expired_data())
+
+        # Assert
+        listener.assert_awaited_once_with([0.0, 6340])
+
+    @staticmethod
+    def test_ensure_indexes_updates_existing_retention(mongodb_data_storage_client: MongoDBDataStorage):
+        # Arrange
+        mongodb_data_storage_client.retention_seconds = 86400
+        mongodb_data_storage_client.db = AsyncMock()
+        mongodb_data_storage_client.data_collection.name = "data_collection"
+
+        async def create_index(keys, **options):
+            if "expireAfterSeconds" in options:
+                raise OperationFailure("Index already exists with different options", code=85)
+
+        mongodb_data_storage_client.data_collection.create_index.side_effect = create_index
+
+        # Act
+        asyncio.run(mongodb_data_storage_client.ensure_indexes())
+
+        # Assert
+        mongodb_data_storage_client.db.command.assert_called_once_with(
+            "collMod",
+            "data_collection",
+            index={"keyPattern": {"date": 1}, "expireAfterSeconds": 86400},
+        )
+
+    @staticmethod
+    def test_archive_data(mongodb_data_storage_client: MongoDBDataStorage, data: dict[str, Any], mock_cursor: type):
+        # Arrange
+        documents = [{**data, "_id": i} for i in range(3)]
+        before = datetime(2024, 3, 28, 16)
+        mongodb_data_storage_client.archive = MagicMock()
+        mongodb_data_storage_client.data_collection.name = "data_collection"
+        mongodb_data_storage_client.data_collection.find.return_value.sort.return_value = mock_cursor(documents)
+        mongodb_data_storage_client.discard_collection.find.return_value.sort.return_value = mock_cursor([])
+        listener = AsyncMock()
+        mongodb_data_storage_client.add_write_listener(listener)
+
+        # Act
+        archived_documents = asyncio.run(mongodb_data_storage_client.archive_data(before=before))
+
+        # Assert
+        assert archived_documents == 3
+        mongodb_data_storage_client.data_collection.find.assert_called_once_with(
+            {"date": {"$lt": before}}, batch_size=1000
+        )
+        mongodb_data_storage_client.archive.write.assert_called_once_with("data_collection", documents)
+        mongodb_data_storage_client.data_collection.delete_many.assert_called_once_with({"_id": {"$in": [0, 1, 2]}})
+        listener.assert_called_once_with([data["time"]] * 3)
+
+    @staticmethod
+    def test_get_index_stats(mongodb_data_storage_client: MongoDBDataStorage):
+        # Arrange
+        index_stats = {"name": "time_1", "key": {"time": 1}, "accesses": {"ops": 3}}
+        mock_cursor = MagicMock()
+        mock_cursor.to_list = AsyncMock(return_value=[index_stats])
+        mongodb_data_storage_client.data_collection.name = "data_collection"
+        mongodb_data_storage_client.data_collection.aggregate.return_value = mock_cursor
+        mongodb_data_storage_client.discard_collection.name = "discard_collection"
+        mongodb_data_storage_client.discard_collection.aggregate.return_value = mock_cursor
+
+        # Act
+        returned_index_stats = asyncio.run(mongodb_data_storage_client.get_index_stats())
+
+        # Assert
+        assert returned_index_stats == [
+            {"collection": "data_collection", **index_stats},
+            {"collection": "discard_collection", **index_stats},
+        ]
+        mongodb_data_storage_client.data_collection.aggregate.assert_called_once_with([{"$indexStats": {}}])
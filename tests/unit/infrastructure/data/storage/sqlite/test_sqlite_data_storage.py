@@ -0,0 +1,211 @@
+import asyncio
+import os
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from business_logic.exceptions.invalid_cursor import InvalidCursor
+from infrastructure.data.storage.sqlite.sqlite_data_storage import SQLiteDataStorage
+from infrastructure.data.storage.sqlite.constants import SQLITE_DATA_TABLE_NAME
+from infrastructure.metrics.metrics import STORAGE_OPERATION_SECONDS
+
+
+def to_document(time: float, value: int = 0, tags: list[str] = None) -> dict:
+    return {"time": time, "value": [value, 0, 0, 0], "decoded_value": float(value), "tags": tags or []}
+
+
+@pytest.fixture
+def database_path(tmp_path) -> str:
+    return os.path.join(tmp_path, "data.sqlite3")
+
+
+class TestSQLiteDataStorage:
+    @staticmethod
+    def test_get_data(database_path: str):
+        # Arrange
+        data_storage = SQLiteDataStorage(database_path=database_path)
+        asyncio.run(data_storage.save_many_data([to_document(3, 3), to_document(1, 1, ["suspect"]), to_document(2, 2)]))
+
+        # Act
+        data = asyncio.run(data_storage.get_data(
+            start_time=datetime.fromtimestamp(1),
+            end_time=datetime.fromtimestamp(2),
+            fields=["decoded_value", "tags"],
+        ))
+
+        # Assert
+        assert data == [{"decoded_value": 1.0, "tags": ["suspect"]}, {"decoded_value": 2.0, "tags": []}]
+
+    @staticmethod
+    def test_get_data_returns_stored_documents(database_path: str):
+        # Arrange
+        data_storage = SQLiteDataStorage(database_path=database_path)
+        asyncio.run(data_storage.save_data({**to_document(1, 1), "iso_time": "1970-01-01T00:00:01"}))
+
+        # Act
+        data = asyncio.run(data_storage.get_data())
+
+        # Assert
+        assert data == [{
+            "time": 1,
+            "value": bytes([1, 0, 0, 0]),
+            "decoded_value": 1.0,
+            "iso_time": "1970-01-01T00:00:01",
+            "tags": [],
+            "key": "1:01000000",
+        }]
+
+    @staticmethod
+    def test_save_data_ignores_duplicates_and_notifies_write_listeners(database_path: str):
+        # Arrange
+        data_storage = SQLiteDataStorage(database_path=database_path)
+        listener = AsyncMock()
+        data_storage.add_write_listener(listener)
+
+        # Act
+        asyncio.run(data_storage.save_data(to_document(1, 1)))
+        asyncio.run(data_storage.save_data(to_document(1, 1)))
+
+        # Assert
+        assert len(asyncio.run(data_storage.get_data())) == 1
+        assert listener.await_args_list[0].args == ([1],)
+        assert listener.await_args_list[1].args == ([],)
+
+    @staticmethod
+    def test_get_data_page(database_path: str):
+        # Arrange
+        data_storage = SQLiteDataStorage(database_path=database_path)
+        asyncio.run(data_storage.save_many_data([to_document(1, 1), to_document(2, 2), to_document(2, 3)]))
+
+        # Act
+        first_page, after = asyncio.run(data_storage.get_data_page(limit=2, fields=["decoded_value"]))
+        second_page, last_after = asyncio.run(data_storage.get_data_page(limit=2, after=after, fields=["decoded_value"]))
+
+        # Assert
+        assert first_page == [{"decoded_value": 1.0}, {"decoded_value": 2.0}]
+        assert after == (2, "2")
+        assert second_page == [{"decoded_value": 3.0}]
+        assert last_after is None
+
+    @staticmethod
+    def test_get_data_page_when_cursor_id_is_not_from_this_storage(database_path: str):
+        # Arrange
+        data_storage = SQLiteDataStorage(database_path=database_path)
+
+        # Act
+        with pytest.raises(InvalidCursor) as e:
+            asyncio.run(data_storage.get_data_page(limit=2, after=(1, "6605a2db4f1d2c3a4b5c6d7e")))
+
+        # Assert
+        assert "6605a2db4f1d2c3a4b5c6d7e" in str(e.value)
+
+    @staticmethod
+    def test_stream_data(database_path: str):
+        # Arrange
+        data_storage = SQLiteDataStorage(database_path=database_path)
+        asyncio.run(data_storage.save_many_data([to_document(2, 2), to_document(1, 1)]))
+
+        async def stream() -> list[dict]:
+            return [d async for d in data_storage.stream_data(fields=["time"])]
+
+        # Act
+        data = asyncio.run(stream())
+
+        # Assert
+        assert data == [{"time": 1}, {"time": 2}]
+
+    @staticmethod
+    def test_get_reasons_for_invalid_data(database_path: str):
+        # Arrange
+        data_storage = SQLiteDataStorage(database_path=database_path)
+        asyncio.run(data_storage.save_many_reasons_for_invalid_data([
+            {**to_document(1, 1, ["system"]), "reasons": ["tags"]},
+            {**to_document(2, 2), "reasons": ["max_age", "tags"]},
+            {**to_document(3, 3), "reasons": ["max_age"]},
+        ]))
+
+        # Act
+        by_reason = asyncio.run(data_storage.get_reasons_for_invalid_data(reason="max_age"))
+        by_tag = asyncio.run(data_storage.get_reasons_for_invalid_data(tag="system"))
+        by_unknown_reason = asyncio.run(data_storage.get_reasons_for_invalid_data(reason="unknown"))
+
+        # Assert
+        assert [(d["time"], d["reasons"]) for d in by_reason] == [(2, ["max_age", "tags"]), (3, ["max_age"])]
+        assert [d["time"] for d in by_tag] == [1]
+        assert by_unknown_reason == []
+
+    @staticmethod
+    def test_aggregate_data(database_path: str):
+        # Arrange
+        data_storage = SQLiteDataStorage(database_path=database_path)
+        asyncio.run(data_storage.save_many_data([to_document(30, 3), to_document(0, 1), to_document(60, 5)]))
+
+        # Act
+        aggregates = asyncio.run(data_storage.aggregate_data(bucket_seconds=60))
+
+        # Assert
+        assert aggregates == [
+            {"bucket": 0, "count": 2, "min": 1.0, "max": 3.0, "mean": 2.0, "last": 3.0},
+            {"bucket": 60, "count": 1, "min": 5.0, "max": 5.0, "mean": 5.0, "last": 5.0},
+        ]
+
+    @staticmethod
+    def test_aggregate_data_excludes_the_end_time(database_path: str):
+        # Arrange
+        data_storage = SQLiteDataStorage(database_path=database_path)
+        asyncio.run(data_storage.save_many_data([to_document(0, 1), to_document(30, 3), to_document(60, 5)]))
+
+        # Act
+        aggregates = asyncio.run(data_storage.aggregate_data(bucket_seconds=60, end_time=datetime.fromtimestamp(60)))
+
+        # Assert
+        assert [(a["bucket"], a["count"], a["last"]) for a in aggregates] == [(0, 2, 3.0)]
+
+    @staticmethod
+    def test_archive_data(database_path: str):
+        # Arrange
+        archive = MagicMock()
+        data_storage = SQLiteDataStorage(database_path=database_path, archive=archive)
+        asyncio.run(data_storage.save_many_data([to_document(1, 1), to_document(7200, 2)]))
+
+        # Act
+        archived_documents = asyncio.run(data_storage.archive_data(before=datetime.fromtimestamp(3600, tz=timezone.utc)))
+
+        # Assert
+        assert archived_documents == 1
+        name, documents = archive.write.call_args.args
+        assert name == "data"
+        assert documents[0]["date"] == datetime.fromtimestamp(1, tz=timezone.utc)
+        assert documents[0]["value"] == [1, 0, 0, 0]
+        assert [d["time"] for d in asyncio.run(data_storage.get_data())] == [7200]
+
+    @staticmethod
+    def test_data_is_persisted(database_path: str):
+        # Arrange
+        data_storage = SQLiteDataStorage(database_path=database_path)
+        asyncio.run(data_storage.save_many_data([to_document(1, 1, ["suspect"])]))
+
+        # Act
+        asyncio.run(data_storage.close())
+        reopened_data_storage = SQLiteDataStorage(database_path=database_path)
+
+        # Assert
+        assert asyncio.run(reopened_data_storage.get_data(fields=["time", "tags"])) == [{"time": 1, "tags": ["suspect"]}]
+
+    @staticmethod
+    def test_storage_operations_are_timed(monkeypatch, database_path: str):
+        # Arrange
+        monkeypatch.setattr(STORAGE_OPERATION_SECONDS, "enabled", True)
+        monkeypatch.setattr(STORAGE_OPERATION_SECONDS, "series", {})
+        data_storage = SQLiteDataStorage(database_path=database_path)
+
+        # Act
+        asyncio.run(data_storage.save_many_data([to_document(1, 1)]))
+        asyncio.run(data_storage.get_data())
+
+        # Assert
+        assert set(STORAGE_OPERATION_SECONDS.series) == {
+            ("sqlite", "insert", SQLITE_DATA_TABLE_NAME),
+            ("sqlite", "query", SQLITE_DATA_TABLE_NAME),
+        }
@@ -0,0 +1,27 @@
+from infrastructure.data.storage.aggregation import aggregate_in_buckets
+
+
+class TestAggregation:
+    @staticmethod
+    def test_aggregate_in_buckets():
+        # Arrange
+        data = [(125, 4.0), (61, 1.0), (119, 3.0), (60, 2.0)]
+
+        # Act
+        aggregates = aggregate_in_buckets(data=data, bucket_seconds=60)
+
+        # Assert
+        assert aggregates == [
+            {"bucket": 60, "count": 3, "min": 1.0, "max": 3.0, "mean": 2.0, "last": 3.0},
+            {"bucket": 120, "count": 1, "min": 4.0, "max": 4.0, "mean": 4.0, "last": 4.0},
+        ]
+
+    @staticmethod
+    def test_aggregate_in_buckets_when_there_is_no_data():
+        # Arrange
+
+        # Act
+        aggregates = aggregate_in_buckets(data=[], bucket_seconds=60)
+
+        # Assert
+        assert aggregates == []
@@ -0,0 +1,83 @@
+from datetime import datetime
+from unittest.mock import patch, MagicMock
+
+import pytest
+
+from infrastructure.data.storage.hot_data_ring_buffer import HotDataRingBuffer
+
+
+def to_document(time: float, value: float, tags: list[str] = None) -> dict:
+    return {"time": time, "decoded_value": value, "tags": tags if tags is not None else []}
+
+
+@pytest.fixture
+@patch("infrastructure.data.storage.hot_data_ring_buffer.time.time")
+def hot_data(time_mock: MagicMock) -> HotDataRingBuffer:
+    time_mock.return_value = 1000
+    return HotDataRingBuffer(capacity=3)
+
+
+class TestHotDataRingBuffer:
+    @staticmethod
+    def test_get_data(hot_data: HotDataRingBuffer):
+        # Arrange
+        hot_data.append([to_document(1001, 1.0), to_document(1002.5, 2.0, ["suspect"]), to_document(1003, 3.0)])
+
+        # Act
+        data = hot_data.get_data(start_time=1002, end_time=1003)
+
+        # Assert
+        assert data == [
+            {"iso_time": datetime.fromtimestamp(1002.5).isoformat(), "decoded_value": 2.0, "tags": ["suspect"]},
+            {"iso_time": datetime.fromtimestamp(1003).isoformat(), "decoded_value": 3.0, "tags": []},
+        ]
+
+    @staticmethod
+    def test_get_data_with_fields(hot_data: HotDataRingBuffer):
+        # Arrange
+        hot_data.append([to_document(1001, 1.0)])
+
+        # Act
+        data = hot_data.get_data(start_time=1001, fields=["decoded_value"])
+
+        # Assert
+        assert data == [{"decoded_value": 1.0}]
+
+    @staticmethod
+    def test_covers_only_data_ingested_since_start(hot_data: HotDataRingBuffer):
+        # Arrange
+
+        # Act
+        hot_data.append([to_document(1001, 1.0)])
+
+        # Assert
+        assert hot_data.covers(1000.5)
+        assert not hot_data.covers(1000)
+        assert not hot_data.covers(None)
+
+    @staticmethod
+    def test_append_evicts_oldest_data_when_full(hot_data: HotDataRingBuffer):
+        # Arrange
+        hot_data.append([to_document(t, float(t - 1000)) for t in (1001, 1002, 1003)])
+
+        # Act
+        hot_data.append([to_document(1004, 4.0)])
+
+        # Assert
+        assert len(hot_data) == 3
+        assert [d["decoded_value"] for d in hot_data.get_data(start_time=1000)] == [2.0, 3.0, 4.0]
+        assert not hot_data.covers(1001)
+        assert hot_data.covers(1001.5)
+
+    @staticmethod
+    def test_append_skips_out_of_order_and_repeated_data(hot_data: HotDataRingBuffer):
+        # Arrange
+        hot_data.append([to_document(1001, 1.0), to_document(1005, 5.0)])
+
+        # Act
+        hot_data.append([to_document(1003, 3.0), to_document(1005, 5.0)])
+
+        # Assert
+        assert len(hot_data) == 2
+        assert not hot_data.covers(1003)
+        assert hot_data.covers(1004)
@@ -0,0 +1,49 @@
+import gzip
+import json
+from datetime import datetime, timezone
+
+from infrastructure.data.storage.hourly_archive import HourlyArchive
+
+
+def read_lines(path) -> list[dict]:
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        return [json.loads(line) for line in file]
+
+
+class TestHourlyArchive:
+    @staticmethod
+    def test_write_groups_documents_by_hour(tmp_path):
+        # Arrange
+        archive = HourlyArchive(directory=str(tmp_path))
+        first_hour = datetime(2024, 3, 28, 16, 59, tzinfo=timezone.utc).timestamp()
+        second_hour = datetime(2024, 3, 28, 17, 0, tzinfo=timezone.utc).timestamp()
+        documents = [
+            {"_id": 1, "time": first_hour, "decoded_value": 1.0, "date": datetime.fromtimestamp(first_hour, timezone.utc)},
+            {"_id": 2, "time": second_hour, "decoded_value": 2.0},
+        ]
+
+        # Act
+        paths = archive.write("data_collection", documents)
+
+        # Assert
+        assert paths == [
+            str(tmp_path / "data_collection" / "2024" / "03" / "28" / "16.jsonl.gz"),
+            str(tmp_path / "data_collection" / "2024" / "03" / "28" / "17.jsonl.gz"),
+        ]
+        assert read_lines(paths[0]) == [
+            {"time": first_hour, "decoded_value": 1.0, "date": "2024-03-28 16:59:00+00:00"}
+        ]
+        assert read_lines(paths[1]) == [{"time": second_hour, "decoded_value": 2.0}]
+
+    @staticmethod
+    def test_write_appends_to_existing_hour(tmp_path):
+        # Arrange
+        archive = HourlyArchive(directory=str(tmp_path))
+        time = datetime(2024, 3, 28, 16, tzinfo=timezone.utc).timestamp()
+
+        # Act
+        archive.write("data_collection", [{"time": time, "decoded_value": 1.0}])
+        paths = archive.write("data_collection", [{"time": time + 1, "decoded_value": 2.0}])
+
+        # Assert
+        assert [d["decoded_value"] for d in read_lines(paths[0])] == [1.0, 2.0]
@@ -0,0 +1,113 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+
+from infrastructure.data.storage.write_behind_buffer import WriteBehindBuffer
+
+
+@pytest.fixture
+def write_behind_buffer() -> WriteBehindBuffer:
+    return WriteBehindBuffer(flush_callback=AsyncMock(), max_size=3, max_age_seconds=0.01, max_retained_size=4)
+
+
+class TestWriteBehindBuffer:
+    @staticmethod
+    def test_add_flushes_by_size(write_behind_buffer: WriteBehindBuffer):
+        # Arrange
+        documents = [{"time": 1}, {"time": 2}, {"time": 3}]
+
+        # Act
+        asyncio.run(write_behind_buffer.add(documents))
+
+        # Assert
+        write_behind_buffer.flush_callback.assert_called_once_with(documents)
+        assert len(write_behind_buffer) == 0
+
+    @staticmethod
+    def test_add_flushes_by_age(write_behind_buffer: WriteBehindBuffer):
+        # Arrange
+        async def add_and_wait():
+            await write_behind_buffer.add([{"time": 1}])
+            await asyncio.sleep(0.05)
+
+        # Act
+        asyncio.run(add_and_wait())
+
+        # Assert
+        write_behind_buffer.flush_callback.assert_called_once_with([{"time": 1}])
+        assert len(write_behind_buffer) == 0
+
+    @staticmethod
+    def test_flush_when_buffer_is_empty(write_behind_buffer: WriteBehindBuffer):
+        # Arrange
+
+        # Act
+        asyncio.run(write_behind_buffer.flush())
+
+        # Assert
+        write_behind_buffer.flush_callback.assert_not_called()
+
+    @staticmethod
+    def test_flush_keeps_documents_on_failure(write_behind_buffer: WriteBehindBuffer):
+        # Arrange
+        write_behind_buffer.flush_callback.side_effect = Exception("An error occurred")
+
+        async def add_and_flush():
+            await write_behind_buffer.add([{"time": 1}])
+            await write_behind_buffer.flush()
+
+        # Act
+        with pytest.raises(Exception):
+            asyncio.run(add_and_flush())
+
+        # Assert
+        assert len(write_behind_buffer) == 1
+
+    @staticmethod
+    def test_flush_drops_oldest_documents_over_max_retained_size(write_behind_buffer: WriteBehindBuffer):
+        # Arrange
+        write_behind_buffer.flush_callback.side_effect = Exception("An error occurred")
+
+        async def add_and_flush():
+            for documents in ([{"time": 1}, {"time": 2}, {"time": 3}], [{"time": 4}, {"time": 5}, {"time": 6}]):
+                await write_behind_buffer.add(documents)
+            write_behind_buffer.flush_callback.side_effect = None
+            await write_behind_buffer.flush()
+
+        # Act
+        asyncio.run(add_and_flush())
+
+        # Assert
+        write_behind_buffer.flush_callback.assert_called_with([{"time": 3}, {"time": 4}, {"time": 5}, {"time": 6}])
+
+    @staticmethod
+    def test_flush_retries_only_documents_left_by_the_callback(write_behind_buffer: WriteBehindBuffer):
+        # Arrange
+        async def write_first(documents):
+            del documents[0]
+            raise Exception("An error occurred")
+
+        write_behind_buffer.flush_callback.side_effect = write_first
+
+        async def add_and_flush():
+            await write_behind_buffer.add([{"time": 1}, {"time": 2}])
+            await write_behind_buffer.flush()
+
+        # Act
+        with pytest.raises(Exception):
+            asyncio.run(add_and_flush())
+
+        # Assert
+        assert len(write_behind_buffer) == 1
+
+    @staticmethod
+    def test_add_keeps_documents_when_flush_fails(write_behind_buffer: WriteBehindBuffer):
+        # Arrange
+        write_behind_buffer.flush_callback.side_effect = Exception("An error occurred")
+
+        # Act
+        asyncio.run(write_behind_buffer.add([{"time": 1}, {"time": 2}, {"time": 3}]))
+
+        # Assert
+        write_behind_buffer.flush_callback.assert_called_once()
+        assert len(write_behind_buffer) == 3
@@ -0,0 +1,62 @@
+from infrastructure.metrics.histogram import Histogram, DISABLED_TIMER
+
+
+class TestHistogram:
+    @staticmethod
+    def test_render():
+        # Arrange
+        histogram = Histogram("fetch_seconds", "Fetch time.", label_names=("outcome",), buckets=(0.1, 1))
+        histogram.observe(0.05, "success")
+        histogram.observe(0.1, "success")
+        histogram.observe(5, "success")
+
+        # Act
+        lines = histogram.render()
+
+        # Assert
+        assert lines == [
+            "# HELP fetch_seconds Fetch time.",
+            "# TYPE fetch_seconds histogram",
+            'fetch_seconds_bucket{outcome="success",le="0.1"} 2',
+            'fetch_seconds_bucket{outcome="success",le="1"} 2',
+            'fetch_seconds_bucket{outcome="success",le="+Inf"} 3',
+            'fetch_seconds_sum{outcome="success"} 5.15',
+            'fetch_seconds_count{outcome="success"} 3',
+        ]
+
+    @staticmethod
+    def test_render_escapes_label_values():
+        # Arrange
+        histogram = Histogram("fetch_seconds", "Fetch time.", label_names=("outcome",), buckets=())
+        histogram.observe(1, 'say "hi"\n\\')
+
+        # Act
+        lines = histogram.render()
+
+        # Assert
+        assert lines[2] == r'fetch_seconds_bucket{outcome="say \"hi\"\n\\",le="+Inf"} 1'
+
+    @staticmethod
+    def test_time():
+        # Arrange
+        histogram = Histogram("fetch_seconds", "Fetch time.")
+
+        # Act
+        with histogram.time():
+            pass
+
+        # Assert
+        assert histogram.series[()][2] == 1
+
+    @staticmethod
+    def test_disabled_histogram_does_not_observe():
+        # Arrange
+        histogram = Histogram("fetch_seconds", "Fetch time.", enabled=False)
+
+        # Act
+        histogram.observe(1)
+        timer = histogram.time()
+
+        # Assert
+        assert histogram.series == {}
+        assert timer is DISABLED_TIMER
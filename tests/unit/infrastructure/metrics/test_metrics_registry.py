@@ -0,0 +1,44 @@
+from infrastructure.metrics.metrics_registry import MetricsRegistry
+
+
+class TestMetricsRegistry:
+    @staticmethod
+    def test_render():
+        # Arrange
+        metrics = MetricsRegistry(enabled=True)
+        histogram = metrics.histogram("decode_seconds", "Decode time.", buckets=(1,))
+        counter = metrics.counter("invalid_point_reasons_total", "Invalid reasons.", label_names=("reason",))
+        histogram.observe(0.5)
+        counter.increment("Data is too old", amount=2)
+        counter.increment("Data is too old")
+
+        # Act
+        text = metrics.render()
+
+        # Assert
+        assert text == "\n".join([
+            "# HELP decode_seconds Decode time.",
+            "# TYPE decode_seconds histogram",
+            'decode_seconds_bucket{le="1"} 1',
+            'decode_seconds_bucket{le="+Inf"} 1',
+            "decode_seconds_sum 0.5",
+            "decode_seconds_count 1",
+            "# HELP invalid_point_reasons_total Invalid reasons.",
+            "# TYPE invalid_point_reasons_total counter",
+            'invalid_point_reasons_total{reason="Data is too old"} 3',
+        ]) + "\n"
+
+    @staticmethod
+    def test_disabled_registry_creates_disabled_metrics():
+        # Arrange
+        metrics = MetricsRegistry(enabled=False)
+
+        # Act
+        histogram = metrics.histogram("decode_seconds", "Decode time.")
+        counter = metrics.counter("invalid_point_reasons_total", "Invalid reasons.")
+        histogram.observe(1)
+        counter.increment()
+
+        # Assert
+        assert not histogram.enabled and not counter.enabled
+        assert histogram.series == {} and counter.series == {}
@@ -0,0 +1,55 @@
+import asyncio
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+from pymongo import UpdateOne
+
+from migrations import backfill_decoded_values as migration
+
+
+class TestBackfillDecodedValues:
+    @staticmethod
+    def test_backfill_collection(mock_cursor: type):
+        # Arrange
+        collection = MagicMock()
+        collection.bulk_write = AsyncMock()
+        collection.find.return_value = mock_cursor([
+            {"_id": "fake_id", "time": 1711644891, "value": [0, 0, 128, 63], "tags": []}
+        ])
+
+        # Act
+        backfilled_documents = asyncio.run(migration.backfill_collection(collection))
+
+        # Assert
+        assert backfilled_documents == 1
+        collection.find.assert_called_once_with({"decoded_value": {"$exists": False}})
+        collection.bulk_write.assert_called_once_with(
+            [
+                UpdateOne(
+                    {"_id": "fake_id"},
+                    {"$set": {
+                        "decoded_value": 1.0,
+                        "iso_time": datetime.fromtimestamp(1711644891).isoformat(),
+                        "date": datetime.fromtimestamp(1711644891, tz=timezone.utc),
+                    }}
+                )
+            ],
+            ordered=False
+        )
+
+    @staticmethod
+    def test_backfill_collection_in_batches(mock_cursor: type, monkeypatch: pytest.MonkeyPatch):
+        # Arrange
+        monkeypatch.setattr(migration, "BATCH_SIZE", 2)
+        collection = MagicMock()
+        collection.bulk_write = AsyncMock()
+        collection.find.return_value = mock_cursor([
+            {"_id": i, "time": 1711644891, "value": [0, 0, 128, 63], "tags": []} for i in range(3)
+        ])
+
+        # Act
+        backfilled_documents = asyncio.run(migration.backfill_collection(collection))
+
+        # Assert
+        assert backfilled_documents == 3
+        assert collection.bulk_write.call_count == 2
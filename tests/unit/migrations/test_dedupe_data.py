@@ -0,0 +1,41 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+from pymongo import UpdateOne
+
+from migrations import dedupe_data as migration
+
+
+class TestDedupeData:
+    @staticmethod
+    def test_backfill_keys(mock_cursor: type):
+        # Arrange
+        collection = MagicMock()
+        collection.bulk_write = AsyncMock()
+        collection.find.return_value = mock_cursor([{"_id": "fake_id", "time": 1711644891, "value": [0, 0, 128, 63]}])
+
+        # Act
+        backfilled_documents = asyncio.run(migration.backfill_keys(collection))
+
+        # Assert
+        assert backfilled_documents == 1
+        collection.bulk_write.assert_called_once_with(
+            [UpdateOne({"_id": "fake_id"}, {"$set": {"key": "1711644891:0000803f"}})],
+            ordered=False
+        )
+
+    @staticmethod
+    def test_delete_duplicates_keeps_first_document_of_every_key(mock_cursor: type):
+        # Arrange
+        collection = MagicMock()
+        collection.delete_many = AsyncMock(return_value=MagicMock(deleted_count=3))
+        collection.aggregate.return_value = mock_cursor([
+            {"_id": "1711644891:0000803f", "ids": [1, 2], "count": 2},
+            {"_id": "1711644892:0000803f", "ids": [3, 4, 5], "count": 3},
+        ])
+
+        # Act
+        deleted_documents = asyncio.run(migration.delete_duplicates(collection))
+
+        # Assert
+        assert deleted_documents == 3
+        collection.delete_many.assert_called_once_with({"_id": {"$in": [2, 4, 5]}})
@@ -0,0 +1,39 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock, call
+
+from migrations import rebuild_rollups as migration
+
+
+class TestRebuildRollups:
+    @staticmethod
+    def test_rebuild_rollups_in_batches(mock_cursor: type, monkeypatch: pytest.MonkeyPatch):
+        # Arrange
+        monkeypatch.setattr(migration, "BATCH_SIZE", 2)
+        data = [{"time": 1, "decoded_value": 1.0}, {"time": 2, "decoded_value": 2.0}, {"time": 3, "decoded_value": 3.0}]
+        discard_reasons = [{"time": 4, "reasons": ["fake_reason"]}]
+        data_storage = MagicMock()
+        data_storage.minute_rollup_collection.drop = AsyncMock()
+        data_storage.hour_rollup_collection.drop = AsyncMock()
+        data_storage.data_collection.find.return_value = mock_cursor(data)
+        data_storage.discard_collection.find.return_value = mock_cursor(discard_reasons)
+        data_storage.update_rollups = AsyncMock()
+        data_storage.flush = AsyncMock()
+
+        # Act
+        asyncio.run(migration.rebuild_rollups(data_storage))
+
+        # Assert
+        data_storage.minute_rollup_collection.drop.assert_awaited_once()
+        data_storage.hour_rollup_collection.drop.assert_awaited_once()
+        data_storage.data_collection.find.assert_called_once_with(
+            {"decoded_value": {"$exists": True}},
+            {"_id": 0, "time": 1, "decoded_value": 1},
+            batch_size=2,
+        )
+        assert data_storage.update_rollups.await_args_list == [
+            call(data=data[:2], discard_reasons=[]),
+            call(data=data[2:], discard_reasons=[]),
+            call(data=[], discard_reasons=discard_reasons),
+        ]
+        data_storage.flush.assert_awaited_once()
@@ -0,0 +1,24 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from migrations import remove_discarded_data as migration
+
+
+class TestRemoveDiscardedData:
+    @staticmethod
+    def test_remove_discarded_data_in_batches(mock_cursor: type, monkeypatch: pytest.MonkeyPatch):
+        # Arrange
+        monkeypatch.setattr(migration, "BATCH_SIZE", 2)
+        data_collection = MagicMock()
+        data_collection.delete_many = AsyncMock(return_value=MagicMock(deleted_count=1))
+        discard_collection = MagicMock()
+        discard_collection.find.return_value = mock_cursor([{"key": "a"}, {"key": "b"}, {"key": "c"}])
+
+        # Act
+        removed_documents = asyncio.run(migration.remove_discarded_data(data_collection, discard_collection))
+
+        # Assert
+        assert removed_documents == 2
+        data_collection.delete_many.assert_any_call({"key": {"$in": ["a", "b"]}})
+        data_collection.delete_many.assert_any_call({"key": {"$in": ["c"]}})
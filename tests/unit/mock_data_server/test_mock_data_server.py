@@ -0,0 +1,88 @@
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from mock_data_server.mock_data_server import MockDataServer
+
+
+class TestMockDataServer:
+    @staticmethod
+    def test_get_sample():
+        # Arrange
+        sample_source = MagicMock()
+        sample_source.next_sample.return_value = {"time": 1, "value": [0, 0, 128, 63], "tags": []}
+        client = TestClient(MockDataServer(sample_source=sample_source).app)
+
+        # Act
+        response = client.get("/")
+
+        # Assert
+        assert response.status_code == 200
+        assert response.json() == {"time": 1, "value": [0, 0, 128, 63], "tags": []}
+
+    @staticmethod
+    @pytest.mark.parametrize("error_fraction, not_found_fraction, expected_status_code", [
+        (1, 0, 500),
+        (0, 1, 404),
+    ])
+    def test_get_sample_injects_faults(error_fraction: float, not_found_fraction: float, expected_status_code: int):
+        # Arrange
+        server = MockDataServer(error_fraction=error_fraction, not_found_fraction=not_found_fraction)
+        client = TestClient(server.app)
+
+        # Act
+        response = client.get("/")
+
+        # Assert
+        assert response.status_code == expected_status_code
+
+    @staticmethod
+    def test_get_sample_above_sample_rate_is_not_found():
+        # Arrange
+        client = TestClient(MockDataServer(sample_rate_per_second=0.001).app)
+
+        # Act
+        first_response = client.get("/")
+        second_response = client.get("/")
+
+        # Assert
+        assert first_response.status_code == 200
+        assert second_response.status_code == 404
+
+    @staticmethod
+    def test_get_sample_when_replay_is_exhausted_is_not_found():
+        # Arrange
+        sample_source = MagicMock()
+        sample_source.next_sample.return_value = None
+        client = TestClient(MockDataServer(sample_source=sample_source).app)
+
+        # Act
+        response = client.get("/")
+
+        # Assert
+        assert response.status_code == 404
+
+    @staticmethod
+    @pytest.mark.parametrize("latency_distribution, latency_seconds, expected_range", [
+        ("constant", 0.5, (0.5, 0.5)),
+        ("uniform", 0.5, (0, 1)),
+        ("exponential", 0, (0, 0)),
+    ])
+    def test_get_latency(latency_distribution: str, latency_seconds: float, expected_range: tuple[float, float]):
+        # Arrange
+        server = MockDataServer(latency_distribution=latency_distribution, latency_seconds=latency_seconds, seed=0)
+
+        # Act
+        latency = server.get_latency()
+
+        # Assert
+        assert expected_range[0] <= latency <= expected_range[1]
+
+    @staticmethod
+    def test_unknown_latency_distribution_raises_exception():
+        # Arrange
+
+        # Act / Assert
+        with pytest.raises(ValueError):
+            MockDataServer(latency_distribution="normal")
@@ -0,0 +1,70 @@
+import gzip
+import json
+import os
+import struct
+
+from business_logic.constants import SYSTEM_TAG, SUSPECT_TAG
+from mock_data_server.sample_generator import SampleGenerator, ReplaySampleSource
+
+
+class TestSampleGenerator:
+    @staticmethod
+    def test_next_sample():
+        # Arrange
+        sample_generator = SampleGenerator(stale_fraction=0, suspect_fraction=0, system_fraction=0, seed=0)
+
+        # Act
+        sample = sample_generator.next_sample(now=1000.5)
+
+        # Assert
+        assert sample["time"] == 1000
+        assert len(sample["value"]) == 4
+        assert -100 <= struct.unpack('<f', bytes(sample["value"]))[0] <= 100
+        assert SYSTEM_TAG not in sample["tags"] and SUSPECT_TAG not in sample["tags"]
+
+    @staticmethod
+    def test_next_sample_with_stale_suspect_and_system_samples():
+        # Arrange
+        sample_generator = SampleGenerator(stale_fraction=1, suspect_fraction=1, system_fraction=1, stale_age_seconds=60)
+
+        # Act
+        sample = sample_generator.next_sample(now=1000)
+
+        # Assert
+        assert sample["time"] == 940
+        assert {SYSTEM_TAG, SUSPECT_TAG}.issubset(sample["tags"])
+
+
+class TestReplaySampleSource:
+    @staticmethod
+    def test_next_sample_shifts_time(tmp_path):
+        # Arrange
+        path = os.path.join(tmp_path, "samples.jsonl.gz")
+        with gzip.open(path, "wt", encoding="utf-8") as file:
+            file.write(json.dumps({"time": 10, "value": [0, 0, 128, 63], "tags": ["suspect"]}) + "\n")
+            file.write(json.dumps({"time": 12, "value": [0, 0, 0, 64], "decoded_value": 2.0}) + "\n")
+        replay_sample_source = ReplaySampleSource(path=path)
+
+        # Act
+        samples = [replay_sample_source.next_sample(now=1000) for _ in range(3)]
+
+        # Assert
+        assert samples == [
+            {"time": 1000, "value": [0, 0, 128, 63], "tags": ["suspect"]},
+            {"time": 1002, "value": [0, 0, 0, 64], "tags": []},
+            None,
+        ]
+
+    @staticmethod
+    def test_next_sample_keeps_time(tmp_path):
+        # Arrange
+        path = os.path.join(tmp_path, "samples.jsonl")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(json.dumps({"time": 10, "value": [0, 0, 128, 63], "tags": []}) + "\n")
+        replay_sample_source = ReplaySampleSource(path=path, keep_time=True)
+
+        # Act
+        sample = replay_sample_source.next_sample(now=1000)
+
+        # Assert
+        assert sample["time"] == 10